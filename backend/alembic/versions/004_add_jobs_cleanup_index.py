@@ -0,0 +1,48 @@
+"""Add partial index for old job cleanup
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+This migration adds a partial index on jobs.completed_at covering only jobs in
+terminal states (COMPLETED, FAILED, CANCELLED). The nightly cleanup task deletes
+terminal jobs older than the retention cutoff, so the index turns that query into
+a range scan over the small set of eligible rows instead of a full table scan.
+
+The index is built CONCURRENTLY so the jobs table stays writable while it builds.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "004"
+down_revision: str | None = "003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_TERMINAL_STATUSES = "status IN ('COMPLETED', 'FAILED', 'CANCELLED')"
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_cleanup",
+            "jobs",
+            ["completed_at"],
+            unique=False,
+            postgresql_where=sa.text(_TERMINAL_STATUSES),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_jobs_cleanup",
+            table_name="jobs",
+            postgresql_concurrently=True,
+        )
@@ -302,6 +302,7 @@ async def upload_model_file(
             file=file.file,
             filename=storage_filename,
             max_size_bytes=settings.max_model_size_bytes,
+            content_length=file.size,
         )
     except StorageFullError as e:
         raise HTTPException(
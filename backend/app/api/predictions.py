@@ -16,15 +16,20 @@ If these invariants do not hold, the system is in a corrupt state.
 This module does NOT tolerate pre-boundary models.
 """
 
+from typing import Any
+
 from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 
 from app.api.deps import CacheDep, DBSession, ModelDep, ONNXDep, StorageDep
+from app.config import settings
 from app.crud import prediction_crud
 from app.schemas.prediction import (
     PredictionCreate,
     PredictionListResponse,
     PredictionResponse,
 )
+from app.services import serialization
 from app.services.onnx import (
     ONNXInferenceError,
     ONNXInputError,
@@ -33,7 +38,25 @@ from app.services.onnx import (
 )
 from app.services.prediction_cache import PredictionCache
 
-router = APIRouter()
+
+class PredictionJSONResponse(ORJSONResponse):
+    """ORJSONResponse that rejects NaN and infinities like JSONResponse.
+
+    orjson would silently write non-finite floats as null. JSON cannot
+    represent them, so, as with Starlette's JSONResponse (allow_nan=False),
+    rendering them raises instead and the request fails with a 500.
+    """
+
+    def render(self, content: Any) -> bytes:
+        body = super().render(content)
+        if b"null" in body and serialization.contains_non_finite(content):
+            raise ValueError("Out of range float values are not JSON compliant")
+        return body
+
+
+# Prediction payloads carry full output tensors; orjson encodes them in C,
+# which is much faster than the stdlib encoder for large outputs
+router = APIRouter(default_response_class=PredictionJSONResponse)
 
 
 @router.post(
@@ -142,7 +165,18 @@ async def create_prediction(
 
         # Invoke ONNXService (pure execution, no policy)
         try:
-            result = onnx_service.run_inference(file_path, prediction_in.input_data)
+            if settings.inference_batching_enabled:
+                result = await onnx_service.run_inference_batched(
+                    file_path,
+                    prediction_in.input_data,
+                    max_batch=settings.inference_batch_max_size,
+                    max_delay_ms=settings.inference_batch_max_delay_ms,
+                    file_hash=model.file_hash,
+                )
+            else:
+                result = onnx_service.run_inference(
+                    file_path, prediction_in.input_data, model.file_hash
+                )
             output_data = result.outputs
             inference_time_ms = result.inference_time_ms
         except PostCommitmentInvariantViolation:
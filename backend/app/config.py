@@ -39,15 +39,22 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
     redis_max_connections: int = 10
+    # One shared connection instead of a pool; avoids pool checkout overhead
+    # but serializes concurrent commands
+    redis_single_connection: bool = False
     redis_socket_timeout: float = 5.0  # seconds
     redis_socket_connect_timeout: float = 5.0  # seconds
     redis_retry_on_timeout: bool = True
+    redis_socket_keepalive: bool = True  # Detect connections dropped by NAT/LBs
     redis_health_check_interval: int = 30  # seconds
     redis_enabled: bool = True  # Set to False to disable Redis entirely
 
     # Cache settings
     cache_ttl: int = 3600  # Default TTL: 1 hour
     cache_key_prefix: str = "modelforge:"  # Namespace for all cache keys
+    # In-process L1 in front of CacheService.get (per worker; 0 disables)
+    cache_local_size: int = 0
+    cache_local_ttl: float = 5.0  # seconds; bounds cross-worker staleness
 
     # Model-specific cache settings
     cache_model_ttl: int = 300  # Model metadata TTL: 5 minutes
@@ -60,6 +67,11 @@ class Settings(BaseSettings):
         60  # Prediction TTL: 1 minute (short, model outputs may change)
     )
     cache_prediction_enabled: bool = True  # Enable prediction caching
+    # In-process L1 in front of Redis (per worker; 0 disables). Opt-in:
+    # invalidation only reaches the worker that handled it.
+    cache_prediction_l1_size: int = 0
+    cache_prediction_l1_ttl: float = 5.0  # seconds; bounds cross-worker staleness
+    cache_prediction_l1_max_bytes: int = 16 * 1024 * 1024  # serialized payloads
 
     # Security (required - no defaults)
     secret_key: str  # Required: set SECRET_KEY in environment
@@ -69,6 +81,22 @@ class Settings(BaseSettings):
     model_storage_path: str = "./models"
     max_model_size_mb: int = 500
 
+    # ONNX Runtime session tuning
+    ort_enable_gpu: bool = True  # Prefer TensorRT/CUDA/CoreML when available
+    ort_intra_op_num_threads: int = 0  # Threads per operator (0 = ORT default)
+    ort_inter_op_num_threads: int = 0  # Threads across operators (0 = ORT default)
+    ort_allow_spinning: bool = True  # Disable on shared hosts to save idle CPU
+    ort_graph_optimization_level: str = "all"  # disable, basic, extended or all
+    ort_optimized_model_dir: str | None = None  # Persist optimized graphs here
+    # Serve INT8 dynamically quantized weights (cached in ort_optimized_model_dir)
+    ort_quantize_int8: bool = False
+    # Extra sessions per model with dynamic dims fixed to observed sizes (0 = off)
+    ort_max_specialized_shapes: int = 0
+    # Coalesce concurrent sync predictions into one session run (dynamic batch only)
+    inference_batching_enabled: bool = False
+    inference_batch_max_size: int = 32
+    inference_batch_max_delay_ms: float = 2.0
+
     # Celery settings
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/0"
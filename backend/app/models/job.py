@@ -10,11 +10,13 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     Uuid,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -48,6 +50,15 @@ class Job(Base):
     """Represents an async inference job."""
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Partial index for cleanup_old_jobs: only terminal jobs, by completion
+        Index(
+            "ix_jobs_cleanup",
+            "completed_at",
+            postgresql_where=text("status IN ('COMPLETED', 'FAILED', 'CANCELLED')"),
+            sqlite_where=text("status IN ('COMPLETED', 'FAILED', 'CANCELLED')"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         Uuid(as_uuid=False),
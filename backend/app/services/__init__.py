@@ -3,6 +3,7 @@
 from app.services.cache import (
     CacheError,
     CacheService,
+    LocalCache,
     close_cache_service,
     get_cache_service,
     set_cache_service,
@@ -52,6 +53,7 @@ __all__ = [
     # Cache
     "CacheService",
     "CacheError",
+    "LocalCache",
     "get_cache_service",
     "close_cache_service",
     "set_cache_service",
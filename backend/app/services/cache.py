@@ -11,18 +11,129 @@ The service is designed to fail gracefully - cache misses or Redis errors
 will not crash the application, just result in cache bypasses.
 """
 
-import json
+import asyncio
+import contextlib
+import heapq
 import logging
-from collections.abc import Awaitable, Callable
+import socket
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from typing import Any
 
 from redis.asyncio import ConnectionPool, Redis
-from redis.exceptions import RedisError
+from redis.asyncio.cluster import RedisCluster
+from redis.exceptions import RedisClusterException, RedisError
+from redis.utils import HIREDIS_AVAILABLE
 
 from app.config import settings
+from app.services import serialization
 
 logger = logging.getLogger(__name__)
 
+# GET a key and bump a hit or miss counter in the same server-side step.
+# KEYS[1] = value key, KEYS[2] = hit counter, KEYS[3] = miss counter.
+_GET_AND_COUNT_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value then
+    redis.call('INCR', KEYS[2])
+else
+    redis.call('INCR', KEYS[3])
+end
+return value
+"""
+
+
+# Keys per UNLINK command when clearing a prefix
+_CLEAR_PREFIX_BATCH_SIZE = 500
+
+# Keys per DEL command in delete_keys
+_DELETE_KEYS_BATCH_SIZE = 512
+# SET a key only if it is absent, returning the value that was already there
+# (nil when this call stored it). KEYS[1] = key, ARGV[1] = value, ARGV[2] = TTL.
+_SET_IF_ABSENT_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value then
+    return value
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return false
+"""
+
+# TCP keepalive probing when settings.redis_socket_keepalive is on: first
+# probe after 60s idle, then every 10s, giving up after 3 misses. Options the
+# platform lacks (e.g. TCP_KEEPIDLE on macOS) are left at the OS default.
+_KEEPALIVE_OPTIONS: dict[int, int] = {
+    getattr(socket, name): value
+    for name, value in (
+        ("TCP_KEEPIDLE", 60),
+        ("TCP_KEEPINTVL", 10),
+        ("TCP_KEEPCNT", 3),
+    )
+    if hasattr(socket, name)
+}
+
+# Hashes that bucketed counters are spread over
+_COUNTER_BUCKETS = 256
+
+# URL scheme selecting Redis Cluster; the rest of the URL is a seed node
+_CLUSTER_URL_SCHEME = "redis+cluster://"
+
+# Failures that degrade to a cache bypass. Cluster client errors such as a
+# cross-slot command do not subclass RedisError.
+_REDIS_ERRORS = (RedisError, RedisClusterException)
+
+# Fire-and-forget writes: queue bound (further writes are dropped) and the
+# most writes sent per pipeline
+_WRITE_QUEUE_MAXSIZE = 10_000
+_WRITE_BATCH_SIZE = 500
+
+# Cached values larger than this are decoded in a worker thread so a big
+# parse does not stall other requests on the event loop
+_OFFLOAD_DECODE_SIZE = 64 * 1024
+
+
+def _serialize(value: Any) -> str | bytes:
+    """Serialize a value for storage.
+
+    Strings are stored as-is; anything else is JSON-encoded as bytes, which
+    redis-py sends as-is. NaN, infinities and ints beyond 64 bits are kept
+    (see serialization.dumps), as with the stdlib encoder.
+
+    Raises:
+        TypeError: If the value is not JSON serializable
+    """
+    if isinstance(value, str):
+        return value
+    return serialization.dumps(value)
+
+
+def _deserialize(value: str) -> Any:
+    """Deserialize a stored value, falling back to the raw string."""
+    # Counters come back as bare integers; skip the JSON parser for them.
+    # Leading zeros are not valid JSON numbers, so those stay raw strings.
+    if isinstance(value, str):
+        digits = value[1:] if value.startswith("-") else value
+        if (
+            digits.isascii()
+            and digits.isdigit()
+            and (digits[0] != "0" or digits == "0")
+        ):
+            return int(value)
+
+    try:
+        return serialization.loads(value)
+    except ValueError:
+        return value
+
+
+async def _deserialize_offloaded(value: str) -> Any:
+    """Deserialize a stored value, off the event loop if it is large."""
+    if len(value) > _OFFLOAD_DECODE_SIZE:
+        return await asyncio.to_thread(_deserialize, value)
+    return _deserialize(value)
+
 
 class CacheError(Exception):
     """Base exception for cache operations."""
@@ -30,6 +141,109 @@ class CacheError(Exception):
     pass
 
 
+class LocalCache:
+    """In-process LRU cache of serialized values with per-entry expiry.
+
+    Sits in front of Redis so the hottest keys are served without a
+    round-trip. Values are stored serialized, so callers never share (and
+    cannot mutate) a cached object. Expiry times are also kept in a
+    min-heap, letting cleanup drop expired entries without scanning.
+
+    Attributes:
+        max_size: Maximum number of entries (0 disables the cache)
+        ttl: Longest time in seconds an entry stays valid
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str | bytes]] = OrderedDict()
+        self._expiry_heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | bytes | None:
+        """Return the stored serialized value, or None if absent/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str | bytes, ttl: float | None = None) -> None:
+        """Store a serialized value, evicting the least recently used if full.
+
+        Args:
+            key: Full (prefixed) cache key
+            value: Serialized value
+            ttl: Entry TTL in seconds, capped at the cache's own ttl
+        """
+        if self.max_size <= 0:
+            return
+
+        now = time.monotonic()
+        self.cleanup(now)
+
+        expires_at = now + (self.ttl if ttl is None else min(ttl, self.ttl))
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+
+    def clear_prefix(self, prefix: str) -> int:
+        """Remove all entries whose key starts with prefix.
+
+        Returns:
+            Number of entries removed.
+        """
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def cleanup(self, now: float | None = None) -> int:
+        """Remove expired entries.
+
+        Heap items for keys that were overwritten, evicted or deleted since
+        are discarded without touching the newer entry.
+
+        Args:
+            now: Current time.monotonic() value (default: read the clock)
+
+        Returns:
+            Number of entries removed.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == expires_at:
+                del self._entries[key]
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._expiry_heap.clear()
+
+
 class CacheService:
     """Redis cache service with graceful degradation.
 
@@ -43,12 +257,31 @@ class CacheService:
         default_ttl: Default TTL in seconds
     """
 
+    __slots__ = (
+        "enabled",
+        "prefix",
+        "default_ttl",
+        "_redis_url",
+        "_max_connections",
+        "_single_connection",
+        "_cluster",
+        "_pool",
+        "_client",
+        "_connected",
+        "_write_queue",
+        "_flush_task",
+        "_local",
+    )
+
     def __init__(
         self,
         redis_url: str | None = None,
         prefix: str | None = None,
         default_ttl: int | None = None,
         enabled: bool | None = None,
+        max_connections: int | None = None,
+        single_connection: bool | None = None,
+        local_cache_size: int | None = None,
     ):
         """Initialize cache service.
 
@@ -57,19 +290,46 @@ class CacheService:
             prefix: Key prefix for namespacing (default: from settings)
             default_ttl: Default TTL in seconds (default: from settings)
             enabled: Whether caching is enabled (default: from settings)
+            max_connections: Connection pool size (default: from settings)
+            single_connection: Share one connection for all commands instead
+                of checking connections out of the pool (default: from settings)
+            local_cache_size: Entries kept in the in-process L1 checked by
+                get before Redis; 0 disables it (default: from settings)
         """
         self.enabled = enabled if enabled is not None else settings.redis_enabled
         self.prefix = prefix or settings.cache_key_prefix
         self.default_ttl = default_ttl or settings.cache_ttl
 
         self._redis_url = redis_url or settings.redis_url
+        self._max_connections = max_connections or settings.redis_max_connections
+        self._single_connection = (
+            single_connection
+            if single_connection is not None
+            else settings.redis_single_connection
+        )
+        self._cluster = self._redis_url.startswith(_CLUSTER_URL_SCHEME)
         self._pool: ConnectionPool | None = None
-        self._client: Redis | None = None
+        self._client: Redis | RedisCluster | None = None
         self._connected = False
+        self._write_queue: asyncio.Queue[tuple[str, str | bytes, int]] = asyncio.Queue(
+            maxsize=_WRITE_QUEUE_MAXSIZE
+        )
+        self._flush_task: asyncio.Task[None] | None = None
+
+        if local_cache_size is None:
+            local_cache_size = settings.cache_local_size
+        self._local = (
+            LocalCache(local_cache_size, settings.cache_local_ttl)
+            if local_cache_size > 0
+            else None
+        )
 
     async def connect(self) -> bool:
         """Initialize Redis connection pool.
 
+        A redis+cluster:// URL connects to Redis Cluster instead, with a
+        pool of max_connections per node managed by the cluster client.
+
         Returns:
             True if connection successful, False otherwise.
         """
@@ -81,30 +341,64 @@ class CacheService:
             return True
 
         try:
-            self._pool = ConnectionPool.from_url(
-                self._redis_url,
-                max_connections=settings.redis_max_connections,
-                socket_timeout=settings.redis_socket_timeout,
-                socket_connect_timeout=settings.redis_socket_connect_timeout,
-                retry_on_timeout=settings.redis_retry_on_timeout,
-                health_check_interval=settings.redis_health_check_interval,
-                decode_responses=True,  # Return strings instead of bytes
-            )
-            self._client = Redis(connection_pool=self._pool)
+            if self._cluster:
+                self._client = RedisCluster.from_url(
+                    "redis://" + self._redis_url.removeprefix(_CLUSTER_URL_SCHEME),
+                    max_connections=self._max_connections,
+                    socket_timeout=settings.redis_socket_timeout,
+                    socket_connect_timeout=settings.redis_socket_connect_timeout,
+                    socket_keepalive=settings.redis_socket_keepalive,
+                    socket_keepalive_options=_KEEPALIVE_OPTIONS,
+                    health_check_interval=settings.redis_health_check_interval,
+                    decode_responses=True,
+                )
+            else:
+                self._pool = ConnectionPool.from_url(
+                    self._redis_url,
+                    max_connections=self._max_connections,
+                    socket_timeout=settings.redis_socket_timeout,
+                    socket_connect_timeout=settings.redis_socket_connect_timeout,
+                    socket_keepalive=settings.redis_socket_keepalive,
+                    socket_keepalive_options=_KEEPALIVE_OPTIONS,
+                    retry_on_timeout=settings.redis_retry_on_timeout,
+                    health_check_interval=settings.redis_health_check_interval,
+                    decode_responses=True,  # Return strings instead of bytes
+                )
+                self._client = Redis(
+                    connection_pool=self._pool,
+                    single_connection_client=self._single_connection,
+                )
 
             # Test connection
             await self._client.ping()
             self._connected = True
             logger.info("Redis connection established")
+            if not HIREDIS_AVAILABLE:
+                logger.warning(
+                    "hiredis is not installed; Redis replies are parsed in pure Python"
+                )
             return True
 
-        except RedisError as e:
+        except _REDIS_ERRORS as e:
             logger.warning(f"Failed to connect to Redis: {e}")
             self._connected = False
             return False
 
     async def disconnect(self) -> None:
-        """Close Redis connection pool."""
+        """Close Redis connection pool, sending any queued writes first."""
+        if self._flush_task is not None:
+            if not self._flush_task.done():
+                # Let the flusher send everything queued, including a batch
+                # it is writing now; once joined it is idle in get() and
+                # cancelling it loses nothing
+                await self._write_queue.join()
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        while self._client and not self._write_queue.empty():
+            await self._flush_once()
+
         if self._client:
             await self._client.close()
         if self._pool:
@@ -112,6 +406,8 @@ class CacheService:
         self._connected = False
         self._client = None
         self._pool = None
+        if self._local is not None:
+            self._local.clear()
         logger.info("Redis connection closed")
 
     async def health_check(self) -> dict[str, Any]:
@@ -135,8 +431,17 @@ class CacheService:
             }
 
         try:
-            await self._client.ping()
-            info = await self._client.info("server")
+            # Both round-trips in flight at once; a failure in either is
+            # re-raised so it is reported like a sequential check would be
+            results = await asyncio.gather(
+                self._client.ping(),
+                self._client.info("server"),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            info = results[1]
             return {
                 "status": "healthy",
                 "enabled": True,
@@ -144,7 +449,7 @@ class CacheService:
                 "redis_version": info.get("redis_version"),
                 "uptime_seconds": info.get("uptime_in_seconds"),
             }
-        except RedisError as e:
+        except _REDIS_ERRORS as e:
             logger.warning(f"Redis health check failed: {e}")
             return {
                 "status": "unhealthy",
@@ -180,6 +485,9 @@ class CacheService:
     async def get(self, key: str) -> Any | None:
         """Get a value from cache.
 
+        The in-process L1, when enabled, is checked before Redis and filled
+        from Redis hits.
+
         Args:
             key: Cache key
 
@@ -189,18 +497,22 @@ class CacheService:
         if not self._connected or not self._client:
             return None
 
+        full_key = self.make_key(key)
+        if self._local is not None:
+            value = self._local.get(full_key)
+            if value is not None:
+                return await _deserialize_offloaded(value)
+
         try:
-            value = await self._client.get(self.make_key(key))
+            value = await self._client.get(full_key)
             if value is None:
                 return None
 
-            # Try to deserialize JSON, fall back to raw string
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+            if self._local is not None:
+                self._local.set(full_key, value)
+            return await _deserialize_offloaded(value)
 
-        except RedisError as e:
+        except _REDIS_ERRORS as e:
             logger.warning(f"Cache get failed for key '{key}': {e}")
             return None
 
@@ -225,22 +537,153 @@ class CacheService:
 
         ttl = ttl if ttl is not None else self.default_ttl
 
+        full_key = self.make_key(key)
         try:
-            # Serialize non-string values as JSON
-            if isinstance(value, str):
-                serialized = value
-            else:
-                serialized = json.dumps(value)
+            serialized = _serialize(value)
+            await self._client.set(full_key, serialized, ex=ttl)
+        except (*_REDIS_ERRORS, TypeError) as e:
+            if self._local is not None:
+                self._local.delete(full_key)
+            logger.warning(f"Cache set failed for key '{key}': {e}")
+            return False
 
-            await self._client.set(
-                self.make_key(key),
-                serialized,
-                ex=ttl,
-            )
+        if self._local is not None:
+            self._local.set(full_key, serialized, ttl)
+        return True
+
+    def set_nowait(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+    ) -> bool:
+        """Queue a value to be set in cache without waiting for Redis.
+
+        Writes are sent in pipelined batches by a background task, so the
+        caller never pays a round-trip. Failures are logged, not reported.
+
+        Args:
+            key: Cache key
+            value: Value to cache (serialized as in set)
+            ttl: TTL in seconds (default: use default_ttl)
+
+        Returns:
+            True if the write was queued, False if not connected, the value
+            is not serializable or the queue is full.
+        """
+        if not self._connected or not self._client:
+            return False
+
+        ttl = ttl if ttl is not None else self.default_ttl
+
+        full_key = self.make_key(key)
+        if self._local is not None:
+            self._local.delete(full_key)
+
+        try:
+            self._write_queue.put_nowait((full_key, _serialize(value), ttl))
+        except TypeError as e:
+            logger.warning(f"Cache set_nowait failed for key '{key}': {e}")
+            return False
+        except asyncio.QueueFull:
+            logger.warning(f"Cache write queue full, dropping key '{key}'")
+            return False
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        return True
+
+    async def _flush_loop(self) -> None:
+        """Send queued writes until cancelled."""
+        while True:
+            await self._flush_once()
+
+    async def _flush_once(self) -> int:
+        """Wait for queued writes and send up to a batch in one pipeline.
+
+        Returns:
+            Number of writes taken off the queue.
+        """
+        batch = [await self._write_queue.get()]
+        while len(batch) < _WRITE_BATCH_SIZE and not self._write_queue.empty():
+            batch.append(self._write_queue.get_nowait())
+
+        client = self._client
+        try:
+            if client is not None:
+                async with client.pipeline(transaction=False) as pipe:
+                    for full_key, serialized, ttl in batch:
+                        pipe.set(full_key, serialized, ex=ttl)
+                    await pipe.execute()
+        except _REDIS_ERRORS as e:
+            logger.warning(f"Cache background write of {len(batch)} keys failed: {e}")
+        finally:
+            # Marked done only once sent, so disconnect's join() covers the
+            # batch in flight as well as the ones still queued
+            for _ in batch:
+                self._write_queue.task_done()
+        return len(batch)
+
+    async def mget(self, *keys: str) -> list[Any | None]:
+        """Get multiple values from cache in one round-trip.
+
+        Args:
+            *keys: Cache keys
+
+        Returns:
+            Cached values in the same order as keys, with None for each
+            miss. All None if not connected or on error.
+        """
+        if not self._connected or not self._client or not keys:
+            return [None] * len(keys)
+
+        # Cluster keys may live in different slots, which plain MGET rejects;
+        # the non-atomic variant splits the call per slot
+        mget = self._client.mget_nonatomic if self._cluster else self._client.mget
+        try:
+            values = await mget([self.make_key(k) for k in keys])
+        except _REDIS_ERRORS as e:
+            logger.warning(f"Cache mget failed: {e}")
+            return [None] * len(keys)
+
+        return [None if v is None else await _deserialize_offloaded(v) for v in values]
+
+    async def mset(
+        self,
+        mapping: Mapping[str, Any],
+        ttl: int | None = None,
+    ) -> bool:
+        """Set multiple values in cache in one round-trip.
+
+        MSET cannot set expiries, so each key is written with SET EX in a
+        non-transactional pipeline.
+
+        Args:
+            mapping: Cache keys to values (serialized as in set)
+            ttl: TTL in seconds (default: use default_ttl)
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not self._connected or not self._client:
+            return False
+        if not mapping:
             return True
 
-        except (RedisError, TypeError, json.JSONDecodeError) as e:
-            logger.warning(f"Cache set failed for key '{key}': {e}")
+        ttl = ttl if ttl is not None else self.default_ttl
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    full_key = self.make_key(key)
+                    if self._local is not None:
+                        self._local.delete(full_key)
+                    pipe.set(full_key, _serialize(value), ex=ttl)
+                await pipe.execute()
+            return True
+
+        except (*_REDIS_ERRORS, TypeError) as e:
+            logger.warning(f"Cache mset failed: {e}")
             return False
 
     async def delete(self, key: str) -> bool:
@@ -255,11 +698,15 @@ class CacheService:
         if not self._connected or not self._client:
             return False
 
+        full_key = self.make_key(key)
+        if self._local is not None:
+            self._local.delete(full_key)
+
         try:
-            result = await self._client.delete(self.make_key(key))
+            result = await self._client.delete(full_key)
             return result > 0
 
-        except RedisError as e:
+        except _REDIS_ERRORS as e:
             logger.warning(f"Cache delete failed for key '{key}': {e}")
             return False
 
@@ -279,7 +726,7 @@ class CacheService:
             result = await self._client.exists(self.make_key(key))
             return result > 0
 
-        except RedisError as e:
+        except _REDIS_ERRORS as e:
             logger.warning(f"Cache exists check failed for key '{key}': {e}")
             return False
 
@@ -297,17 +744,27 @@ class CacheService:
         if not self._connected or not self._client:
             return 0
 
+        if self._local is not None:
+            self._local.clear_prefix(self.make_key(prefix))
+
         try:
             pattern = f"{self.make_key(prefix)}*"
-            keys = []
+            # UNLINK (freed off the server's main thread) each batch as soon
+            # as the scan fills it, so client memory stays bounded by the
+            # batch size rather than the number of matching keys. The
+            # cluster client splits each UNLINK per slot.
+            deleted = 0
+            batch: list[str] = []
             async for key in self._client.scan_iter(match=pattern, count=100):
-                keys.append(key)
-
-            if keys:
-                return await self._client.delete(*keys)
-            return 0
-
-        except RedisError as e:
+                batch.append(key)
+                if len(batch) == _CLEAR_PREFIX_BATCH_SIZE:
+                    deleted += await self._client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self._client.unlink(*batch)
+            return deleted
+
+        except _REDIS_ERRORS as e:
             logger.warning(f"Cache clear_prefix failed for '{prefix}': {e}")
             return 0
 
@@ -327,10 +784,82 @@ class CacheService:
 
         try:
             return await self._client.incr(self.make_key(key))
-        except RedisError as e:
+        except _REDIS_ERRORS as e:
             logger.warning(f"Cache incr failed for key '{key}': {e}")
             return None
 
+    async def hincr(self, key: str) -> int | None:
+        """Increment a counter stored as a field of a shared hash.
+
+        Counters are spread over a fixed set of hashes by a stable hash of
+        the key, so thousands of counters cost a hash field each instead of
+        a top-level key. Fields cannot expire individually; use incr for
+        counters that need a TTL.
+
+        Args:
+            key: Counter name
+
+        Returns:
+            New value after increment, or None on error.
+        """
+        if not self._connected or not self._client:
+            return None
+
+        # crc32 rather than hash(): str hashes differ between processes
+        bucket = zlib.crc32(key.encode()) % _COUNTER_BUCKETS
+        try:
+            return await self._client.hincrby(self.make_key(f"ctr:{bucket}"), key, 1)
+        except _REDIS_ERRORS as e:
+            logger.warning(f"Cache hincr failed for key '{key}': {e}")
+            return None
+
+    async def get_and_count(
+        self, key: str, hit_counter: str, miss_counter: str
+    ) -> Any | None:
+        """Get a value and increment a hit or miss counter in one round-trip.
+
+        Equivalent to ``get`` followed by ``incr`` on whichever counter
+        matches the outcome, but executed as a single Lua script so the
+        lookup and the metric update cost one network round-trip. In
+        cluster mode the keys live in different slots, so the two commands
+        are sent separately.
+
+        Args:
+            key: Cache key to look up
+            hit_counter: Counter key incremented when the value exists
+            miss_counter: Counter key incremented when the value is missing
+
+        Returns:
+            Cached value or None if not found/error.
+        """
+        if not self._connected or not self._client:
+            return None
+
+        full_key = self.make_key(key)
+        try:
+            if self._cluster:
+                # The counters hash to other slots than the key, and a
+                # cluster script may only touch keys in one slot
+                value = await self._client.get(full_key)
+                counter = miss_counter if value is None else hit_counter
+                await self._client.incr(self.make_key(counter))
+            else:
+                value = await self._client.eval(
+                    _GET_AND_COUNT_SCRIPT,
+                    3,
+                    full_key,
+                    self.make_key(hit_counter),
+                    self.make_key(miss_counter),
+                )
+            if value is None:
+                return None
+
+            return await _deserialize_offloaded(value)
+
+        except _REDIS_ERRORS as e:
+            logger.warning(f"Cache get_and_count failed for key '{key}': {e}")
+            return None
+
     async def get_raw(self, key: str) -> str | None:
         """Get a raw string value from cache without JSON deserialization.
 
@@ -347,7 +876,7 @@ class CacheService:
 
         try:
             return await self._client.get(self.make_key(key))
-        except RedisError as e:
+        except _REDIS_ERRORS as e:
             logger.warning(f"Cache get_raw failed for key '{key}': {e}")
             return None
 
@@ -363,10 +892,31 @@ class CacheService:
         if not self._connected or not self._client or not keys:
             return 0
 
+        chunks = [
+            [self.make_key(k) for k in keys[start : start + _DELETE_KEYS_BATCH_SIZE]]
+            for start in range(0, len(keys), _DELETE_KEYS_BATCH_SIZE)
+        ]
+        if self._local is not None:
+            for chunk in chunks:
+                for full_key in chunk:
+                    self._local.delete(full_key)
+
         try:
-            full_keys = [self.make_key(k) for k in keys]
-            return await self._client.delete(*full_keys)
-        except RedisError as e:
+            if self._cluster:
+                # A pipelined DEL must stay within one slot; the cluster
+                # client's own delete splits each chunk per slot
+                deleted = 0
+                for chunk in chunks:
+                    deleted += await self._client.delete(*chunk)
+                return deleted
+
+            # Fixed-size DEL commands bound the size of each command; the
+            # pipeline still sends them all in one round-trip
+            async with self._client.pipeline(transaction=False) as pipe:
+                for chunk in chunks:
+                    pipe.delete(*chunk)
+                return sum(await pipe.execute())
+        except _REDIS_ERRORS as e:
             logger.warning(f"Cache delete_keys failed: {e}")
             return 0
 
@@ -397,7 +947,7 @@ class CacheService:
                 "misses": misses,
                 "hit_rate": round(hit_rate, 2),
             }
-        except RedisError as e:
+        except _REDIS_ERRORS as e:
             logger.warning(f"Failed to get cache metrics: {e}")
             return {"connected": False, "enabled": True, "error": str(e)}
 
@@ -411,7 +961,9 @@ class CacheService:
 
         This is a convenience method that combines get and set.
         If the key is not in cache, the factory function is called
-        to compute the value, which is then cached.
+        to compute the value, which is then cached. The write only
+        happens if no concurrent caller stored a value first; in that
+        case the stored value is returned, so racing callers agree.
 
         Args:
             key: Cache key
@@ -433,9 +985,69 @@ class CacheService:
             logger.error(f"Cache factory failed for key '{key}': {e}")
             return None
 
-        # Cache it (ignore failures)
-        await self.set(key, value, ttl)
-        return value
+        if not self._connected or not self._client:
+            return value
+
+        ttl = ttl if ttl is not None else self.default_ttl
+
+        # Cache it unless another caller won the race (ignore failures)
+        try:
+            existing = await self._client.eval(
+                _SET_IF_ABSENT_SCRIPT,
+                1,
+                self.make_key(key),
+                _serialize(value),
+                ttl,
+            )
+        except (*_REDIS_ERRORS, TypeError) as e:
+            logger.warning(f"Cache set failed for key '{key}': {e}")
+            return value
+
+        if existing is None:
+            return value
+        return await _deserialize_offloaded(existing)
+
+    async def get_or_set_many(
+        self,
+        keys: Sequence[str],
+        factory: Callable[[str], Awaitable[Any]],
+        ttl: int | None = None,
+    ) -> list[Any | None]:
+        """Get many values from cache, computing and caching the misses.
+
+        Batched form of get_or_set: one MGET finds the misses, their
+        factories run concurrently, and the new values are written back
+        with one pipelined mset.
+
+        Args:
+            keys: Cache keys
+            factory: Async callable that returns the value for a key
+            ttl: TTL in seconds (default: use default_ttl)
+
+        Returns:
+            Cached or computed values in the same order as keys, with None
+            for each key whose factory failed.
+        """
+        values = await self.mget(*keys)
+        missing = [i for i, value in enumerate(values) if value is None]
+        if not missing:
+            return values
+
+        results = await asyncio.gather(
+            *(factory(keys[i]) for i in missing), return_exceptions=True
+        )
+
+        computed: dict[str, Any] = {}
+        for i, result in zip(missing, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"Cache factory failed for key '{keys[i]}': {result}")
+                continue
+            values[i] = result
+            computed[keys[i]] = result
+
+        # Cache them (ignore failures)
+        await self.mset(computed, ttl)
+        return values
 
 
 # Singleton instance for dependency injection
@@ -5,14 +5,29 @@ from ONNX models using the ONNX Runtime. It handles schema extraction for
 input/output tensors and model metadata like opset version and producer info.
 """
 
+import asyncio
+import ctypes
+import gc
+import hashlib
+import logging
+import os
+import sys
 import time
+from collections import OrderedDict
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import numpy as np
 import onnxruntime as ort
 
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
 
 class ONNXError(Exception):
     """Base exception for ONNX operations."""
@@ -109,7 +124,9 @@ class InferenceResult:
 
     Attributes:
         outputs: Dictionary mapping output names to numpy arrays (converted to lists)
-        inference_time_ms: Time taken for inference in milliseconds
+        inference_time_ms: Time taken for inference in milliseconds. For
+            requests coalesced by run_inference_batched this is the time of
+            the whole batch run, shared by every request in it.
     """
 
     outputs: dict[str, Any]
@@ -172,6 +189,140 @@ _ONNX_DTYPE_MAP: dict[str, str] = {
 }
 
 
+# Numpy dtypes used to feed each ONNX input type. Types without a numeric
+# numpy equivalent (string, bfloat16) fall back to _DEFAULT_NUMPY_DTYPE.
+_ONNX_TO_NUMPY: Mapping[str, np.dtype] = MappingProxyType(
+    {
+        "tensor(float)": np.dtype(np.float32),
+        "tensor(float16)": np.dtype(np.float16),
+        "tensor(double)": np.dtype(np.float64),
+        "tensor(int8)": np.dtype(np.int8),
+        "tensor(int16)": np.dtype(np.int16),
+        "tensor(int32)": np.dtype(np.int32),
+        "tensor(int64)": np.dtype(np.int64),
+        "tensor(uint8)": np.dtype(np.uint8),
+        "tensor(uint16)": np.dtype(np.uint16),
+        "tensor(uint32)": np.dtype(np.uint32),
+        "tensor(uint64)": np.dtype(np.uint64),
+        "tensor(bool)": np.dtype(np.bool_),
+    }
+)
+_DEFAULT_NUMPY_DTYPE = np.dtype(np.float32)
+
+
+# Scalar ModelMetadata attributes copied into validation metadata when set
+_META_ATTRS: tuple[str, ...] = (
+    "producer_name",
+    "producer_version",
+    "graph_name",
+    "description",
+    "domain",
+    "version",
+)
+
+
+# Values accepted by settings.ort_graph_optimization_level
+_GRAPH_OPT_LEVELS: dict[str, ort.GraphOptimizationLevel] = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+# Execution providers in order of preference; the first ones available in the
+# installed onnxruntime build are used when no providers are passed explicitly
+_PREFERRED_PROVIDERS: tuple[str, ...] = (
+    "TensorrtExecutionProvider",
+    "CUDAExecutionProvider",
+    "CoreMLExecutionProvider",
+    "CPUExecutionProvider",
+)
+
+# Options applied to auto-selected providers. Power-of-two arena growth avoids
+# repeated small CUDA allocations; heuristic conv search skips the exhaustive
+# cuDNN benchmark on every new input shape.
+_DEFAULT_PROVIDER_OPTIONS: dict[str, dict[str, Any]] = {
+    "CUDAExecutionProvider": {
+        "device_id": 0,
+        "arena_extend_strategy": "kNextPowerOfTwo",
+        "cudnn_conv_algo_search": "HEURISTIC",
+    },
+}
+
+
+def _default_providers() -> list[str]:
+    """Return the preferred execution providers available on this host.
+
+    Only the CPU provider is returned when settings.ort_enable_gpu is False.
+    """
+    if not settings.ort_enable_gpu:
+        return ["CPUExecutionProvider"]
+    available = set(ort.get_available_providers())
+    return [p for p in _PREFERRED_PROVIDERS if p in available]
+
+
+@lru_cache(maxsize=1)
+def _malloc_trim() -> Any | None:
+    """Return glibc's malloc_trim, or None where it isn't available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL("libc.so.6")
+    except OSError:
+        return None
+    # musl and other libcs don't provide it
+    return getattr(libc, "malloc_trim", None)
+
+
+def _release_memory() -> None:
+    """Return memory freed by dropped sessions to the OS.
+
+    Sessions are freed when their last reference goes away, but glibc keeps
+    the released arena pages mapped. Collecting first catches sessions held
+    in reference cycles; malloc_trim then hands the free pages back.
+    """
+    gc.collect()
+    trim = _malloc_trim()
+    if trim is not None:
+        trim(0)
+
+
+def _ensure_cache_dir(cache_dir: str) -> Path:
+    """Create the optimized-model cache directory if it is missing.
+
+    Checked on every call rather than memoized, so a directory removed
+    while the process runs (tmp cleaner, volume remount) is recreated.
+    """
+    path = Path(cache_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _digest_model_file(path: Path) -> str:
+    """Hash a model file, streaming it into the page cache on the way.
+
+    Only needed on a cache miss when the caller has no stored digest. The
+    read then happens right before ONNX Runtime opens the same file, so
+    it doubles as the cold-cache warm-up: the sequential hint lets the
+    kernel read ahead in large chunks, and ORT's own read then comes
+    straight from memory.
+    """
+    with path.open("rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _resolve_path(model_path: str) -> str:
+    """Resolve a model path to the absolute string used as a cache key.
+
+    Resolution stats every path component, so it is memoized per input
+    string. Existence checks are not cached and still hit the filesystem.
+    """
+    return str(Path(model_path).resolve())
+
+
 class ONNXService:
     """Service for ONNX model operations.
 
@@ -192,7 +343,9 @@ class ONNXService:
     What This Service Does
     ----------------------
     - Load ONNX files into inference sessions
-    - Cache loaded sessions for performance
+    - Cache loaded sessions for performance (LRU-bounded, shared between
+      files with identical content)
+    - Reuse IOBindings and fixed-shape output buffers across calls
     - Run inference given a path and input data
     - Detect post-commitment invariant violations (file missing from cache)
     - Convert between ONNX types and numpy types
@@ -205,18 +358,93 @@ class ONNXService:
     - Adding retries/fallbacks requires modifying callers, not this service
     """
 
-    def __init__(self, providers: list[str] | None = None):
+    def __init__(
+        self,
+        providers: list[str] | None = None,
+        provider_options: list[dict[str, Any]] | None = None,
+        measure_timing: bool = True,
+        max_cached_sessions: int = 16,
+        enable_cpu_mem_arena: bool = True,
+        enable_mem_pattern: bool = True,
+    ):
         """Initialize ONNX service.
 
         Args:
-            providers: List of execution providers to use.
-                      Defaults to ['CPUExecutionProvider'].
+            providers: List of execution providers to use. Defaults to the
+                      accelerated providers available in this onnxruntime
+                      build (TensorRT, CUDA, CoreML) followed by
+                      'CPUExecutionProvider', or CPU only when
+                      settings.ort_enable_gpu is False.
+            provider_options: Per-provider option dicts, in the same order as
+                      providers (e.g. device_id, arena_extend_strategy).
+                      Auto-selected providers get tuned CUDA defaults.
+            measure_timing: Whether to time each inference call. When False,
+                      InferenceResult.inference_time_ms is reported as 0.0.
+            max_cached_sessions: Maximum number of sessions kept loaded. The
+                      least recently used session is evicted beyond this.
+            enable_cpu_mem_arena: Whether each session preallocates a CPU
+                      memory arena. Disabling it trades a small per-op
+                      allocation cost for much lower RSS when many small
+                      sessions are cached.
+            enable_mem_pattern: Whether ORT plans memory from the first run's
+                      allocation pattern. Disable for models whose input
+                      shapes vary between calls.
         """
-        self.providers = providers or ["CPUExecutionProvider"]
-        # Session cache: maps resolved path string to (session, input_names, output_names)
-        self._session_cache: dict[
-            str, tuple[ort.InferenceSession, list[str], list[str]]
+        if providers is None:
+            providers = _default_providers()
+            if provider_options is None:
+                provider_options = [
+                    _DEFAULT_PROVIDER_OPTIONS.get(p, {}) for p in providers
+                ]
+        self.providers = providers
+        self.provider_options = provider_options
+        self._measure_timing = measure_timing
+        self._max_cached_sessions = max_cached_sessions
+        self._enable_cpu_mem_arena = enable_cpu_mem_arena
+        self._enable_mem_pattern = enable_mem_pattern
+        # Session cache: maps resolved path string to (session, input_names, output_names),
+        # ordered from least to most recently used
+        self._session_cache: OrderedDict[
+            str, tuple[ort.InferenceSession, tuple[str, ...], tuple[str, ...]]
+        ] = OrderedDict()
+        # Input specs: maps resolved path string to {input name: (dtype, shape)},
+        # read once per session so the hot path avoids get_inputs() calls
+        self._input_specs: dict[
+            str, dict[str, tuple[np.dtype, tuple[int | str | None, ...]]]
+        ] = {}
+        # IOBinding cache: maps resolved path string to the session's binding.
+        # Bindings are reused across calls and cleared before each run.
+        self._io_binding_cache: dict[str, ort.IOBinding] = {}
+        # Preallocated output arrays for outputs with fully static shapes,
+        # keyed like the binding cache. ORT writes results straight into them.
+        self._output_buffers: dict[str, dict[str, np.ndarray]] = {}
+        # Request coalescing for run_inference_batched: one queue and one
+        # draining task per model, created on demand and dropped when idle.
+        self._batch_queues: dict[str, asyncio.Queue] = {}
+        self._batch_workers: dict[str, asyncio.Task] = {}
+        # Whether a model's signature allows coalescing, decided once per
+        # model from its input and output shapes (see _supports_batching)
+        self._batchable_models: dict[str, bool] = {}
+        # Shape-specialized sessions: maps resolved path string to an LRU of
+        # sessions keyed by their fixed symbolic-dim sizes, e.g.
+        # (("batch_size", 8),). Disabled when ort_max_specialized_shapes is 0.
+        self._max_specialized_shapes = settings.ort_max_specialized_shapes
+        self._specialized_sessions: dict[
+            str, OrderedDict[tuple[tuple[str, int], ...], ort.InferenceSession]
         ] = {}
+        # Content-addressed sharing: model files with identical bytes (e.g. the
+        # same ONNX uploaded under two model IDs) share one session. Maps the
+        # resolved path to its SHA-256, and each digest to the shared
+        # (session entry, input specs) plus the number of paths using it.
+        self._path_digests: dict[str, str] = {}
+        self._shared_sessions: dict[
+            str,
+            tuple[
+                tuple[ort.InferenceSession, tuple[str, ...], tuple[str, ...]],
+                dict[str, tuple[np.dtype, tuple[int | str | None, ...]]],
+            ],
+        ] = {}
+        self._shared_session_refs: dict[str, int] = {}
 
     def validate(self, model_path: Path | str) -> ValidationResult:
         """Validate an ONNX model and extract its schemas.
@@ -303,17 +531,20 @@ class ONNXService:
             raise ONNXLoadError(f"Model file not found: {path}")
 
         try:
-            return self._load_session(path)
+            return self._load_session(path, use_optimized_cache=True)
         except Exception as e:
             raise ONNXLoadError(f"Failed to load model: {str(e)}") from e
 
     def get_cached_session(
-        self, model_path: Path | str
-    ) -> tuple[ort.InferenceSession, list[str], list[str]]:
+        self, model_path: Path | str, file_hash: str | None = None
+    ) -> tuple[ort.InferenceSession, tuple[str, ...], tuple[str, ...]]:
         """Get a cached inference session, loading if necessary.
 
         Args:
             model_path: Path to the .onnx model file
+            file_hash: SHA-256 hex digest of the file, as stored in
+                      ml_models.file_hash. Keys the content-shared session;
+                      the file is only hashed when it is not given.
 
         Returns:
             Tuple of (session, input_names, output_names)
@@ -322,8 +553,8 @@ class ONNXService:
             ONNXLoadError: If model fails to load
             PostCommitmentInvariantViolation: If committed model's file no longer exists
         """
-        path = Path(model_path).resolve()
-        cache_key = str(path)
+        cache_key = _resolve_path(str(model_path))
+        path = Path(cache_key)
 
         # ---------------------------------------------------------------------
         # POST-COMMITMENT INVARIANT CHECK
@@ -335,6 +566,7 @@ class ONNXService:
         if cache_key in self._session_cache:
             if not path.exists():
                 del self._session_cache[cache_key]
+                self._drop_model_state(cache_key)
                 raise PostCommitmentInvariantViolation(
                     f"POST-COMMITMENT INVARIANT VIOLATED. "
                     f"Invariant: file_path points to a valid ONNX file. "
@@ -342,18 +574,49 @@ class ONNXService:
                     f"The pipeline contract is broken. Execution cannot continue."
                 )
 
-        if cache_key not in self._session_cache:
+        if cache_key in self._session_cache:
+            self._session_cache.move_to_end(cache_key)
+            return self._session_cache[cache_key]
+
+        digest = file_hash
+        if digest is None:
+            try:
+                digest = _digest_model_file(path)
+            except OSError as e:
+                raise ONNXLoadError(f"Failed to read model file: {e}") from e
+
+        shared = self._shared_sessions.get(digest)
+        if shared is None:
             session = self.load_session(path)
-            input_names = [inp.name for inp in session.get_inputs()]
-            output_names = [out.name for out in session.get_outputs()]
-            self._session_cache[cache_key] = (session, input_names, output_names)
-
-        return self._session_cache[cache_key]
+            input_specs = {
+                meta.name: (
+                    self._onnx_type_to_numpy_dtype(meta.type),
+                    tuple(meta.shape),
+                )
+                for meta in session.get_inputs()
+            }
+            input_names = tuple(input_specs)
+            output_names = tuple(out.name for out in session.get_outputs())
+            shared = ((session, input_names, output_names), input_specs)
+            self._shared_sessions[digest] = shared
+        entry, input_specs = shared
+        self._shared_session_refs[digest] = self._shared_session_refs.get(digest, 0) + 1
+        self._path_digests[cache_key] = digest
+        self._session_cache[cache_key] = entry
+        self._input_specs[cache_key] = input_specs
+
+        # Evict least recently used sessions so loaded weights stay bounded
+        while len(self._session_cache) > self._max_cached_sessions:
+            evicted_key, _ = self._session_cache.popitem(last=False)
+            self._drop_model_state(evicted_key)
+
+        return entry
 
     def run_inference(
         self,
         model_path: Path | str,
         input_data: dict[str, Any],
+        file_hash: str | None = None,
     ) -> InferenceResult:
         """Run inference on the model with the given input.
 
@@ -361,6 +624,7 @@ class ONNXService:
             model_path: Path to the .onnx model file
             input_data: Dictionary mapping input names to data.
                        Data can be lists or numpy arrays.
+            file_hash: Stored SHA-256 of the model file (see get_cached_session)
 
         Returns:
             InferenceResult with outputs and timing
@@ -370,82 +634,538 @@ class ONNXService:
             ONNXInputError: If input data is invalid
             ONNXInferenceError: If inference fails
         """
-        session, input_names, output_names = self.get_cached_session(model_path)
+        session, input_names, output_names = self.get_cached_session(
+            model_path, file_hash
+        )
+        cache_key = _resolve_path(str(model_path))
+        input_specs = self._input_specs[cache_key]
 
-        # Validate all required inputs are provided
-        missing_inputs = set(input_names) - set(input_data.keys())
-        if missing_inputs:
-            raise ONNXInputError(
-                f"Missing required inputs: {', '.join(sorted(missing_inputs))}. "
-                f"Expected inputs: {', '.join(input_names)}"
-            )
+        self._check_required_inputs(input_names, input_data)
 
         # Convert inputs to numpy arrays with proper dtype
         try:
-            numpy_inputs = self._prepare_inputs(session, input_data)
+            numpy_inputs = self._prepare_inputs(input_specs, input_data)
         except Exception as e:
             raise ONNXInputError(f"Failed to prepare inputs: {str(e)}") from e
 
+        binding_key = cache_key
+        if self._max_specialized_shapes > 0:
+            dim_sizes = self._symbolic_dim_sizes(input_specs, numpy_inputs)
+            if dim_sizes:
+                session, binding_key = self._get_specialized_session(
+                    cache_key, dim_sizes
+                )
+
         # Run inference with timing
+        elapsed_ns = 0
         try:
-            start_time = time.perf_counter()
-            results = session.run(output_names, numpy_inputs)
-            end_time = time.perf_counter()
-            inference_time_ms = (end_time - start_time) * 1000
+            if self._measure_timing:
+                start_ns = time.perf_counter_ns()
+                results = self._run_with_iobinding(
+                    binding_key, session, output_names, numpy_inputs
+                )
+                elapsed_ns = time.perf_counter_ns() - start_ns
+            else:
+                results = self._run_with_iobinding(
+                    binding_key, session, output_names, numpy_inputs
+                )
         except Exception as e:
             raise ONNXInferenceError(f"Inference failed: {str(e)}") from e
 
-        # Convert outputs to serializable format
-        outputs = {}
-        for name, result in zip(output_names, results, strict=True):
-            # Convert numpy arrays to nested lists for JSON serialization
-            if isinstance(result, np.ndarray):
-                outputs[name] = result.tolist()
-            else:
-                outputs[name] = result
+        # Convert numpy arrays to nested lists for JSON serialization. ORT
+        # returns exactly one result per requested name, so the zip is not
+        # length-checked on the hot path.
+        outputs = {
+            name: result.tolist() if isinstance(result, np.ndarray) else result
+            for name, result in zip(output_names, results, strict=False)
+        }
 
         return InferenceResult(
             outputs=outputs,
-            inference_time_ms=inference_time_ms,
+            inference_time_ms=elapsed_ns / 1_000_000,
         )
 
-    def _prepare_inputs(
+    def run_inference_raw(
+        self,
+        model_path: Path | str,
+        numpy_inputs: dict[str, np.ndarray],
+        file_hash: str | None = None,
+    ) -> dict[str, np.ndarray]:
+        """Run inference on numpy inputs and return numpy outputs.
+
+        Skips required-input checks, dtype coercion, timing and list
+        conversion. The caller is responsible for passing every model input
+        with the model's dtype; ORT rejects mismatched types.
+
+        Args:
+            model_path: Path to the .onnx model file
+            numpy_inputs: Dictionary mapping input names to numpy arrays
+            file_hash: Stored SHA-256 of the model file (see get_cached_session)
+
+        Returns:
+            Dictionary mapping output names to numpy arrays
+
+        Raises:
+            ONNXLoadError: If model fails to load
+            ONNXInferenceError: If inference fails
+        """
+        session, _, output_names = self.get_cached_session(model_path, file_hash)
+        cache_key = _resolve_path(str(model_path))
+
+        # Inputs are bound by pointer, so they must be C-contiguous; this is
+        # a no-op for arrays that already are
+        contiguous_inputs = {
+            name: np.ascontiguousarray(arr) for name, arr in numpy_inputs.items()
+        }
+
+        try:
+            results = self._run_with_iobinding(
+                cache_key, session, output_names, contiguous_inputs
+            )
+        except Exception as e:
+            raise ONNXInferenceError(f"Inference failed: {str(e)}") from e
+
+        # Preallocated output buffers are overwritten by the next run, so
+        # hand the caller its own copy of those
+        buffers = self._output_buffers.get(cache_key, {})
+        return {
+            name: result.copy() if name in buffers else result
+            for name, result in zip(output_names, results, strict=False)
+        }
+
+    async def run_inference_batched(
+        self,
+        model_path: Path | str,
+        input_data: dict[str, Any],
+        max_batch: int = 32,
+        max_delay_ms: float = 2.0,
+        file_hash: str | None = None,
+    ) -> InferenceResult:
+        """Run inference, coalescing concurrent requests into one session run.
+
+        Requests for the same model that arrive within max_delay_ms of each
+        other are concatenated along axis 0 and executed as a single batch,
+        then the outputs are split back per request. Only models whose
+        inputs all have a dynamic first dimension, and whose outputs all
+        carry that same symbolic batch dimension, can be batched; other
+        models are run directly via run_inference.
+
+        The reported inference_time_ms is the time of the shared batch run,
+        so every request coalesced into a run reports the same figure.
+
+        Args:
+            model_path: Path to the .onnx model file
+            input_data: Dictionary mapping input names to data.
+                       Each input must include the batch dimension.
+            max_batch: Maximum number of requests combined into one run
+            max_delay_ms: How long to wait for more requests after the first
+            file_hash: Stored SHA-256 of the model file (see get_cached_session)
+
+        Returns:
+            InferenceResult with this request's outputs
+
+        Raises:
+            ONNXLoadError: If model fails to load
+            ONNXInputError: If input data is invalid
+            ONNXInferenceError: If inference fails
+        """
+        session, input_names, output_names = self.get_cached_session(
+            model_path, file_hash
+        )
+        cache_key = _resolve_path(str(model_path))
+        input_specs = self._input_specs[cache_key]
+        self._check_required_inputs(input_names, input_data)
+
+        try:
+            numpy_inputs = self._prepare_inputs(input_specs, input_data)
+        except Exception as e:
+            raise ONNXInputError(f"Failed to prepare inputs: {str(e)}") from e
+
+        batchable = self._batchable_models.get(cache_key)
+        if batchable is None:
+            batchable = self._supports_batching(session, input_specs)
+            self._batchable_models[cache_key] = batchable
+        # Per-request sizes are read from one input when splitting the
+        # batched outputs, so every input must agree on the leading dim
+        batchable = (
+            batchable
+            and all(arr.ndim > 0 for arr in numpy_inputs.values())
+            and len({arr.shape[0] for arr in numpy_inputs.values()}) == 1
+        )
+        if not batchable:
+            return self.run_inference(model_path, input_data, file_hash)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[InferenceResult] = loop.create_future()
+
+        queue = self._batch_queues.setdefault(cache_key, asyncio.Queue())
+        queue.put_nowait((numpy_inputs, future))
+        if cache_key not in self._batch_workers:
+            self._batch_workers[cache_key] = asyncio.create_task(
+                self._drain_batch_queue(
+                    cache_key, session, output_names, max_batch, max_delay_ms
+                )
+            )
+
+        return await future
+
+    @staticmethod
+    def _supports_batching(
+        session: ort.InferenceSession,
+        input_specs: dict[str, tuple[np.dtype, tuple[int | str | None, ...]]],
+    ) -> bool:
+        """Check whether a model's requests can be concatenated and split.
+
+        Every input needs a dynamic first dimension to concatenate along,
+        and every output must keep one of the inputs' batch symbols as its
+        first dimension, so that splitting it along axis 0 gives each
+        request its own rows. Outputs that reduce, reshape or otherwise
+        drop the batch axis (or whose first dim is unknown) rule it out.
+        """
+        batch_dims = set()
+        for _, shape in input_specs.values():
+            if not shape or isinstance(shape[0], int):
+                return False
+            batch_dims.add(shape[0])
+
+        for meta in session.get_outputs():
+            if not meta.shape or not isinstance(meta.shape[0], str):
+                return False
+            if meta.shape[0] not in batch_dims:
+                return False
+        return True
+
+    async def _drain_batch_queue(
+        self,
+        cache_key: str,
+        session: ort.InferenceSession,
+        output_names: tuple[str, ...],
+        max_batch: int,
+        max_delay_ms: float,
+    ) -> None:
+        """Collect queued requests for one model and run them in batches.
+
+        Exits (and deregisters itself) as soon as the queue is empty, so no
+        task outlives the requests it serves. If it stops for any other
+        reason, the requests it holds or that are still queued fail instead
+        of waiting forever, and the next request starts a fresh worker.
+        """
+        queue = self._batch_queues[cache_key]
+        loop = asyncio.get_running_loop()
+        pending: list[tuple[dict[str, np.ndarray], Any]] = []
+
+        try:
+            while True:
+                try:
+                    pending = [queue.get_nowait()]
+                except asyncio.QueueEmpty:
+                    return
+
+                deadline = loop.time() + max_delay_ms / 1000
+                while len(pending) < max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        pending.append(await asyncio.wait_for(queue.get(), timeout))
+                    except TimeoutError:
+                        break
+
+                # Requests can only share a run if their non-batch dims agree
+                groups: dict[tuple, list[tuple[dict[str, np.ndarray], Any]]] = {}
+                for numpy_inputs, future in pending:
+                    signature = tuple(
+                        (name, arr.shape[1:], arr.dtype.str)
+                        for name, arr in sorted(numpy_inputs.items())
+                    )
+                    groups.setdefault(signature, []).append((numpy_inputs, future))
+
+                for group in groups.values():
+                    await self._run_batch_group(session, output_names, group)
+        finally:
+            del self._batch_workers[cache_key]
+            del self._batch_queues[cache_key]
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+            error = ONNXInferenceError("Inference failed: batch worker stopped")
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def _run_batch_group(
         self,
         session: ort.InferenceSession,
+        output_names: tuple[str, ...],
+        group: list[tuple[dict[str, np.ndarray], Any]],
+    ) -> None:
+        """Run one shape-compatible group of requests and resolve their futures.
+
+        Args:
+            session: ONNX Runtime session
+            output_names: Names of the outputs to fetch
+            group: (numpy_inputs, future) pairs with matching non-batch dims
+        """
+        elapsed_ns = 0
+        try:
+            sizes = [len(next(iter(inputs.values()))) for inputs, _ in group]
+            boundaries = np.cumsum(sizes)[:-1]
+            batched_inputs = {
+                name: np.concatenate([inputs[name] for inputs, _ in group], axis=0)
+                for name in group[0][0]
+            }
+
+            if self._measure_timing:
+                start_ns = time.perf_counter_ns()
+                results = await asyncio.to_thread(
+                    session.run, output_names, batched_inputs
+                )
+                elapsed_ns = time.perf_counter_ns() - start_ns
+            else:
+                results = await asyncio.to_thread(
+                    session.run, output_names, batched_inputs
+                )
+            split_results = [np.split(result, boundaries) for result in results]
+        except Exception as e:
+            error = ONNXInferenceError(f"Inference failed: {str(e)}")
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        inference_time_ms = elapsed_ns / 1_000_000
+        for index, (_, future) in enumerate(group):
+            if future.done():
+                continue
+            outputs = {
+                name: parts[index].tolist()
+                for name, parts in zip(output_names, split_results, strict=False)
+            }
+            future.set_result(
+                InferenceResult(outputs=outputs, inference_time_ms=inference_time_ms)
+            )
+
+    def _check_required_inputs(
+        self, input_names: tuple[str, ...], input_data: dict[str, Any]
+    ) -> None:
+        """Ensure every model input is present in the request.
+
+        Args:
+            input_names: Input names declared by the model
+            input_data: Request input data
+
+        Raises:
+            ONNXInputError: If any required input is missing
+        """
+        # Direct membership checks avoid building two sets per call; the
+        # result is almost always empty
+        missing_inputs = [name for name in input_names if name not in input_data]
+        if missing_inputs:
+            raise ONNXInputError(
+                f"Missing required inputs: {', '.join(sorted(missing_inputs))}. "
+                f"Expected inputs: {', '.join(input_names)}"
+            )
+
+    def _prepare_inputs(
+        self,
+        input_specs: dict[str, tuple[np.dtype, tuple[int | str | None, ...]]],
         input_data: dict[str, Any],
     ) -> dict[str, np.ndarray]:
         """Prepare input data by converting to numpy arrays with correct dtypes.
 
         Args:
-            session: ONNX Runtime session
+            input_specs: Cached {input name: (dtype, shape)} for the session
             input_data: Raw input data
 
         Returns:
             Dictionary of numpy arrays ready for inference
         """
         numpy_inputs = {}
-        input_metas = {inp.name: inp for inp in session.get_inputs()}
 
         for name, data in input_data.items():
-            if name not in input_metas:
+            spec = input_specs.get(name)
+            if spec is None:
                 # Skip extra inputs (not an error, just ignore)
                 continue
 
-            meta = input_metas[name]
-            onnx_type = meta.type
+            # A single asarray call covers every case with at most one copy:
+            # a C-contiguous ndarray of the right dtype is returned as-is,
+            # other arrays are cast once, and nested lists from JSON are
+            # converted in numpy's C loop. (A JIT helper would have to unbox
+            # the same Python objects first, so it cannot beat this.)
+            numpy_inputs[name] = np.asarray(data, dtype=spec[0], order="C")
+
+        return numpy_inputs
+
+    def _symbolic_dim_sizes(
+        self,
+        input_specs: dict[str, tuple[np.dtype, tuple[int | str | None, ...]]],
+        numpy_inputs: dict[str, np.ndarray],
+    ) -> tuple[tuple[str, int], ...] | None:
+        """Read the concrete size of every named dynamic dim from the inputs.
+
+        Args:
+            input_specs: Cached {input name: (dtype, shape)} for the session
+            numpy_inputs: Prepared input arrays
+
+        Returns:
+            Sorted (dim name, size) pairs, or None if the model has no named
+            dynamic dims or the inputs disagree with the declared ranks/sizes
+            (left for the generic session to accept or reject)
+        """
+        sizes: dict[str, int] = {}
+        for name, arr in numpy_inputs.items():
+            shape = input_specs[name][1]
+            if len(shape) != arr.ndim:
+                return None
+            for dim, size in zip(shape, arr.shape, strict=True):
+                if isinstance(dim, str) and sizes.setdefault(dim, size) != size:
+                    return None
+        return tuple(sorted(sizes.items())) or None
+
+    def _get_specialized_session(
+        self, cache_key: str, dim_sizes: tuple[tuple[str, int], ...]
+    ) -> tuple[ort.InferenceSession, str]:
+        """Get (or build) a session with the given dynamic dims fixed.
+
+        Fixing the free dimensions lets ORT plan memory and fold shapes for
+        that exact input size. Sessions are kept per model in an LRU bounded
+        by ort_max_specialized_shapes.
+
+        Args:
+            cache_key: Resolved model path
+            dim_sizes: (dim name, size) pairs from _symbolic_dim_sizes
+
+        Returns:
+            Tuple of (session, IOBinding cache key for that session)
+
+        Raises:
+            ONNXLoadError: If the specialized session fails to load
+        """
+        sessions = self._specialized_sessions.setdefault(cache_key, OrderedDict())
+        session = sessions.get(dim_sizes)
+        if session is not None:
+            sessions.move_to_end(dim_sizes)
+            return session, f"{cache_key}|{dim_sizes}"
+
+        try:
+            session = self._load_session(
+                Path(cache_key), use_optimized_cache=True, dim_overrides=dim_sizes
+            )
+        except Exception as e:
+            raise ONNXLoadError(f"Failed to load model: {str(e)}") from e
+        sessions[dim_sizes] = session
 
-            # Determine numpy dtype from ONNX type
-            dtype = self._onnx_type_to_numpy_dtype(onnx_type)
+        while len(sessions) > self._max_specialized_shapes:
+            evicted_sizes, _ = sessions.popitem(last=False)
+            self._io_binding_cache.pop(f"{cache_key}|{evicted_sizes}", None)
+            self._output_buffers.pop(f"{cache_key}|{evicted_sizes}", None)
 
-            # Convert to numpy array
-            if isinstance(data, np.ndarray):
-                arr = data.astype(dtype)
+        return session, f"{cache_key}|{dim_sizes}"
+
+    def _run_with_iobinding(
+        self,
+        binding_key: str,
+        session: ort.InferenceSession,
+        output_names: tuple[str, ...],
+        numpy_inputs: dict[str, np.ndarray],
+    ) -> list[Any]:
+        """Run the session with inputs bound directly to the numpy buffers.
+
+        ORT reads each input from the array's memory instead of copying it
+        into its own buffers first. String tensors cannot be bound by
+        pointer, so those fall back to a regular ``session.run``.
+
+        Args:
+            binding_key: Key for the session's cached binding and buffers
+                (the resolved model path, or a shape-specialized variant)
+            session: ONNX Runtime session
+            output_names: Names of the outputs to fetch
+            numpy_inputs: C-contiguous input arrays from _prepare_inputs
+
+        Returns:
+            List of output arrays in output_names order
+        """
+        if any(arr.dtype.kind in "OUS" for arr in numpy_inputs.values()):
+            return session.run(output_names, numpy_inputs)
+
+        binding = self._io_binding_cache.get(binding_key)
+        if binding is None:
+            binding = session.io_binding()
+            self._io_binding_cache[binding_key] = binding
+            self._output_buffers[binding_key] = self._allocate_output_buffers(session)
+        else:
+            binding.clear_binding_inputs()
+            binding.clear_binding_outputs()
+        buffers = self._output_buffers[binding_key]
+
+        for name, arr in numpy_inputs.items():
+            binding.bind_input(
+                name, "cpu", 0, arr.dtype.type, list(arr.shape), arr.ctypes.data
+            )
+        for name in output_names:
+            buffer = buffers.get(name)
+            if buffer is None:
+                binding.bind_output(name, "cpu")
             else:
-                arr = np.array(data, dtype=dtype)
+                binding.bind_output(
+                    name,
+                    "cpu",
+                    0,
+                    buffer.dtype.type,
+                    list(buffer.shape),
+                    buffer.ctypes.data,
+                )
 
-            numpy_inputs[name] = arr
+        session.run_with_iobinding(binding)
 
-        return numpy_inputs
+        # Preallocated buffers are reused by the next call, so callers must
+        # copy them (e.g. via tolist()) before running this model again
+        return [
+            buffers[name] if name in buffers else value.numpy()
+            for name, value in zip(output_names, binding.get_outputs(), strict=False)
+        ]
+
+    def _allocate_output_buffers(
+        self, session: ort.InferenceSession
+    ) -> dict[str, np.ndarray]:
+        """Allocate reusable arrays for outputs whose shape is fully static.
+
+        Outputs with dynamic dims or non-numeric types are left to ORT, which
+        allocates them per call.
+
+        Args:
+            session: ONNX Runtime session
+
+        Returns:
+            Dictionary mapping output names to preallocated arrays
+        """
+        buffers = {}
+        for meta in session.get_outputs():
+            dtype = _ONNX_DTYPE_MAP.get(meta.type)
+            if dtype in (None, "string", "bfloat16"):
+                continue
+            if not all(isinstance(dim, int) for dim in meta.shape):
+                continue
+            buffers[meta.name] = np.empty(meta.shape, dtype=dtype)
+        return buffers
+
+    def _drop_model_state(self, cache_key: str) -> None:
+        """Forget everything cached for a model except its main session."""
+        self._input_specs.pop(cache_key, None)
+        self._batchable_models.pop(cache_key, None)
+        self._io_binding_cache.pop(cache_key, None)
+        self._output_buffers.pop(cache_key, None)
+        for dim_sizes in self._specialized_sessions.pop(cache_key, {}):
+            self._io_binding_cache.pop(f"{cache_key}|{dim_sizes}", None)
+            self._output_buffers.pop(f"{cache_key}|{dim_sizes}", None)
+
+        # The shared session goes once no cached path refers to it
+        digest = self._path_digests.pop(cache_key, None)
+        if digest is not None:
+            self._shared_session_refs[digest] -= 1
+            if self._shared_session_refs[digest] == 0:
+                del self._shared_session_refs[digest]
+                del self._shared_sessions[digest]
 
     def _onnx_type_to_numpy_dtype(self, onnx_type: str) -> np.dtype:
         """Convert ONNX type string to numpy dtype.
@@ -456,46 +1176,58 @@ class ONNXService:
         Returns:
             Numpy dtype
         """
-        dtype_map = {
-            "tensor(float)": np.float32,
-            "tensor(float16)": np.float16,
-            "tensor(double)": np.float64,
-            "tensor(int8)": np.int8,
-            "tensor(int16)": np.int16,
-            "tensor(int32)": np.int32,
-            "tensor(int64)": np.int64,
-            "tensor(uint8)": np.uint8,
-            "tensor(uint16)": np.uint16,
-            "tensor(uint32)": np.uint32,
-            "tensor(uint64)": np.uint64,
-            "tensor(bool)": np.bool_,
-        }
-        return np.dtype(dtype_map.get(onnx_type, np.float32))
+        return _ONNX_TO_NUMPY.get(onnx_type, _DEFAULT_NUMPY_DTYPE)
 
     def clear_cache(self) -> None:
-        """Clear all cached sessions."""
+        """Clear all cached sessions and release their memory."""
         self._session_cache.clear()
+        self._input_specs.clear()
+        self._batchable_models.clear()
+        self._io_binding_cache.clear()
+        self._output_buffers.clear()
+        self._specialized_sessions.clear()
+        self._path_digests.clear()
+        self._shared_sessions.clear()
+        self._shared_session_refs.clear()
+        _release_memory()
 
     def remove_from_cache(self, model_path: Path | str) -> bool:
         """Remove a specific model from the session cache.
 
+        The model's sessions, bindings and buffers are dropped and the freed
+        memory is returned to the OS.
+
         Args:
             model_path: Path to the model to remove
 
         Returns:
             True if model was in cache and removed, False otherwise
         """
-        cache_key = str(Path(model_path).resolve())
+        cache_key = _resolve_path(str(model_path))
         if cache_key in self._session_cache:
             del self._session_cache[cache_key]
+            self._drop_model_state(cache_key)
+            _release_memory()
             return True
         return False
 
-    def _load_session(self, path: Path) -> ort.InferenceSession:
+    def _load_session(
+        self,
+        path: Path,
+        use_optimized_cache: bool = False,
+        dim_overrides: tuple[tuple[str, int], ...] = (),
+    ) -> ort.InferenceSession:
         """Internal method to create inference session.
 
         Args:
             path: Path to the ONNX model
+            use_optimized_cache: Load from (or write to) the persisted
+                optimized-graph cache (and, with settings.ort_quantize_int8,
+                the INT8 copy) when settings.ort_optimized_model_dir is set.
+                Validation leaves this off so it always checks the uploaded
+                file itself.
+            dim_overrides: (dim name, size) pairs fixing named dynamic dims.
+                Specialized graphs are not persisted to the optimized cache.
 
         Returns:
             ONNX Runtime InferenceSession
@@ -503,12 +1235,161 @@ class ONNXService:
         # Use session options for better error messages
         sess_options = ort.SessionOptions()
         sess_options.log_severity_level = 3  # Error level only
-
-        return ort.InferenceSession(
-            str(path),
-            sess_options=sess_options,
-            providers=self.providers,
+        sess_options.enable_cpu_mem_arena = self._enable_cpu_mem_arena
+        sess_options.enable_mem_pattern = self._enable_mem_pattern
+
+        # Thread pools and graph optimization are deployment concerns, so
+        # they come from settings rather than per-service arguments
+        sess_options.intra_op_num_threads = settings.ort_intra_op_num_threads
+        sess_options.inter_op_num_threads = settings.ort_inter_op_num_threads
+        sess_options.graph_optimization_level = _GRAPH_OPT_LEVELS[
+            settings.ort_graph_optimization_level.lower()
+        ]
+        if not settings.ort_allow_spinning:
+            sess_options.add_session_config_entry(
+                "session.intra_op.allow_spinning", "0"
+            )
+            sess_options.add_session_config_entry(
+                "session.inter_op.allow_spinning", "0"
+            )
+        for dim_name, size in dim_overrides:
+            sess_options.add_free_dimension_override_by_name(dim_name, size)
+
+        # Opt-in INT8 weights: quantize once, then load the cached copy
+        load_path = path
+        if use_optimized_cache:
+            quantized_path = self._quantized_model_path(path)
+            if quantized_path is not None:
+                if not quantized_path.exists():
+                    self._quantize_model(path, quantized_path)
+                load_path = quantized_path
+
+        # A previously optimized copy skips the optimizer on warm starts;
+        # otherwise ORT writes one while building this session
+        optimized_path = (
+            self._optimized_model_path(load_path)
+            if use_optimized_cache and not dim_overrides
+            else None
         )
+        tmp_path = None
+        if optimized_path is not None:
+            if optimized_path.exists():
+                load_path = optimized_path
+                sess_options.graph_optimization_level = (
+                    ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+                )
+            else:
+                tmp_path = optimized_path.with_name(
+                    f"{optimized_path.name}.{os.getpid()}.tmp"
+                )
+                sess_options.optimized_model_filepath = str(tmp_path)
+
+        # Load by path rather than from an mmap'd buffer. The Python API only
+        # accepts `bytes`, so mapping the file would still copy it in full and
+        # the session keeps that copy alive for its lifetime, doubling RSS for
+        # large models. The native loader reads the file once and maps any
+        # external-data initializers itself.
+        try:
+            session = ort.InferenceSession(
+                str(load_path),
+                sess_options=sess_options,
+                providers=self.providers,
+                provider_options=self.provider_options,
+            )
+            if tmp_path is not None and tmp_path.exists():
+                os.replace(tmp_path, optimized_path)
+        finally:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+        logger.info(f"Loaded ONNX session {path.name} on {session.get_providers()}")
+        return session
+
+    def _optimized_model_path(self, path: Path) -> Path | None:
+        """Return where the optimized graph for a model file is persisted.
+
+        The key covers the file's path, size and mtime plus the optimization
+        level, so a re-uploaded model or a changed level never reuses a stale
+        graph. ENABLE_ALL output can contain provider-specific fused nodes, so
+        it is only persisted for CPU-only sessions.
+
+        Args:
+            path: Path to the ONNX model
+
+        Returns:
+            Path for the optimized model, or None if persistence is disabled
+        """
+        if not settings.ort_optimized_model_dir:
+            return None
+
+        level = settings.ort_graph_optimization_level.lower()
+        if level == "disable":
+            return None
+        if level == "all" and self.providers != ["CPUExecutionProvider"]:
+            return None
+
+        return self._model_cache_path(path, level, "opt")
+
+    def _quantized_model_path(self, path: Path) -> Path | None:
+        """Return where the INT8-quantized copy of a model file is cached.
+
+        Args:
+            path: Path to the ONNX model
+
+        Returns:
+            Path for the quantized model, or None if quantization is off or
+            settings.ort_optimized_model_dir is unset
+        """
+        if not settings.ort_quantize_int8 or not settings.ort_optimized_model_dir:
+            return None
+        return self._model_cache_path(path, "qint8", "int8")
+
+    @staticmethod
+    def _model_cache_path(path: Path, variant: str, suffix: str) -> Path:
+        """Build a cache file path keyed by a model file's path, size and mtime.
+
+        Args:
+            path: Path to the source ONNX model
+            variant: Extra key component (e.g. optimization level)
+            suffix: File suffix inserted before '.onnx'
+
+        Returns:
+            Path inside settings.ort_optimized_model_dir
+        """
+        stat = path.stat()
+        key = hashlib.sha256(
+            f"{path}:{stat.st_size}:{stat.st_mtime_ns}:{variant}".encode()
+        ).hexdigest()[:32]
+
+        cache_dir = _ensure_cache_dir(settings.ort_optimized_model_dir)
+        return cache_dir / f"{key}.{suffix}.onnx"
+
+    @staticmethod
+    def _quantize_model(path: Path, quantized_path: Path) -> None:
+        """Write a dynamically INT8-quantized copy of a model.
+
+        Weights of MatMul/Conv-style ops are stored as INT8 and activations
+        are quantized at run time, so no calibration data is needed. The
+        model's inputs and outputs keep their original types.
+
+        Args:
+            path: Path to the source ONNX model
+            quantized_path: Destination for the quantized model
+        """
+        # Imported lazily: pulls in the onnx package and is rarely enabled
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        tmp_path = quantized_path.with_name(f"{quantized_path.name}.{os.getpid()}.tmp")
+        try:
+            quantize_dynamic(
+                model_input=path,
+                model_output=tmp_path,
+                weight_type=QuantType.QInt8,
+            )
+            os.replace(tmp_path, quantized_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        logger.info(f"Quantized ONNX model {path.name} to INT8")
 
     def _extract_input_schema(
         self, session: ort.InferenceSession
@@ -521,18 +1402,14 @@ class ONNXService:
         Returns:
             List of TensorSchema for each input
         """
-        schemas = []
-        for input_meta in session.get_inputs():
-            dtype = self._convert_dtype(input_meta.type)
-            shape = self._convert_shape(input_meta.shape)
-            schemas.append(
-                TensorSchema(
-                    name=input_meta.name,
-                    dtype=dtype,
-                    shape=shape,
-                )
+        return [
+            TensorSchema(
+                name=meta.name,
+                dtype=self._convert_dtype(meta.type),
+                shape=self._convert_shape(meta.shape),
             )
-        return schemas
+            for meta in session.get_inputs()
+        ]
 
     def _extract_output_schema(
         self, session: ort.InferenceSession
@@ -545,18 +1422,14 @@ class ONNXService:
         Returns:
             List of TensorSchema for each output
         """
-        schemas = []
-        for output_meta in session.get_outputs():
-            dtype = self._convert_dtype(output_meta.type)
-            shape = self._convert_shape(output_meta.shape)
-            schemas.append(
-                TensorSchema(
-                    name=output_meta.name,
-                    dtype=dtype,
-                    shape=shape,
-                )
+        return [
+            TensorSchema(
+                name=meta.name,
+                dtype=self._convert_dtype(meta.type),
+                shape=self._convert_shape(meta.shape),
             )
-        return schemas
+            for meta in session.get_outputs()
+        ]
 
     def _extract_metadata(
         self, session: ort.InferenceSession, path: Path
@@ -582,34 +1455,11 @@ class ONNXService:
         # Get model metadata from session
         model_meta = session.get_modelmeta()
 
-        # Producer information - use getattr for compatibility across onnxruntime versions
-        producer_name = getattr(model_meta, "producer_name", None)
-        if producer_name:
-            metadata["producer_name"] = producer_name
-
-        producer_version = getattr(model_meta, "producer_version", None)
-        if producer_version:
-            metadata["producer_version"] = producer_version
-
-        # Graph name
-        graph_name = getattr(model_meta, "graph_name", None)
-        if graph_name:
-            metadata["graph_name"] = graph_name
-
-        # Description
-        description = getattr(model_meta, "description", None)
-        if description:
-            metadata["description"] = description
-
-        # Domain
-        domain = getattr(model_meta, "domain", None)
-        if domain:
-            metadata["domain"] = domain
-
-        # Model version
-        version = getattr(model_meta, "version", None)
-        if version:
-            metadata["version"] = version
+        # Scalar fields - use getattr for compatibility across onnxruntime versions
+        for attr in _META_ATTRS:
+            value = getattr(model_meta, attr, None)
+            if value:
+                metadata[attr] = value
 
         # Custom metadata from model
         custom_metadata_map = getattr(model_meta, "custom_metadata_map", None)
@@ -643,14 +1493,8 @@ class ONNXService:
         Returns:
             List of dimensions with None for dynamic axes
         """
-        result: list[int | None] = []
-        for dim in shape:
-            if isinstance(dim, int):
-                result.append(dim)
-            else:
-                # Dynamic dimension (string name or None)
-                result.append(None)
-        return result
+        # Dynamic dimensions are reported as a string name or None
+        return [dim if isinstance(dim, int) else None for dim in shape]
 
 
 # Singleton instance for dependency injection
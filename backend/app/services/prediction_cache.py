@@ -8,18 +8,28 @@ Cache key pattern:
 - prediction:{model_id}:{input_hash} - Prediction result by model and input
 
 Design notes:
-- Uses MD5 for input hashing (not for security, just for cache key generation)
-- Input is JSON-serialized with sorted keys for deterministic hashing
+- Uses BLAKE2b for input hashing (not for security, just for cache key generation)
+- Input is serialized with orjson and sorted keys for deterministic hashing
 - Only caches output_data and inference_time_ms, not the full prediction record
 - DB records are still created on cache hits for audit trail
+- Large payloads are stored zlib-compressed (base64, "z1:" prefix) since the
+  Redis client decodes responses as text
+- An optional per-process LRU (L1, off by default) sits in front of Redis
+  so hot keys skip the network round-trip. Invalidation only reaches the
+  current process, so its short TTL bounds staleness across workers
 """
 
+import base64
+import binascii
 import hashlib
-import json
 import logging
+import time
+import zlib
+from collections import OrderedDict
 from typing import Any
 
 from app.config import settings
+from app.services import serialization
 from app.services.cache import CacheService
 
 logger = logging.getLogger(__name__)
@@ -30,13 +40,21 @@ PREDICTION_KEY = "prediction:{model_id}:{input_hash}"
 PREDICTION_METRICS_HITS = "metrics:prediction:hits"
 PREDICTION_METRICS_MISSES = "metrics:prediction:misses"
 
+# Cached payloads at least this large (serialized) are compressed
+COMPRESS_MIN_BYTES = 512
+# Marks a compressed payload; the digit leaves room for other codecs
+COMPRESSED_PREFIX = "z1:"
+
 
 def hash_input(input_data: dict[str, Any]) -> str:
     """Generate a deterministic hash of input data for cache key.
 
-    Uses MD5 because we're not using this for security, just for
-    generating consistent cache keys. MD5 is faster than SHA-256
-    and good enough for this use case.
+    Serializes to compact JSON with sorted keys (orjson, numpy arrays
+    encoded natively; the stdlib encoder for NaN, infinities and ints
+    beyond 64 bits, so distinct inputs never share an encoding) and hashes
+    with an 8-byte BLAKE2b digest. BLAKE2b is at least as fast as MD5 on
+    64-bit CPUs and produces the 16-character key directly, without
+    truncation.
 
     Args:
         input_data: Dictionary of input data
@@ -44,11 +62,43 @@ def hash_input(input_data: dict[str, Any]) -> str:
     Returns:
         16-character hex hash of the input data
     """
-    # Serialize with sorted keys for determinism
-    # Use separators without spaces to minimize size
-    serialized = json.dumps(input_data, sort_keys=True, separators=(",", ":"))
-    # MD5 is fine for non-security cache keys, take first 16 chars
-    return hashlib.md5(serialized.encode()).hexdigest()[:16]
+    serialized = serialization.dumps(input_data, sort_keys=True)
+    return hashlib.blake2b(serialized, digest_size=8).hexdigest()
+
+
+def encode_payload(value: dict[str, Any]) -> dict[str, Any] | str:
+    """Prepare a prediction payload for storage, compressing large ones.
+
+    Small payloads are returned unchanged (compression overhead outweighs
+    the savings). Larger ones are serialized to JSON, compressed with
+    zlib at level 1 and base64-encoded behind COMPRESSED_PREFIX.
+
+    Args:
+        value: Payload with output_data and inference_time_ms
+
+    Returns:
+        The original dict, or the compressed text representation
+    """
+    serialized = serialization.dumps(value)
+    if len(serialized) < COMPRESS_MIN_BYTES:
+        return value
+    compressed = zlib.compress(serialized, 1)
+    return COMPRESSED_PREFIX + base64.b64encode(compressed).decode("ascii")
+
+
+def decode_payload(cached: Any) -> Any:
+    """Reverse encode_payload; uncompressed values pass through.
+
+    Raises:
+        ValueError: If a compressed payload is corrupt
+    """
+    if isinstance(cached, str) and cached.startswith(COMPRESSED_PREFIX):
+        try:
+            compressed = base64.b64decode(cached[len(COMPRESSED_PREFIX) :])
+            return serialization.loads(zlib.decompress(compressed))
+        except (binascii.Error, zlib.error) as e:
+            raise ValueError(f"Corrupt compressed payload: {e}") from e
+    return cached
 
 
 class PredictionCacheResult:
@@ -71,16 +121,138 @@ class PredictionCacheResult:
         self.inference_time_ms = inference_time_ms
 
 
+class LocalPredictionCache:
+    """In-process LRU cache of prediction results with a per-entry TTL.
+
+    Entries are keyed by the same string as the Redis prediction key and
+    store the JSON-serialized ``(output_data, inference_time_ms)``, so
+    every hit decodes a fresh copy that callers may mutate freely. Bounded
+    both by entry count and by total serialized bytes. Not shared between
+    worker processes, and invalidation only reaches this process, so the
+    TTL should stay short.
+
+    Attributes:
+        max_size: Maximum number of entries (0 disables the cache)
+        max_bytes: Maximum total size of the stored payloads
+        ttl: Seconds an entry stays valid after it is stored
+        hits: Number of lookups served from this cache
+    """
+
+    def __init__(self, max_size: int, ttl: float, max_bytes: int | None = None):
+        self.max_size = max_size
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else settings.cache_prediction_l1_max_bytes
+        )
+        self.ttl = ttl
+        self.hits = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the stored payloads."""
+        return self._bytes
+
+    def _remove(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def get(self, key: str) -> tuple[Any, float | None] | None:
+        """Return ``(output_data, inference_time_ms)`` or None if absent/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        output_data, inference_time_ms = serialization.loads(payload)
+        return output_data, inference_time_ms
+
+    def set(self, key: str, output_data: Any, inference_time_ms: float | None) -> None:
+        """Store an entry, evicting least recently used ones to stay in bounds.
+
+        Payloads larger than max_bytes on their own are not stored.
+        """
+        if self.max_size <= 0:
+            return
+
+        payload = serialization.dumps((output_data, inference_time_ms))
+        if key in self._entries:
+            self._remove(key)
+        if len(payload) > self.max_bytes:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._bytes += len(payload)
+        while len(self._entries) > self.max_size or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def clear_prefix(self, prefix: str) -> int:
+        """Remove all entries whose key starts with prefix.
+
+        Returns:
+            Number of entries removed.
+        """
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit counter."""
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = 0
+
+
+# Global L1 instance (PredictionCache is created per request)
+_local_prediction_cache: LocalPredictionCache | None = None
+
+
+def get_local_prediction_cache() -> LocalPredictionCache:
+    """Get or create the process-wide L1 prediction cache."""
+    global _local_prediction_cache
+    if _local_prediction_cache is None:
+        _local_prediction_cache = LocalPredictionCache(
+            max_size=settings.cache_prediction_l1_size,
+            ttl=settings.cache_prediction_l1_ttl,
+        )
+    return _local_prediction_cache
+
+
+def reset_local_prediction_cache() -> None:
+    """Reset the L1 prediction cache (for testing)."""
+    global _local_prediction_cache
+    _local_prediction_cache = None
+
+
 class PredictionCache:
     """Helper class for prediction result caching.
 
     Provides methods for caching and retrieving prediction results,
     with automatic cache key generation from model ID and input hash.
+    Lookups check the in-process L1 before Redis.
     """
 
-    def __init__(self, cache: CacheService):
-        """Initialize with a cache service instance."""
+    def __init__(self, cache: CacheService, local: LocalPredictionCache | None = None):
+        """Initialize with a cache service instance.
+
+        Args:
+            cache: Redis-backed cache service
+            local: L1 cache (default: the process-wide instance)
+        """
         self.cache = cache
+        self.local = local if local is not None else get_local_prediction_cache()
         self.prediction_ttl = settings.cache_prediction_ttl
         self.enabled = settings.cache_prediction_enabled
 
@@ -106,19 +278,36 @@ class PredictionCache:
         input_hash = hash_input(input_data)
         key = self._prediction_key(model_id, input_hash)
 
-        cached = await self.cache.get(key)
+        local_hit = self.local.get(key)
+        if local_hit is not None:
+            output_data, inference_time_ms = local_hit
+            return PredictionCacheResult(
+                hit=True,
+                output_data=output_data,
+                inference_time_ms=inference_time_ms,
+            )
+
+        # Lookup and hit/miss metric update share one Redis round-trip
+        cached = await self.cache.get_and_count(
+            key, PREDICTION_METRICS_HITS, PREDICTION_METRICS_MISSES
+        )
         if cached is not None:
-            # Track hit metric
-            await self._increment_hits()
+            try:
+                cached = decode_payload(cached)
+            except ValueError as e:
+                logger.warning(f"Ignoring cached prediction for model {model_id}: {e}")
+                return PredictionCacheResult(hit=False)
+
             logger.debug(f"Prediction cache hit for model {model_id}")
+            output_data = cached.get("output_data")
+            inference_time_ms = cached.get("inference_time_ms")
+            self.local.set(key, output_data, inference_time_ms)
             return PredictionCacheResult(
                 hit=True,
-                output_data=cached.get("output_data"),
-                inference_time_ms=cached.get("inference_time_ms"),
+                output_data=output_data,
+                inference_time_ms=inference_time_ms,
             )
 
-        # Track miss metric
-        await self._increment_misses()
         return PredictionCacheResult(hit=False)
 
     async def set_prediction(
@@ -150,8 +339,11 @@ class PredictionCache:
             "inference_time_ms": inference_time_ms,
         }
 
-        result = await self.cache.set(key, cache_value, ttl=self.prediction_ttl)
+        result = await self.cache.set(
+            key, encode_payload(cache_value), ttl=self.prediction_ttl
+        )
         if result:
+            self.local.set(key, output_data, inference_time_ms)
             logger.debug(f"Cached prediction for model {model_id}")
         return result
 
@@ -168,24 +360,18 @@ class PredictionCache:
             Number of cache entries deleted.
         """
         prefix = f"prediction:{model_id}:"
+        self.local.clear_prefix(prefix)
         count = await self.cache.clear_prefix(prefix)
         if count > 0:
             logger.info(f"Invalidated {count} cached predictions for model {model_id}")
         return count
 
-    async def _increment_hits(self) -> None:
-        """Increment the cache hits counter."""
-        # Use public incr method - returns None on error/disconnected
-        await self.cache.incr(PREDICTION_METRICS_HITS)
-
-    async def _increment_misses(self) -> None:
-        """Increment the cache misses counter."""
-        # Use public incr method - returns None on error/disconnected
-        await self.cache.incr(PREDICTION_METRICS_MISSES)
-
     async def get_metrics(self) -> dict[str, Any]:
         """Get prediction cache metrics.
 
+        ``hits`` and ``misses`` are shared Redis counters; ``l1_hits`` counts
+        lookups served by this process's L1 and is not included in them.
+
         Returns:
             Dict with hits, misses, and hit_rate.
         """
@@ -206,6 +392,9 @@ class PredictionCache:
             "misses": misses,
             "total_requests": total,
             "hit_rate_percent": round(hit_rate, 2),
+            "l1_hits": self.local.hits,
+            "l1_size": len(self.local),
+            "l1_bytes": self.local.size_bytes,
             "enabled": self.enabled,
             "ttl_seconds": self.prediction_ttl,
         }
@@ -216,6 +405,7 @@ class PredictionCache:
         Returns:
             True if successful, False otherwise.
         """
+        self.local.hits = 0
         if not self.cache.is_connected:
             return False
 
@@ -0,0 +1,106 @@
+"""JSON encoding that stays lossless where orjson alone is not.
+
+orjson is used on the hot paths, but it writes NaN and +/-Infinity as
+``null`` and rejects integers outside the 64-bit range. For those inputs
+these helpers fall back to the standard library encoder. It writes
+``NaN``/``Infinity`` tokens (like ``json.dumps`` and Starlette's
+JSONResponse) and integers of any size.
+
+The check only runs when orjson's output contains ``null``, so ordinary
+payloads pay nothing beyond a substring scan.
+"""
+
+import json
+import math
+from typing import Any
+
+import numpy as np
+import orjson
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def contains_non_finite(value: Any) -> bool:
+    """Return whether a JSON-like value holds a NaN or infinite float.
+
+    Walks dicts, lists and tuples, and checks float numpy arrays and
+    scalars as well as Python floats.
+    """
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(contains_non_finite(v) for v in value.values())
+    if isinstance(value, list | tuple):
+        return any(contains_non_finite(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind in "fc" and not np.isfinite(value).all()
+    if isinstance(value, np.floating):
+        return not np.isfinite(value)
+    return False
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the numpy values orjson handles natively for the stdlib encoder."""
+    if isinstance(value, np.ndarray | np.generic):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(value: Any, sort_keys: bool) -> bytes:
+    return json.dumps(
+        value,
+        sort_keys=sort_keys,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    ).encode("utf-8")
+
+
+def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+    """Serialize a value to compact JSON without dropping information.
+
+    Args:
+        value: Value to serialize (numpy arrays and non-str keys allowed)
+        sort_keys: Sort dict keys, for output usable as a hash input
+
+    Returns:
+        UTF-8 encoded JSON
+
+    Raises:
+        TypeError: If the value is not JSON serializable
+    """
+    option = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+    try:
+        encoded = orjson.dumps(value, option=option)
+    except TypeError:
+        # An integer beyond 64 bits, or a value neither encoder supports
+        # (the stdlib one then raises TypeError itself)
+        return _stdlib_dumps(value, sort_keys)
+
+    if b"null" in encoded and contains_non_finite(value):
+        return _stdlib_dumps(value, sort_keys)
+    return encoded
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON written by dumps, including ``NaN``/``Infinity`` tokens.
+
+    Args:
+        data: JSON text
+
+    Returns:
+        The decoded value
+
+    Raises:
+        ValueError: If the data is not valid JSON
+    """
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # orjson rejects the non-finite tokens; only those get the slow path
+        if isinstance(data, str):
+            if "NaN" not in data and "Infinity" not in data:
+                raise
+        elif b"NaN" not in data and b"Infinity" not in data:
+            raise
+        return json.loads(data)
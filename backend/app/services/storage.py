@@ -5,13 +5,113 @@ and a concrete implementation for local filesystem storage. The abstraction
 allows for easy swapping to cloud storage (S3, GCS, Azure Blob) in the future.
 """
 
+import asyncio
+import errno
 import hashlib
+import os
+import secrets
+import time
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
 from typing import BinaryIO
 
 from app.config import settings
 
+# Upload copy chunk size: large enough that per-chunk Python overhead is
+# negligible next to the hashing and write() of the data itself
+_CHUNK_SIZE = 1024 * 1024
+
+# How long a confirmed-present file is trusted before it is stat'ed again
+_EXISTS_TTL_SECONDS = 0.5
+
+
+def _preallocate(fd: int, length: int) -> bool:
+    """Reserve disk blocks for a file about to be written, where supported.
+
+    Allocating up front keeps the file contiguous and surfaces a full disk
+    before the copy starts.
+
+    Returns:
+        True if the space was reserved, False if the platform or filesystem
+        does not support it
+    """
+    if not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        os.posix_fallocate(fd, 0, length)
+    except OSError as e:
+        if e.errno in (errno.EOPNOTSUPP, errno.EINVAL):
+            return False
+        raise
+    return True
+
+
+@lru_cache(maxsize=8)
+def _tmpfile_linkable(directory: str) -> bool:
+    """Probe once per directory whether an O_TMPFILE can be linked into it.
+
+    Kernels and filesystems without O_TMPFILE fail the open, and some
+    sandboxes allow the open but refuse the /proc/self/fd link; both fall
+    back to a named temporary file.
+    """
+    if not hasattr(os, "O_TMPFILE") or not os.path.isdir("/proc/self/fd"):
+        return False
+    probe = os.path.join(directory, f".tmpfile-probe.{secrets.token_hex(8)}")
+    try:
+        fd = os.open(directory, os.O_TMPFILE | os.O_WRONLY, 0o644)
+    except OSError:
+        return False
+    try:
+        os.link(f"/proc/self/fd/{fd}", probe)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    os.unlink(probe)
+    return True
+
+
+def _open_unnamed_tmpfile(directory: Path) -> int | None:
+    """Open an anonymous O_TMPFILE in directory, where supported.
+
+    Returns:
+        Writable file descriptor, or None if unnamed temporary files can't
+        be created and published in this directory
+    """
+    if not _tmpfile_linkable(str(directory)):
+        return None
+    return os.open(directory, os.O_TMPFILE | os.O_WRONLY, 0o644)
+
+
+def _unique_tmp_path(file_path: Path) -> Path:
+    """Name a temporary sibling of file_path that concurrent saves can't share."""
+    return file_path.with_name(f".{file_path.name}.{secrets.token_hex(8)}.tmp")
+
+
+def _link_tmpfile(fd: int, file_path: Path) -> None:
+    """Publish a written O_TMPFILE at file_path, replacing any existing file.
+
+    linkat() refuses to overwrite, so an existing file is replaced by
+    linking to a unique name first and renaming that over it.
+    """
+    fd_path = f"/proc/self/fd/{fd}"
+    try:
+        os.link(fd_path, file_path)
+        return
+    except FileExistsError:
+        pass
+
+    tmp_path = _unique_tmp_path(file_path)
+    os.link(fd_path, tmp_path)
+    replaced = False
+    try:
+        os.replace(tmp_path, file_path)
+        replaced = True
+    finally:
+        if not replaced:
+            tmp_path.unlink(missing_ok=True)
+
 
 class StorageError(Exception):
     """Base exception for storage operations."""
@@ -49,6 +149,7 @@ class StorageService(ABC):
         file: BinaryIO,
         filename: str,
         max_size_bytes: int | None = None,
+        content_length: int | None = None,
     ) -> tuple[str, int, str]:
         """Save a file to storage.
 
@@ -56,6 +157,8 @@ class StorageService(ABC):
             file: File-like object to save
             filename: Name to save the file as
             max_size_bytes: Maximum allowed file size (None = use default)
+            content_length: Size the caller expects the file to have, if
+                known. Oversized uploads are rejected before any copying.
 
         Returns:
             Tuple of (storage_path, file_size_bytes, file_hash)
@@ -70,6 +173,10 @@ class StorageService(ABC):
     async def get(self, path: str) -> bytes:
         """Retrieve a file from storage.
 
+        This loads the whole file into memory. To send a stored model over
+        HTTP, use get_path() with a FileResponse instead, which streams it
+        from the page cache without a user-space copy.
+
         Args:
             path: Storage path returned from save()
 
@@ -167,110 +274,211 @@ class LocalStorageService(StorageService):
 
         # Ensure storage directory exists
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # String forms for the os.path fast path in _resolve_path(); the
+        # prefix always ends in a separator, even when base_path is "/"
+        self._base_path_str = str(self.base_path)
+        self._base_path_prefix = os.path.join(self._base_path_str, "")
+
+        # Storage path -> (monotonic time checked, resolved path) for files
+        # known to exist. get_path() runs on every prediction, so this skips
+        # repeated resolve()/stat() calls for hot models. Only positive
+        # results are cached, and save()/delete() keep it consistent.
+        self._exists_cache: dict[str, tuple[float, Path]] = {}
 
     async def save(
         self,
         file: BinaryIO,
         filename: str,
         max_size_bytes: int | None = None,
+        content_length: int | None = None,
     ) -> tuple[str, int, str]:
         """Save a file to local filesystem.
 
-        Reads the file in chunks to handle large files efficiently
-        and compute hash during upload.
+        Streams the upload to a temporary file in chunks, hashing as it
+        goes, so memory use stays at one chunk regardless of file size.
+        The temporary file is renamed into place only once the whole
+        upload has been written, so readers never see a partial model.
+        The copy runs in a worker thread so large uploads don't block
+        the event loop.
+
+        A known content_length is checked against the limit before
+        anything is written, and preallocates the file's blocks. The
+        streamed size is still enforced in case it was understated.
         """
         max_size = max_size_bytes or self.max_size_bytes
+        if content_length is not None and content_length > max_size:
+            raise StorageFullError(
+                f"File exceeds maximum size of {max_size / (1024 * 1024):.1f}MB"
+            )
 
         # Sanitize filename to prevent directory traversal
         safe_filename = Path(filename).name
         if not safe_filename:
             raise StorageError("Invalid filename")
 
-        file_path = self.base_path / safe_filename
+        total_size, file_hash = await asyncio.to_thread(
+            self._save_sync,
+            file,
+            self.base_path / safe_filename,
+            max_size,
+            content_length,
+        )
+        self._exists_cache.pop(safe_filename, None)
 
-        # Read file and compute hash simultaneously
-        chunks = []
-        total_size = 0
-        hasher = hashlib.sha256()
+        # Return relative path from base for portability
+        return safe_filename, total_size, file_hash
 
-        chunk_size = 8192  # 8KB chunks
-        while True:
-            chunk = file.read(chunk_size)
-            if not chunk:
-                break
+    @staticmethod
+    def _save_sync(
+        file: BinaryIO,
+        file_path: Path,
+        max_size: int,
+        content_length: int | None = None,
+    ) -> tuple[int, str]:
+        """Blocking body of save(): copy, hash and atomically publish.
 
-            total_size += len(chunk)
-            if total_size > max_size:
-                raise StorageFullError(
-                    f"File exceeds maximum size of {max_size / (1024 * 1024):.1f}MB"
-                )
+        On Linux the upload is written to an unnamed O_TMPFILE and linked
+        into place once complete, so a failed upload leaves no file behind
+        at all. Elsewhere it goes to a uniquely named temporary file that
+        is renamed over the destination.
 
-            chunks.append(chunk)
-            hasher.update(chunk)
+        Returns:
+            Tuple of (file_size_bytes, file_hash)
+        """
+        fd = _open_unnamed_tmpfile(file_path.parent)
+        tmp_path: Path | None = None
+        if fd is None:
+            tmp_path = _unique_tmp_path(file_path)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
 
-        file_hash = hasher.hexdigest()
-        content = b"".join(chunks)
+        total_size = 0
+        hasher = hashlib.sha256()
 
-        # Write to filesystem
+        # One reusable buffer: readinto() fills it in place, so no new 1MB
+        # bytes object is allocated per chunk
+        buffer = bytearray(_CHUNK_SIZE)
+        view = memoryview(buffer)
+        committed = False
         try:
-            file_path.write_bytes(content)
+            # Unbuffered: each chunk goes to write(2) without an extra copy
+            with open(fd, "wb", buffering=0) as out:
+                preallocated = bool(content_length) and _preallocate(
+                    out.fileno(), content_length
+                )
+                while True:
+                    read = file.readinto(buffer)
+                    if not read:
+                        break
+                    chunk = view[:read]
+
+                    total_size += read
+                    if total_size > max_size:
+                        raise StorageFullError(
+                            f"File exceeds maximum size of "
+                            f"{max_size / (1024 * 1024):.1f}MB"
+                        )
+
+                    hasher.update(chunk)
+                    out.write(chunk)
+                if preallocated:
+                    # Drop any reserved tail if the upload came up short
+                    out.truncate(total_size)
+                if tmp_path is None:
+                    _link_tmpfile(out.fileno(), file_path)
+            if tmp_path is not None:
+                os.replace(tmp_path, file_path)
+            committed = True
         except OSError as e:
             raise StorageError(f"Failed to write file: {e}") from e
+        finally:
+            # Whatever interrupted the save (a bad upload stream, an
+            # interrupt during the rename), never leave the named file behind
+            if not committed and tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
 
-        # Return relative path from base for portability
-        return safe_filename, total_size, file_hash
+        return total_size, hasher.hexdigest()
 
     async def get(self, path: str) -> bytes:
         """Retrieve a file from local filesystem."""
         file_path = self._resolve_path(path)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {path}")
-
+        # Open directly rather than stat first; a missing file surfaces as
+        # ENOENT from the read itself
         try:
-            return file_path.read_bytes()
+            return await asyncio.to_thread(file_path.read_bytes)
         except OSError as e:
+            if e.errno == errno.ENOENT:
+                raise FileNotFoundError(f"File not found: {path}") from e
             raise StorageError(f"Failed to read file: {e}") from e
 
     async def delete(self, path: str) -> bool:
         """Delete a file from local filesystem."""
         file_path = self._resolve_path(path)
-
-        if not file_path.exists():
-            return False
+        self._exists_cache.pop(path, None)
 
         try:
             file_path.unlink()
             return True
         except OSError as e:
+            if e.errno == errno.ENOENT:
+                return False
             raise StorageError(f"Failed to delete file: {e}") from e
 
     async def exists(self, path: str) -> bool:
         """Check if a file exists on local filesystem."""
-        file_path = self._resolve_path(path)
-        return file_path.exists() and file_path.is_file()
+        return self._find_file(path) is not None
 
     async def get_path(self, path: str) -> Path:
         """Get the absolute path for a stored file."""
-        file_path = self._resolve_path(path)
+        file_path = self._find_file(path)
 
-        if not file_path.exists():
+        if file_path is None:
             raise FileNotFoundError(f"File not found: {path}")
 
         return file_path
 
+    def _find_file(self, path: str) -> Path | None:
+        """Resolve a storage path and confirm it is a file, using the TTL memo.
+
+        Returns:
+            Resolved path, or None if no file exists there
+        """
+        now = time.monotonic()
+        cached = self._exists_cache.get(path)
+        if cached is not None and now - cached[0] < _EXISTS_TTL_SECONDS:
+            return cached[1]
+
+        resolved = self._resolve_path_str(path)
+        # isfile() is False for missing paths, so one stat() covers both
+        if not os.path.isfile(resolved):
+            self._exists_cache.pop(path, None)
+            return None
+
+        file_path = Path(resolved)
+        self._exists_cache[path] = (now, file_path)
+        return file_path
+
     def _resolve_path(self, path: str) -> Path:
         """Resolve a storage path to an absolute filesystem path.
 
         Includes security check to prevent directory traversal attacks.
         """
+        return Path(self._resolve_path_str(path))
+
+    def _resolve_path_str(self, path: str) -> str:
+        """String-only body of _resolve_path().
+
+        Works on plain strings with os.path, which avoids building
+        intermediate Path objects on the per-request lookup path.
+        """
         # Sanitize to prevent directory traversal
-        safe_path = Path(path).name
-        resolved = (self.base_path / safe_path).resolve()
+        safe_path = os.path.basename(os.path.normpath(path))
+        resolved = os.path.realpath(os.path.join(self._base_path_str, safe_path))
 
         # Security: ensure resolved path is within base_path
-        # Use is_relative_to for robust directory traversal protection (Python 3.9+)
-        if not resolved.is_relative_to(self.base_path):
+        if resolved != self._base_path_str and not resolved.startswith(
+            self._base_path_prefix
+        ):
             raise StorageError("Invalid path: directory traversal detected")
 
         return resolved
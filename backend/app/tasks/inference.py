@@ -25,9 +25,11 @@ import logging
 import time
 import traceback
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from celery.signals import worker_process_init
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -36,11 +38,32 @@ from app.config import settings
 from app.database import sync_engine
 from app.models.job import Job, JobStatus
 from app.models.ml_model import MLModel
-from app.services.onnx import ONNXError, ONNXService
+from app.services.onnx import ONNXError, get_onnx_service, reset_onnx_service
 
 logger = logging.getLogger(__name__)
 
 
+@worker_process_init.connect
+def _reset_onnx_service(**kwargs: Any) -> None:
+    """Give each forked worker process its own ONNXService.
+
+    ONNX Runtime sessions are not fork-safe, so nothing loaded in the parent
+    may be shared. Within a process the service (and its session cache) is
+    reused across tasks, so repeat jobs on the same model skip the load.
+    """
+    reset_onnx_service()
+
+
+@lru_cache(maxsize=4)
+def _model_root(storage_path: str) -> Path:
+    """Resolve the model storage root once per configured path.
+
+    Keyed on the setting's value rather than frozen at import, so a changed
+    setting (or a patched one in tests) still takes effect.
+    """
+    return Path(storage_path).resolve()
+
+
 def _get_sync_session() -> Session:
     """Create a synchronous database session for Celery tasks.
 
@@ -79,23 +102,32 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
     Note: Celery retry policy is configured via decorator, not inline code.
     This is visible at the function level, not hidden in implementation.
     """
-    logger.info(f"Starting inference task for job {job_id}")
+    logger.info("Starting inference task for job %s", job_id)
     task_start_time = time.perf_counter()
 
     with _get_sync_session() as db:
-        # Fetch job
-        job = db.execute(select(Job).where(Job.id == job_id)).scalar_one_or_none()
-        if not job:
-            logger.error(f"Job {job_id} not found")
+        # Fetch job and its model in one round trip. Outer join so a missing
+        # model still returns the job and goes through the decisions below.
+        row = db.execute(
+            select(Job, MLModel)
+            .outerjoin(MLModel, MLModel.id == Job.model_id)
+            .where(Job.id == job_id)
+        ).one_or_none()
+        if row is None:
+            logger.error("Job %s not found", job_id)
             return {"job_id": job_id, "status": "error", "error": "Job not found"}
+        job, model = row
 
-        # Calculate queue time (time from job creation to task start)
-        queue_time_ms = (datetime.now(UTC) - job.created_at).total_seconds() * 1000
+        # Calculate queue time (time from job creation to task start). The
+        # same timestamp becomes started_at, so the two always agree.
+        started_at = datetime.now(UTC)
+        queue_time_ms = (started_at - job.created_at).total_seconds() * 1000
 
-        # Update job status to RUNNING
+        # Update job status to RUNNING. Committed on its own so the API can
+        # show progress; the outcome below is the only other commit.
         try:
             job.status = JobStatus.RUNNING
-            job.started_at = datetime.now(UTC)
+            job.started_at = started_at
             job.queue_time_ms = queue_time_ms
             job.celery_task_id = self.request.id
             job.worker_id = self.request.hostname
@@ -103,7 +135,7 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
             db.commit()
         except Exception:
             db.rollback()
-            logger.exception(f"Failed to update job {job_id} to RUNNING")
+            logger.exception("Failed to update job %s to RUNNING", job_id)
             raise
 
         try:
@@ -112,11 +144,6 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
             # All decisions are made here. Each decision is named and explicit.
             # =================================================================
 
-            # Fetch model
-            model = db.execute(
-                select(MLModel).where(MLModel.id == job.model_id)
-            ).scalar_one_or_none()
-
             if not model:
                 raise ValueError(f"Model {job.model_id} not found")
 
@@ -139,7 +166,7 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
 
             # DECISION 3: Is the file path valid (not a traversal attack)?
             # Authority: Security policy
-            base_path = Path(settings.model_storage_path).resolve()
+            base_path = _model_root(settings.model_storage_path)
             model_path = (base_path / model.file_path).resolve()
             if not model_path.is_relative_to(base_path):
                 raise ValueError(f"Model {job.model_id} has invalid file path")
@@ -152,9 +179,13 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
             # ONNXService contains no policy decisions.
             # =================================================================
 
-            logger.info(f"Running inference for job {job_id} using model {model.name}")
-            onnx_service = ONNXService()
-            result = onnx_service.run_inference(model_path, job.input_data)
+            logger.info(
+                "Running inference for job %s using model %s", job_id, model.name
+            )
+            onnx_service = get_onnx_service()
+            result = onnx_service.run_inference(
+                model_path, job.input_data, model.file_hash
+            )
 
             # Update job with success
             job.status = JobStatus.COMPLETED
@@ -165,8 +196,12 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
 
             total_time_ms = (time.perf_counter() - task_start_time) * 1000
             logger.info(
-                f"Job {job_id} completed successfully in {total_time_ms:.2f}ms "
-                f"(queue: {queue_time_ms:.2f}ms, inference: {result.inference_time_ms:.2f}ms)"
+                "Job %s completed successfully in %.2fms "
+                "(queue: %.2fms, inference: %.2fms)",
+                job_id,
+                total_time_ms,
+                queue_time_ms,
+                result.inference_time_ms,
             )
 
             return {
@@ -181,7 +216,7 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
             # ONNX-specific errors (model load, inference, input validation)
             # These are permanent failures - don't retry (excluded via dont_autoretry_for)
             error_msg = str(e)
-            logger.error(f"ONNX error for job {job_id}: {error_msg}")
+            logger.error("ONNX error for job %s: %s", job_id, error_msg)
 
             job.status = JobStatus.FAILED
             job.error_message = error_msg
@@ -198,20 +233,19 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
         except Exception as e:
             # Unexpected errors - handle retry logic here to avoid finally block issues
             error_msg = str(e)
-            logger.error(f"Unexpected error for job {job_id}: {error_msg}")
-
-            # Update retry count
-            next_retry = self.request.retries + 1
-            job.retries = next_retry
+            logger.error("Unexpected error for job %s: %s", job_id, error_msg)
 
             # Check if we've exceeded max retries
+            next_retry = self.request.retries + 1
             if next_retry > self.max_retries:
                 # Max retries exceeded - mark as permanently failed
                 logger.warning(
-                    f"Job {job_id} failed after {self.max_retries} retries, "
-                    "marking as FAILED"
+                    "Job %s failed after %d retries, marking as FAILED",
+                    job_id,
+                    self.max_retries,
                 )
                 job.status = JobStatus.FAILED
+                job.retries = next_retry
                 job.error_message = f"Max retries exceeded: {error_msg}"
                 job.error_traceback = traceback.format_exc()
                 job.completed_at = datetime.now(UTC)
@@ -220,7 +254,9 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
                     db.commit()
                 except Exception:
                     db.rollback()
-                    logger.exception(f"Failed to commit FAILED status for job {job_id}")
+                    logger.exception(
+                        "Failed to commit FAILED status for job %s", job_id
+                    )
 
                 return {
                     "job_id": job_id,
@@ -228,12 +264,10 @@ def run_inference_task(self, job_id: str) -> dict[str, Any]:
                     "error_message": error_msg,
                 }
 
-            # Retries remain - persist retry count and re-raise for Celery
-            try:
-                db.commit()
-            except Exception:
-                db.rollback()
-                logger.exception(f"Failed to commit retry count for job {job_id}")
+            # Retries remain - no commit here. The job stays RUNNING and the
+            # next attempt records its retry count (from Celery's request)
+            # in the same commit that marks it RUNNING again.
+            db.rollback()
 
             # Re-raise to let Celery handle retry with exponential backoff
             raise
@@ -1,33 +1,64 @@
 """Pytest fixtures for testing."""
 
 import asyncio
-from collections.abc import AsyncGenerator, Generator
+import tempfile
+from collections.abc import AsyncGenerator, Callable, Generator
+from functools import lru_cache
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import onnx
+import onnxruntime as ort
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from onnx import TensorProto, helper
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-
-from app.config import Settings
+from pytest_asyncio import is_async_test
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+
+from app.config import Settings, settings
 from app.database import Base, get_db
 from app.main import app
 from app.services.cache import CacheService, get_cache_service
 from app.services.onnx import ONNXService, reset_onnx_service
+from app.services.prediction_cache import reset_local_prediction_cache
 from app.services.storage import LocalStorageService, get_storage_service
 
-# Use SQLite for testing
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+# Use in-memory SQLite for testing: no file to clean up, no fsync per commit
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Run every async test in pytest-asyncio's session-scoped event loop.
+
+    The session-scoped test_engine lives on that loop, so tests must share
+    it rather than each getting a fresh function-scoped loop.
+    """
+    session_loop = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
 
 
 @pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    """Create event loop for async tests."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Use uvloop for the test event loop when it is installed.
+
+    uvloop ships with uvicorn[standard] on Linux/macOS; elsewhere fall back
+    to the default asyncio policy.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
 
 
 @pytest.fixture(scope="session")
@@ -40,14 +71,98 @@ def test_settings() -> Settings:
     )
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest.fixture(scope="module")
+def celery_app():
+    """The application's configured Celery instance."""
+    from app.celery import celery_app
+
+    return celery_app
+
+
+@pytest.fixture(scope="module")
+def default_settings() -> Settings:
+    """Settings built once from defaults and the environment (read-only)."""
+    return Settings()
+
+
+@pytest.fixture
+def celery_health_scenarios() -> dict[str, dict]:
+    """check_celery_health results for each state, keyed by status."""
+    return {
+        "connected": {
+            "status": "connected",
+            "broker_connected": True,
+            "workers": {
+                "celery@worker1": {
+                    "status": "online",
+                    "concurrency": 4,
+                    "processed": {"task1": 100},
+                }
+            },
+            "queues": ["inference", "default"],
+        },
+        "no_workers": {
+            "status": "no_workers",
+            "broker_connected": True,
+            "workers": {},
+            "queues": ["inference", "default"],
+        },
+        "error": {
+            "status": "error",
+            "broker_connected": False,
+            "workers": {},
+            "queues": [],
+            "error": "Connection to broker refused",
+        },
+    }
+
+
+@pytest.fixture
+def patched_check_celery_health() -> Generator[MagicMock, None, None]:
+    """Replace the health endpoints' Celery probe; set its return_value."""
+    with patch("app.api.health.check_celery_health") as mock_check:
+        yield mock_check
+
+
+@pytest.fixture
+def patched_celery_app() -> Generator[MagicMock, None, None]:
+    """Replace the Celery app check_celery_health inspects.
+
+    Patched at the source module, where check_celery_health imports it.
+    """
+    with patch("app.celery.celery_app") as mock_app:
+        yield mock_app
+
+
+def _enable_sqlite_savepoints(engine: AsyncEngine) -> None:
+    """Let SQLAlchemy, not the sqlite3 driver, manage transactions.
+
+    The driver's own implicit BEGIN handling breaks SAVEPOINT, which the
+    per-test rollback in db_session relies on.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest_asyncio.fixture(scope="session")
 async def test_engine():
-    """Create test database engine."""
+    """Create the test database engine and schema once per session."""
+    # StaticPool: every checkout shares the one connection that owns the
+    # in-memory database
     engine = create_async_engine(
         TEST_DATABASE_URL,
         echo=False,
         future=True,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
     )
+    _enable_sqlite_savepoints(engine)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -60,17 +175,35 @@ async def test_engine():
     await engine.dispose()
 
 
-@pytest_asyncio.fixture(scope="function")
-async def db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create test database session."""
-    async_session = async_sessionmaker(
-        test_engine,
+@pytest.fixture(scope="session")
+def session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory shared by all tests; each test binds its own connection."""
+    return async_sessionmaker(
         class_=AsyncSession,
         expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
     )
 
-    async with async_session() as session:
-        yield session
+
+@pytest_asyncio.fixture(scope="function")
+async def db_session(
+    test_engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[AsyncSession, None]:
+    """Create a test database session isolated in a rolled-back transaction.
+
+    Commits made by the code under test only release a SAVEPOINT; the outer
+    transaction is rolled back afterwards, so each test starts from an
+    empty schema without recreating it.
+    """
+    async with test_engine.connect() as conn:
+        transaction = await conn.begin()
+        session = session_factory(bind=conn)
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -85,8 +218,50 @@ async def test_cache() -> CacheService:
     return CacheService(enabled=False)
 
 
+@pytest.fixture
+def fake_redis():
+    """In-process Redis with an empty keyspace (skipped without fakeredis).
+
+    Mirrors the production client's decode_responses=True. A fresh instance
+    per test: it is cheap to build, and a shared one would bind its internal
+    queues to whichever event loop first used it.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    from fakeredis.aioredis import FakeRedis
+
+    return FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+@pytest.fixture
+def mock_pipeline() -> MagicMock:
+    """Mock Redis pipeline usable as ``async with client.pipeline() as pipe``.
+
+    Attach it with ``mock_redis.pipeline = MagicMock(return_value=...)``.
+    Queued commands are recorded as calls; execute returns [] unless a test
+    sets its return_value or side_effect.
+    """
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    pipe.execute = AsyncMock(return_value=[])
+    return pipe
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http_client() -> AsyncGenerator[AsyncClient, None]:
+    """Create one HTTP client for the app, shared by every test.
+
+    It holds no per-test state; the client fixture swaps the dependency
+    overrides around each test.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(
+    http_client: AsyncClient,
     db_session: AsyncSession,
     test_storage: LocalStorageService,
     test_cache: CacheService,
@@ -106,11 +281,33 @@ async def client(
     app.dependency_overrides[get_storage_service] = override_get_storage
     app.dependency_overrides[get_cache_service] = override_get_cache
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    try:
+        yield http_client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def override_db(request: pytest.FixtureRequest) -> Callable[[Callable], None]:
+    """Swap the get_db dependency for one test, on top of the shared client.
+
+    Request this after ``client`` so the swap replaces the client's own
+    override; the previous override is restored on teardown.
+    """
+    missing = object()
+    previous = app.dependency_overrides.get(get_db, missing)
+
+    def _restore() -> None:
+        if previous is missing:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous
 
-    app.dependency_overrides.clear()
+    def _apply(dependency: Callable) -> None:
+        app.dependency_overrides[get_db] = dependency
+        request.addfinalizer(_restore)
+
+    return _apply
 
 
 def create_simple_onnx_model(
@@ -186,17 +383,67 @@ def create_simple_onnx_model(
     return model
 
 
+def optimize_onnx_model(model: onnx.ModelProto) -> bytes:
+    """Run ONNX Runtime's graph optimizer over a model once and serialize it.
+
+    EXTENDED is the highest level whose output is portable; ALL adds
+    hardware-specific layout transforms to the saved graph.
+
+    Args:
+        model: Model to optimize
+
+    Returns:
+        Serialized optimized model
+    """
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = (
+        ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        optimized_path = Path(tmp_dir) / "optimized.onnx"
+        sess_options.optimized_model_filepath = str(optimized_path)
+        ort.InferenceSession(
+            model.SerializeToString(),
+            sess_options,
+            providers=["CPUExecutionProvider"],
+        )
+        return optimized_path.read_bytes()
+
+
+@lru_cache(maxsize=1)
+def simple_onnx_model_bytes() -> bytes:
+    """Serialized default simple model, built and optimized once per session.
+
+    Tests that only need the file contents use these bytes directly instead
+    of rebuilding and re-validating the graph for every test. The graph is
+    already optimized, so session-heavy tests can skip the optimizer (see
+    ort_optimization_disabled).
+    """
+    return optimize_onnx_model(create_simple_onnx_model())
+
+
+@pytest.fixture
+def ort_optimization_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Load sessions with ORT_DISABLE_ALL for the duration of a test.
+
+    For tests that create many sessions from the tiny, pre-optimized test
+    models, where the optimizer passes are pure overhead. Everything else
+    runs with the production default.
+    """
+    monkeypatch.setattr(settings, "ort_graph_optimization_level", "disable")
+
+
 @pytest.fixture
 def simple_onnx_model() -> onnx.ModelProto:
-    """Fixture providing a simple ONNX model."""
-    return create_simple_onnx_model()
+    """Fixture providing a simple ONNX model (a fresh copy per test)."""
+    return onnx.load_from_string(simple_onnx_model_bytes())
 
 
 @pytest.fixture
-def onnx_model_path(tmp_path: Path, simple_onnx_model: onnx.ModelProto) -> Path:
+def onnx_model_path(tmp_path: Path) -> Path:
     """Fixture providing path to a saved ONNX model file."""
     model_path = tmp_path / "test_model.onnx"
-    onnx.save(simple_onnx_model, str(model_path))
+    model_path.write_bytes(simple_onnx_model_bytes())
     return model_path
 
 
@@ -209,8 +456,8 @@ def invalid_onnx_path(tmp_path: Path) -> Path:
 
 
 @pytest.fixture
-def onnx_service() -> ONNXService:
-    """Fixture providing an ONNXService instance."""
+def onnx_service(ort_optimization_disabled: None) -> ONNXService:
+    """Fixture providing an ONNXService instance that skips graph optimization."""
     return ONNXService()
 
 
@@ -220,3 +467,11 @@ def reset_onnx_singleton():
     reset_onnx_service()
     yield
     reset_onnx_service()
+
+
+@pytest.fixture(autouse=True)
+def reset_local_prediction_cache_singleton():
+    """Reset the in-process prediction L1 before each test."""
+    reset_local_prediction_cache()
+    yield
+    reset_local_prediction_cache()
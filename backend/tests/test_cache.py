@@ -8,12 +8,22 @@ Tests cover:
 - Key namespacing
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 
 from app.services.cache import CacheService
 
+# (method, args, result) for cache operations made without a usable Redis
+_OPS_WITHOUT_REDIS = [
+    pytest.param("get", ("any_key",), None, id="get"),
+    pytest.param("set", ("any_key", "any_value"), False, id="set"),
+    pytest.param("delete", ("any_key",), False, id="delete"),
+    pytest.param("exists", ("any_key",), False, id="exists"),
+]
+
 
 class TestCacheServiceDisabled:
     """Tests for cache service when disabled."""
@@ -26,32 +36,12 @@ class TestCacheServiceDisabled:
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_disabled_cache_get_returns_none(self):
-        """Disabled cache returns None on get."""
-        cache = CacheService(enabled=False)
-        result = await cache.get("any_key")
-        assert result is None
-
-    @pytest.mark.asyncio
-    async def test_disabled_cache_set_returns_false(self):
-        """Disabled cache returns False on set."""
-        cache = CacheService(enabled=False)
-        result = await cache.set("any_key", "any_value")
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_disabled_cache_delete_returns_false(self):
-        """Disabled cache returns False on delete."""
-        cache = CacheService(enabled=False)
-        result = await cache.delete("any_key")
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_disabled_cache_exists_returns_false(self):
-        """Disabled cache returns False on exists."""
+    @pytest.mark.parametrize("op, args, expected", _OPS_WITHOUT_REDIS)
+    async def test_disabled_cache_operations_are_noops(self, op, args, expected):
+        """Disabled cache returns the miss/failure value without touching Redis."""
         cache = CacheService(enabled=False)
-        result = await cache.exists("any_key")
-        assert result is False
+        result = await getattr(cache, op)(*args)
+        assert result is expected
 
     @pytest.mark.asyncio
     async def test_disabled_cache_health_check(self):
@@ -79,41 +69,55 @@ class TestCacheServiceKeyNamespacing:
         assert key.startswith("modelforge:")
         assert key.endswith("mykey")
 
+    def test_make_key_separates_prefixes(self):
+        """Services with different prefixes build different keys."""
+        assert CacheService(prefix="a:", enabled=False).make_key("k") == "a:k"
+        assert CacheService(prefix="b:", enabled=False).make_key("k") == "b:k"
+
 
 class TestCacheServiceWithMockedRedis:
     """Tests with mocked Redis client."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_redis(self):
-        """Create a mock Redis client."""
-        mock = AsyncMock()
-        mock.ping = AsyncMock(return_value=True)
-        mock.get = AsyncMock(return_value=None)
-        mock.set = AsyncMock(return_value=True)
-        mock.delete = AsyncMock(return_value=1)
-        mock.exists = AsyncMock(return_value=1)
-        mock.info = AsyncMock(
-            return_value={"redis_version": "7.0.0", "uptime_in_seconds": 1000}
-        )
-        mock.close = AsyncMock()
-        return mock
+        """Create a mock Redis client, shared by the tests in this class."""
+        return AsyncMock()
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_pool(self):
-        """Create a mock connection pool."""
-        mock = MagicMock()
-        mock.disconnect = AsyncMock()
-        return mock
+        """Create a mock connection pool, shared by the tests in this class."""
+        return MagicMock()
 
-    @pytest.mark.asyncio
-    async def test_get_returns_cached_value(self, mock_redis, mock_pool):
-        """Get returns cached string value."""
-        mock_redis.get.return_value = '"cached_value"'
+    @pytest.fixture(autouse=True)
+    def reset_mocks(self, mock_redis, mock_pool):
+        """Clear recorded calls and restore default return values per test."""
+        mock_redis.reset_mock(side_effect=True)
+        mock_pool.reset_mock(side_effect=True)
 
-        cache = CacheService(prefix="test:", enabled=True)
+        mock_redis.ping.return_value = True
+        mock_redis.get.return_value = None
+        mock_redis.set.return_value = True
+        mock_redis.delete.return_value = 1
+        mock_redis.exists.return_value = 1
+        mock_redis.info.return_value = {
+            "redis_version": "7.0.0",
+            "uptime_in_seconds": 1000,
+        }
+        mock_pool.disconnect = AsyncMock()
+
+    @pytest.fixture
+    def cache(self, mock_redis, mock_pool) -> CacheService:
+        """Create a connected CacheService backed by the mocks."""
+        cache = CacheService(prefix="test:", default_ttl=300, enabled=True)
         cache._connected = True
         cache._client = mock_redis
         cache._pool = mock_pool
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_get_returns_cached_value(self, cache, mock_redis):
+        """Get returns cached string value."""
+        mock_redis.get.return_value = '"cached_value"'
 
         result = await cache.get("mykey")
 
@@ -121,143 +125,214 @@ class TestCacheServiceWithMockedRedis:
         mock_redis.get.assert_called_once_with("test:mykey")
 
     @pytest.mark.asyncio
-    async def test_get_returns_cached_dict(self, mock_redis, mock_pool):
+    async def test_get_returns_cached_dict(self, cache, mock_redis):
         """Get deserializes JSON objects."""
         mock_redis.get.return_value = '{"foo": "bar", "num": 42}'
 
-        cache = CacheService(prefix="test:", enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         result = await cache.get("mykey")
 
         assert result == {"foo": "bar", "num": 42}
 
     @pytest.mark.asyncio
-    async def test_get_returns_none_on_miss(self, mock_redis, mock_pool):
+    async def test_get_offloads_large_payload_to_thread(self, cache, mock_redis):
+        """Payloads over the threshold are decoded in a worker thread."""
+        from app.services.cache import _deserialize
+
+        payload = {"weights": ["x" * 100] * 1000}
+        mock_redis.get.return_value = orjson.dumps(payload).decode()
+
+        with patch(
+            "app.services.cache.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as mock_to_thread:
+            result = await cache.get("mykey")
+
+        assert result == payload
+        mock_to_thread.assert_called_once_with(
+            _deserialize, mock_redis.get.return_value
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_decodes_small_payload_inline(self, cache, mock_redis):
+        """Small payloads skip the thread hop."""
+        mock_redis.get.return_value = '{"foo": "bar"}'
+
+        with patch("app.services.cache.asyncio.to_thread") as mock_to_thread:
+            result = await cache.get("mykey")
+
+        assert result == {"foo": "bar"}
+        mock_to_thread.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_numeric_fast_path(self, cache, mock_redis):
+        """Integer values are parsed without the JSON decoder."""
+        mock_redis.get.return_value = "42"
+
+        with patch("app.services.cache.serialization.loads") as mock_loads:
+            result = await cache.get("counter")
+
+        assert result == 42
+        mock_loads.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            pytest.param("-7", -7, id="negative"),
+            pytest.param("0", 0, id="zero"),
+            pytest.param("2.5", 2.5, id="float"),
+            pytest.param("007", "007", id="leading-zeros"),
+            pytest.param("-", "-", id="bare-minus"),
+            pytest.param("１２", "１２", id="non-ascii-digits"),
+        ],
+    )
+    async def test_get_numeric_values_match_json(
+        self, cache, mock_redis, raw, expected
+    ):
+        """The fast path decodes exactly what the JSON fallback would."""
+        mock_redis.get.return_value = raw
+
+        assert await cache.get("counter") == expected
+
+    @pytest.mark.asyncio
+    async def test_get_returns_none_on_miss(self, cache, mock_redis):
         """Get returns None on cache miss."""
         mock_redis.get.return_value = None
 
-        cache = CacheService(prefix="test:", enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         result = await cache.get("nonexistent")
 
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_set_stores_value(self, mock_redis, mock_pool):
+    async def test_set_stores_value(self, cache, mock_redis):
         """Set stores value with TTL."""
-        cache = CacheService(prefix="test:", default_ttl=300, enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         result = await cache.set("mykey", {"data": "value"})
 
         assert result is True
         mock_redis.set.assert_called_once()
         call_args = mock_redis.set.call_args
         assert call_args[0][0] == "test:mykey"
-        assert '"data"' in call_args[0][1]
+        assert isinstance(call_args[0][1], bytes)
+        assert b'"data"' in call_args[0][1]
         assert call_args[1]["ex"] == 300
 
     @pytest.mark.asyncio
-    async def test_set_custom_ttl(self, mock_redis, mock_pool):
+    async def test_set_custom_ttl(self, cache, mock_redis):
         """Set uses custom TTL when provided."""
-        cache = CacheService(prefix="test:", default_ttl=300, enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         await cache.set("mykey", "value", ttl=60)
 
         call_args = mock_redis.set.call_args
         assert call_args[1]["ex"] == 60
 
     @pytest.mark.asyncio
-    async def test_delete_removes_key(self, mock_redis, mock_pool):
+    async def test_set_serializes_non_string_keys(self, cache, mock_redis):
+        """Set stringifies dict keys the way stdlib json does."""
+        await cache.set("mykey", {1: "one"})
+
+        assert orjson.loads(mock_redis.set.call_args[0][1]) == {"1": "one"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "value",
+        [
+            pytest.param({f"key{i}": i for i in range(1000)}, id="wide"),
+            pytest.param(
+                {
+                    f"model{i}": {"inputs": [[0.5] * 10], "tags": ["a", "b"]}
+                    for i in range(1000)
+                },
+                id="nested",
+            ),
+            pytest.param([{"x": [1.5, None, True]}] * 1000, id="list"),
+        ],
+    )
+    async def test_set_then_get_round_trips_large_payloads(
+        self, cache, mock_redis, value
+    ):
+        """Large payloads survive serialization on set and decoding on get."""
+        await cache.set("mykey", value)
+        mock_redis.get.return_value = mock_redis.set.call_args[0][1]
+
+        assert await cache.get("mykey") == value
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_key(self, cache, mock_redis):
         """Delete removes key and returns True."""
         mock_redis.delete.return_value = 1
 
-        cache = CacheService(prefix="test:", enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         result = await cache.delete("mykey")
 
         assert result is True
         mock_redis.delete.assert_called_once_with("test:mykey")
 
     @pytest.mark.asyncio
-    async def test_delete_returns_false_on_miss(self, mock_redis, mock_pool):
+    async def test_delete_returns_false_on_miss(self, cache, mock_redis):
         """Delete returns False when key doesn't exist."""
         mock_redis.delete.return_value = 0
 
-        cache = CacheService(prefix="test:", enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         result = await cache.delete("nonexistent")
 
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_exists_returns_true(self, mock_redis, mock_pool):
+    async def test_exists_returns_true(self, cache, mock_redis):
         """Exists returns True when key exists."""
         mock_redis.exists.return_value = 1
 
-        cache = CacheService(prefix="test:", enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         result = await cache.exists("mykey")
 
         assert result is True
 
     @pytest.mark.asyncio
-    async def test_exists_returns_false(self, mock_redis, mock_pool):
+    async def test_exists_returns_false(self, cache, mock_redis):
         """Exists returns False when key doesn't exist."""
         mock_redis.exists.return_value = 0
 
-        cache = CacheService(prefix="test:", enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         result = await cache.exists("nonexistent")
 
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_health_check_healthy(self, mock_redis, mock_pool):
+    async def test_health_check_healthy(self, cache, mock_redis):
         """Health check returns healthy status."""
-        cache = CacheService(enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
-
         health = await cache.health_check()
 
         assert health["status"] == "healthy"
         assert health["enabled"] is True
         assert health["connected"] is True
         assert health["redis_version"] == "7.0.0"
+        assert mock_redis.ping.await_count == 1
+        assert mock_redis.info.await_count == 1
 
     @pytest.mark.asyncio
-    async def test_disconnect_closes_connections(self, mock_redis, mock_pool):
-        """Disconnect closes client and pool."""
-        cache = CacheService(enabled=True)
-        cache._connected = True
-        cache._client = mock_redis
-        cache._pool = mock_pool
+    async def test_health_check_runs_ping_and_info_concurrently(
+        self, cache, mock_redis
+    ):
+        """Ping and info are both in flight before either completes."""
+        events = []
+
+        async def ping():
+            events.append("ping start")
+            await asyncio.sleep(0)
+            events.append("ping end")
+            return True
+
+        async def info(section):
+            events.append("info start")
+            await asyncio.sleep(0)
+            events.append("info end")
+            return {"redis_version": "7.0.0"}
+
+        mock_redis.ping.side_effect = ping
+        mock_redis.info.side_effect = info
+
+        health = await cache.health_check()
 
+        assert health["status"] == "healthy"
+        assert events[:2] == ["ping start", "info start"]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_connections(self, cache, mock_redis, mock_pool):
+        """Disconnect closes client and pool."""
         await cache.disconnect()
 
         mock_redis.close.assert_called_once()
@@ -267,75 +342,166 @@ class TestCacheServiceWithMockedRedis:
         assert cache._pool is None
 
 
+class TestCacheServiceWithFakeRedis:
+    """Round-trip tests against an in-process Redis.
+
+    Complements the mocked tests by checking what actually lands in Redis
+    (serialized values, TTLs, deleted keys) rather than call shapes. The
+    fake has no Lua or INFO, so script- and health-based paths stay mocked.
+    """
+
+    @pytest.fixture
+    def cache(self, fake_redis):
+        """Create a cache service connected to the fake Redis."""
+        cache = CacheService(prefix="test:", default_ttl=300, enabled=True)
+        cache._connected = True
+        cache._client = fake_redis
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_set_then_get_round_trips(self, cache, fake_redis):
+        """Values are stored as JSON under the prefixed key with the TTL."""
+        assert await cache.set("mykey", {"foo": [1, 2.5, None]}) is True
+
+        assert await fake_redis.get("test:mykey") == '{"foo":[1,2.5,null]}'
+        assert 0 < await fake_redis.ttl("test:mykey") <= 300
+        assert await cache.get("mykey") == {"foo": [1, 2.5, None]}
+
+    @pytest.mark.asyncio
+    async def test_non_finite_floats_round_trip(self, cache, fake_redis):
+        """NaN and infinities are stored as JSON tokens, not as null."""
+        import math
+
+        value = {"x": [math.inf, -math.inf, math.nan, None]}
+        assert await cache.set("mykey", value) is True
+
+        assert await fake_redis.get("test:mykey") == (
+            '{"x":[Infinity,-Infinity,NaN,null]}'
+        )
+        result = await cache.get("mykey")
+        assert result["x"][:2] == [math.inf, -math.inf]
+        assert math.isnan(result["x"][2])
+        assert result["x"][3] is None
+
+    @pytest.mark.asyncio
+    async def test_big_int_round_trips(self, cache):
+        """Integers beyond 64 bits are stored exactly."""
+        assert await cache.set("mykey", {"n": 2**70}) is True
+        assert await cache.get("mykey") == {"n": 2**70}
+
+    @pytest.mark.asyncio
+    async def test_string_values_stored_raw(self, cache, fake_redis):
+        """Strings are stored without JSON quoting."""
+        await cache.set("mykey", "cached_value")
+
+        assert await fake_redis.get("test:mykey") == "cached_value"
+        assert await cache.get("mykey") == "cached_value"
+
+    @pytest.mark.asyncio
+    async def test_delete_and_exists(self, cache):
+        """Delete removes the key and reports whether it existed."""
+        await cache.set("mykey", "value")
+
+        assert await cache.exists("mykey") is True
+        assert await cache.delete("mykey") is True
+        assert await cache.exists("mykey") is False
+        assert await cache.delete("mykey") is False
+
+    @pytest.mark.asyncio
+    async def test_mset_then_mget(self, cache, fake_redis):
+        """Batched writes and reads agree, with None for misses."""
+        assert await cache.mset({"a": {"n": 1}, "b": "two"}, ttl=60) is True
+
+        assert await cache.mget("a", "missing", "b") == [{"n": 1}, None, "two"]
+        assert 0 < await fake_redis.ttl("test:a") <= 60
+
+    @pytest.mark.asyncio
+    async def test_clear_prefix_only_removes_matching(self, cache, fake_redis):
+        """Clearing a prefix leaves other keys in place."""
+        await cache.mset({"model:1:a": 1, "model:1:b": 2, "model:2:a": 3})
+
+        assert await cache.clear_prefix("model:1:") == 2
+        assert await fake_redis.keys("*") == ["test:model:2:a"]
+
+    @pytest.mark.asyncio
+    async def test_delete_keys_counts_existing(self, cache):
+        """Delete keys returns how many of the keys existed."""
+        await cache.mset({"a": 1, "b": 2})
+
+        assert await cache.delete_keys("a", "b", "missing") == 2
+
+    @pytest.mark.asyncio
+    async def test_counters(self, cache):
+        """Plain and bucketed counters increment from zero."""
+        assert await cache.incr("hits") == 1
+        assert await cache.incr("hits") == 2
+        assert await cache.hincr("requests") == 1
+        assert await cache.hincr("requests") == 2
+
+    @pytest.mark.asyncio
+    async def test_set_nowait_lands_after_disconnect(self, cache, fake_redis):
+        """Queued writes are in Redis once the service drains them."""
+        cache.set_nowait("mykey", {"queued": True})
+
+        await cache.disconnect()
+
+        assert await fake_redis.get("test:mykey") == '{"queued":true}'
+
+
 class TestCacheServiceGracefulDegradation:
     """Tests for graceful degradation on Redis errors."""
 
     @pytest.fixture
     def failing_redis(self):
         """Create a Redis mock that raises errors."""
+        from redis.asyncio import Redis
         from redis.exceptions import RedisError
 
-        mock = AsyncMock()
-        mock.get = AsyncMock(side_effect=RedisError("Connection refused"))
-        mock.set = AsyncMock(side_effect=RedisError("Connection refused"))
-        mock.delete = AsyncMock(side_effect=RedisError("Connection refused"))
-        mock.exists = AsyncMock(side_effect=RedisError("Connection refused"))
-        mock.ping = AsyncMock(side_effect=RedisError("Connection refused"))
-        mock.info = AsyncMock(side_effect=RedisError("Connection refused"))
-        mock.close = AsyncMock()
+        error = RedisError("Connection refused")
+        mock = AsyncMock(spec=Redis)
+        for name in ("get", "set", "delete", "exists", "ping", "info"):
+            getattr(mock, name).side_effect = error
         return mock
 
-    @pytest.mark.asyncio
-    async def test_get_returns_none_on_error(self, failing_redis):
-        """Get returns None instead of raising on Redis error."""
+    @pytest.fixture
+    def cache(self, failing_redis) -> CacheService:
+        """Create a connected CacheService whose Redis calls all fail."""
         cache = CacheService(enabled=True)
         cache._connected = True
         cache._client = failing_redis
+        return cache
 
+    @pytest.mark.asyncio
+    async def test_get_returns_none_on_error(self, cache):
+        """Get returns None instead of raising on Redis error."""
         result = await cache.get("mykey")
 
         assert result is None  # Graceful degradation
 
     @pytest.mark.asyncio
-    async def test_set_returns_false_on_error(self, failing_redis):
+    async def test_set_returns_false_on_error(self, cache):
         """Set returns False instead of raising on Redis error."""
-        cache = CacheService(enabled=True)
-        cache._connected = True
-        cache._client = failing_redis
-
         result = await cache.set("mykey", "value")
 
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_delete_returns_false_on_error(self, failing_redis):
+    async def test_delete_returns_false_on_error(self, cache):
         """Delete returns False instead of raising on Redis error."""
-        cache = CacheService(enabled=True)
-        cache._connected = True
-        cache._client = failing_redis
-
         result = await cache.delete("mykey")
 
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_exists_returns_false_on_error(self, failing_redis):
+    async def test_exists_returns_false_on_error(self, cache):
         """Exists returns False instead of raising on Redis error."""
-        cache = CacheService(enabled=True)
-        cache._connected = True
-        cache._client = failing_redis
-
         result = await cache.exists("mykey")
 
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_health_check_unhealthy_on_error(self, failing_redis):
+    async def test_health_check_unhealthy_on_error(self, cache):
         """Health check returns unhealthy status on Redis error."""
-        cache = CacheService(enabled=True)
-        cache._connected = True
-        cache._client = failing_redis
-
         health = await cache.health_check()
 
         assert health["status"] == "unhealthy"
@@ -347,12 +513,14 @@ class TestCacheServiceGetOrSet:
     """Tests for get_or_set convenience method."""
 
     @pytest.fixture
-    def mock_redis(self):
-        """Create a mock Redis client."""
+    def mock_redis(self, mock_pipeline):
+        """Create a mock Redis client whose pipeline() returns mock_pipeline."""
         mock = AsyncMock()
         mock.get = AsyncMock(return_value=None)
         mock.set = AsyncMock(return_value=True)
+        mock.eval = AsyncMock(return_value=None)
         mock.close = AsyncMock()
+        mock.pipeline = MagicMock(return_value=mock_pipeline)
         return mock
 
     @pytest.mark.asyncio
@@ -370,7 +538,7 @@ class TestCacheServiceGetOrSet:
         result = await cache.get_or_set("mykey", factory)
 
         assert result == "cached"
-        mock_redis.set.assert_not_called()  # Factory not called
+        mock_redis.eval.assert_not_called()  # Factory not called
 
     @pytest.mark.asyncio
     async def test_get_or_set_cache_miss(self, mock_redis):
@@ -392,26 +560,116 @@ class TestCacheServiceGetOrSet:
 
         assert result == "computed"
         assert factory_called
-        mock_redis.set.assert_called_once()
+        # Stored with one set-if-absent script call, not a plain SET
+        mock_redis.set.assert_not_called()
+        mock_redis.eval.assert_called_once()
+        args = mock_redis.eval.call_args[0]
+        assert args[1:] == (1, "test:mykey", "computed", cache.default_ttl)
 
+    @pytest.mark.asyncio
+    async def test_get_or_set_race_returns_stored_value(self, mock_redis):
+        """A value stored by a concurrent caller wins over the computed one."""
+        mock_redis.eval.return_value = '{"winner": true}'
 
-class TestCacheServiceNotConnected:
-    """Tests for operations when not connected."""
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        async def factory():
+            return {"winner": False}
+
+        result = await cache.get_or_set("mykey", factory)
+
+        assert result == {"winner": True}
 
     @pytest.mark.asyncio
-    async def test_get_returns_none_when_not_connected(self):
-        """Get returns None when not connected."""
+    async def test_get_or_set_not_connected_returns_computed(self):
+        """Without Redis the factory result is returned uncached."""
         cache = CacheService(enabled=True)
-        # Not connected - _connected is False by default
-        result = await cache.get("mykey")
-        assert result is None
+
+        async def factory():
+            return "computed"
+
+        assert await cache.get_or_set("mykey", factory) == "computed"
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_many_computes_only_misses(
+        self, mock_redis, mock_pipeline
+    ):
+        """One MGET finds the misses and one pipeline stores their values."""
+        mock_redis.mget = AsyncMock(return_value=['"a"', None, None])
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        factory_keys = []
+
+        async def factory(key):
+            factory_keys.append(key)
+            return f"computed-{key}"
+
+        result = await cache.get_or_set_many(["k1", "k2", "k3"], factory, ttl=60)
+
+        assert result == ["a", "computed-k2", "computed-k3"]
+        assert factory_keys == ["k2", "k3"]
+        mock_redis.mget.assert_called_once()
+        mock_pipeline.set.assert_any_call("test:k2", "computed-k2", ex=60)
+        mock_pipeline.set.assert_any_call("test:k3", "computed-k3", ex=60)
+        mock_pipeline.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_many_all_hits(self, mock_redis):
+        """No factory runs and nothing is written when every key hits."""
+        mock_redis.mget = AsyncMock(return_value=['"a"', '"b"'])
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        factory = AsyncMock()
+
+        result = await cache.get_or_set_many(["k1", "k2"], factory)
+
+        assert result == ["a", "b"]
+        factory.assert_not_called()
+        mock_redis.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_many_failed_factory_not_cached(
+        self, mock_redis, mock_pipeline
+    ):
+        """A failing factory yields None for its key and is not cached."""
+        mock_redis.mget = AsyncMock(return_value=[None, None])
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        async def factory(key):
+            if key == "bad":
+                raise ValueError("boom")
+            return "ok"
+
+        result = await cache.get_or_set_many(["bad", "good"], factory)
+
+        assert result == [None, "ok"]
+        mock_pipeline.set.assert_called_once_with(
+            "test:good", "ok", ex=cache.default_ttl
+        )
+
+
+class TestCacheServiceNotConnected:
+    """Tests for operations when not connected."""
 
     @pytest.mark.asyncio
-    async def test_set_returns_false_when_not_connected(self):
-        """Set returns False when not connected."""
+    @pytest.mark.parametrize("op, args, expected", _OPS_WITHOUT_REDIS)
+    async def test_operations_when_not_connected(self, op, args, expected):
+        """Operations return the miss/failure value when not connected."""
         cache = CacheService(enabled=True)
-        result = await cache.set("mykey", "value")
-        assert result is False
+        # Not connected - _connected is False by default
+        result = await getattr(cache, op)(*args)
+        assert result is expected
 
     @pytest.mark.asyncio
     async def test_health_check_disconnected(self):
@@ -453,14 +711,14 @@ class TestCacheServiceClearPrefix:
 
     @pytest.fixture
     def mock_redis(self):
-        """Create a mock Redis client."""
+        """Create a mock Redis client for testing."""
         mock = AsyncMock()
         mock.close = AsyncMock()
         return mock
 
     @pytest.mark.asyncio
-    async def test_clear_prefix_deletes_matching_keys(self, mock_redis):
-        """Clear prefix deletes all keys with matching prefix."""
+    async def test_clear_prefix_unlinks_matching_keys(self, mock_redis):
+        """Clear prefix unlinks all keys with matching prefix."""
 
         # Mock scan_iter to return some keys
         async def mock_scan_iter(**kwargs):
@@ -468,7 +726,7 @@ class TestCacheServiceClearPrefix:
                 yield key
 
         mock_redis.scan_iter = mock_scan_iter
-        mock_redis.delete = AsyncMock(return_value=2)
+        mock_redis.unlink = AsyncMock(return_value=2)
 
         cache = CacheService(prefix="test:", enabled=True)
         cache._connected = True
@@ -477,9 +735,40 @@ class TestCacheServiceClearPrefix:
         result = await cache.clear_prefix("prefix:")
 
         assert result == 2
-        mock_redis.delete.assert_called_once_with(
+        mock_redis.unlink.assert_awaited_once_with(
             "test:prefix:key1", "test:prefix:key2"
         )
+        mock_redis.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_clear_prefix_unlinks_each_batch_during_scan(self, mock_redis):
+        """Each full batch is unlinked before the scan yields the next key."""
+        keys = [f"test:prefix:key{i}" for i in range(10_000)]
+        unlinked_at_scan = []
+
+        async def mock_scan_iter(**kwargs):
+            for i, key in enumerate(keys):
+                if i % 500 == 0:
+                    unlinked_at_scan.append(mock_redis.unlink.await_count)
+                yield key
+
+        mock_redis.scan_iter = mock_scan_iter
+        mock_redis.unlink = AsyncMock(return_value=500)
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        result = await cache.clear_prefix("prefix:")
+
+        assert result == 10_000
+        batches = [c.args for c in mock_redis.unlink.await_args_list]
+        assert len(batches) == 20
+        assert all(len(batch) == 500 for batch in batches)
+        assert [k for batch in batches for k in batch] == keys
+        # Batches were sent as the scan went, not all at the end
+        assert unlinked_at_scan == list(range(20))
+        mock_redis.pipeline.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_clear_prefix_no_matching_keys(self, mock_redis):
@@ -499,7 +788,7 @@ class TestCacheServiceClearPrefix:
         result = await cache.clear_prefix("nonexistent:")
 
         assert result == 0
-        mock_redis.delete.assert_not_called()
+        mock_redis.unlink.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_clear_prefix_returns_zero_on_error(self, mock_redis):
@@ -576,8 +865,8 @@ class TestCacheServiceIncr:
         assert result is None
 
 
-class TestCacheServiceGetRaw:
-    """Tests for get_raw method."""
+class TestCacheServiceHincr:
+    """Tests for hincr method."""
 
     @pytest.fixture
     def mock_redis(self):
@@ -587,7 +876,111 @@ class TestCacheServiceGetRaw:
         return mock
 
     @pytest.mark.asyncio
-    async def test_get_raw_returns_string(self, mock_redis):
+    async def test_hincr_uses_bucketed_hash(self, mock_redis):
+        """Hincr increments a field in the counter's stable hash bucket."""
+        import zlib
+
+        mock_redis.hincrby = AsyncMock(return_value=3)
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        result = await cache.hincr("counter")
+
+        assert result == 3
+        bucket = zlib.crc32(b"counter") % 256
+        mock_redis.hincrby.assert_called_once_with(f"test:ctr:{bucket}", "counter", 1)
+
+    @pytest.mark.asyncio
+    async def test_hincr_returns_none_on_error(self, mock_redis):
+        """Hincr returns None on Redis error."""
+        from redis.exceptions import RedisError
+
+        mock_redis.hincrby = AsyncMock(side_effect=RedisError("Connection error"))
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        assert await cache.hincr("counter") is None
+
+    @pytest.mark.asyncio
+    async def test_hincr_not_connected(self):
+        """Hincr returns None when not connected."""
+        cache = CacheService(enabled=True)
+        assert await cache.hincr("counter") is None
+
+
+class TestCacheServiceGetAndCount:
+    """Tests for get_and_count method."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Create a mock Redis client."""
+        mock = AsyncMock()
+        mock.close = AsyncMock()
+        return mock
+
+    @pytest.mark.asyncio
+    async def test_get_and_count_single_round_trip(self, mock_redis):
+        """Lookup and counter keys are sent in one script call."""
+        mock_redis.eval = AsyncMock(return_value='{"foo": "bar"}')
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        result = await cache.get_and_count("mykey", "hits", "misses")
+
+        assert result == {"foo": "bar"}
+        mock_redis.eval.assert_called_once()
+        args = mock_redis.eval.call_args[0]
+        assert args[1:] == (3, "test:mykey", "test:hits", "test:misses")
+
+    @pytest.mark.asyncio
+    async def test_get_and_count_miss(self, mock_redis):
+        """Get_and_count returns None on miss."""
+        mock_redis.eval = AsyncMock(return_value=None)
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        assert await cache.get_and_count("mykey", "hits", "misses") is None
+
+    @pytest.mark.asyncio
+    async def test_get_and_count_returns_none_on_error(self, mock_redis):
+        """Get_and_count returns None on Redis error."""
+        from redis.exceptions import RedisError
+
+        mock_redis.eval = AsyncMock(side_effect=RedisError("Connection error"))
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        assert await cache.get_and_count("mykey", "hits", "misses") is None
+
+    @pytest.mark.asyncio
+    async def test_get_and_count_not_connected(self):
+        """Get_and_count returns None when not connected."""
+        cache = CacheService(enabled=True)
+        assert await cache.get_and_count("mykey", "hits", "misses") is None
+
+
+class TestCacheServiceGetRaw:
+    """Tests for get_raw method."""
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Create a mock Redis client."""
+        mock = AsyncMock()
+        mock.close = AsyncMock()
+        return mock
+
+    @pytest.mark.asyncio
+    async def test_get_raw_returns_string(self, mock_redis):
         """Get raw returns raw string value."""
         mock_redis.get = AsyncMock(return_value="42")
 
@@ -640,16 +1033,17 @@ class TestCacheServiceDeleteKeys:
     """Tests for delete_keys method."""
 
     @pytest.fixture
-    def mock_redis(self):
-        """Create a mock Redis client."""
+    def mock_redis(self, mock_pipeline):
+        """Create a mock Redis client whose pipeline() returns mock_pipeline."""
         mock = AsyncMock()
         mock.close = AsyncMock()
+        mock.pipeline = MagicMock(return_value=mock_pipeline)
         return mock
 
     @pytest.mark.asyncio
-    async def test_delete_keys_removes_multiple(self, mock_redis):
-        """Delete keys removes multiple keys."""
-        mock_redis.delete = AsyncMock(return_value=3)
+    async def test_delete_keys_removes_multiple(self, mock_redis, mock_pipeline):
+        """Delete keys removes multiple keys through a pipeline."""
+        mock_pipeline.execute.return_value = [3]
 
         cache = CacheService(prefix="test:", enabled=True)
         cache._connected = True
@@ -658,7 +1052,29 @@ class TestCacheServiceDeleteKeys:
         result = await cache.delete_keys("key1", "key2", "key3")
 
         assert result == 3
-        mock_redis.delete.assert_called_once_with("test:key1", "test:key2", "test:key3")
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        mock_pipeline.delete.assert_called_once_with(
+            "test:key1", "test:key2", "test:key3"
+        )
+        mock_redis.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_delete_keys_chunks_at_512(self, mock_redis, mock_pipeline):
+        """Large deletes are split into DEL commands of 512 keys."""
+        mock_pipeline.execute.return_value = [512, 512, 476]
+        keys = [f"key{i}" for i in range(1500)]
+
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        result = await cache.delete_keys(*keys)
+
+        assert result == 1500
+        batches = [c.args for c in mock_pipeline.delete.call_args_list]
+        assert [len(batch) for batch in batches] == [512, 512, 476]
+        assert [k for batch in batches for k in batch] == [f"test:{k}" for k in keys]
+        mock_pipeline.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_delete_keys_empty_keys(self):
@@ -669,11 +1085,11 @@ class TestCacheServiceDeleteKeys:
         assert result == 0
 
     @pytest.mark.asyncio
-    async def test_delete_keys_returns_zero_on_error(self, mock_redis):
+    async def test_delete_keys_returns_zero_on_error(self, mock_redis, mock_pipeline):
         """Delete keys returns 0 on Redis error."""
         from redis.exceptions import RedisError
 
-        mock_redis.delete = AsyncMock(side_effect=RedisError("Connection error"))
+        mock_pipeline.execute = AsyncMock(side_effect=RedisError("Connection error"))
 
         cache = CacheService(prefix="test:", enabled=True)
         cache._connected = True
@@ -691,6 +1107,475 @@ class TestCacheServiceDeleteKeys:
         assert result == 0
 
 
+class TestCacheServiceMultiKey:
+    """Tests for mget and mset methods."""
+
+    @pytest.fixture
+    def mock_redis(self, mock_pipeline):
+        """Create a mock Redis client whose pipeline() returns mock_pipeline."""
+        mock = AsyncMock()
+        mock.close = AsyncMock()
+        mock.pipeline = MagicMock(return_value=mock_pipeline)
+        return mock
+
+    @pytest.fixture
+    def cache(self, mock_redis):
+        """Create a connected cache service backed by mock_redis."""
+        cache = CacheService(prefix="test:", default_ttl=300, enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_mget_single_round_trip(self, cache, mock_redis):
+        """Mget fetches all keys with one MGET and decodes each value."""
+        mock_redis.mget = AsyncMock(return_value=['{"a": 1}', None, "raw"])
+
+        result = await cache.mget("key1", "key2", "key3")
+
+        assert result == [{"a": 1}, None, "raw"]
+        mock_redis.mget.assert_called_once_with(["test:key1", "test:key2", "test:key3"])
+
+    @pytest.mark.asyncio
+    async def test_mget_cluster_splits_by_slot(self, mock_redis):
+        """In cluster mode mget uses the slot-splitting variant."""
+        mock_redis.mget_nonatomic = AsyncMock(return_value=["1", None])
+
+        cache = CacheService(
+            prefix="test:", enabled=True, redis_url="redis+cluster://node1:7000"
+        )
+        cache._connected = True
+        cache._client = mock_redis
+
+        result = await cache.mget("key1", "key2")
+
+        assert result == [1, None]
+        mock_redis.mget_nonatomic.assert_called_once_with(["test:key1", "test:key2"])
+        mock_redis.mget.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_mget_returns_nones_on_error(self, cache, mock_redis):
+        """Mget returns a miss for every key on Redis error."""
+        from redis.exceptions import RedisError
+
+        mock_redis.mget = AsyncMock(side_effect=RedisError("Connection error"))
+
+        result = await cache.mget("key1", "key2")
+
+        assert result == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_mget_not_connected(self):
+        """Mget returns a miss for every key when not connected."""
+        cache = CacheService(enabled=True)
+        result = await cache.mget("key1", "key2")
+        assert result == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_mset_pipelines_sets(self, cache, mock_redis, mock_pipeline):
+        """Mset queues a SET EX per key and executes the pipeline once."""
+        result = await cache.mset({"key1": {"a": 1}, "key2": "value"}, ttl=60)
+
+        assert result is True
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert mock_pipeline.set.call_count == 2
+        mock_pipeline.set.assert_any_call("test:key1", orjson.dumps({"a": 1}), ex=60)
+        mock_pipeline.set.assert_any_call("test:key2", "value", ex=60)
+        mock_pipeline.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_mset_uses_default_ttl(self, cache, mock_pipeline):
+        """Mset falls back to the default TTL."""
+        await cache.mset({"key1": "value"})
+
+        mock_pipeline.set.assert_called_once_with("test:key1", "value", ex=300)
+
+    @pytest.mark.asyncio
+    async def test_mset_empty_mapping(self, cache, mock_redis):
+        """Mset with nothing to write skips Redis."""
+        result = await cache.mset({})
+
+        assert result is True
+        mock_redis.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_mset_returns_false_on_error(self, cache, mock_pipeline):
+        """Mset returns False on Redis error."""
+        from redis.exceptions import RedisError
+
+        mock_pipeline.execute = AsyncMock(side_effect=RedisError("Connection error"))
+
+        result = await cache.mset({"key1": "value"})
+
+        assert result is False
+
+    @pytest.mark.asyncio
+    async def test_mset_not_connected(self):
+        """Mset returns False when not connected."""
+        cache = CacheService(enabled=True)
+        result = await cache.mset({"key1": "value"})
+        assert result is False
+
+
+def _require_one_slot(*keys: str) -> None:
+    """Reject keys spanning slots, as Redis Cluster does for one command."""
+    from redis.crc import key_slot
+    from redis.exceptions import RedisClusterException
+
+    if len({key_slot(k.encode()) for k in keys}) > 1:
+        raise RedisClusterException("Keys in request don't hash to the same slot")
+
+
+class TestCacheServiceCluster:
+    """Tests for multi-key commands against a Redis Cluster client."""
+
+    @pytest.fixture
+    def mock_cluster(self):
+        """Create a mock cluster client whose scripts enforce one slot per call."""
+        mock = AsyncMock()
+        mock.close = AsyncMock()
+
+        async def eval_(script, numkeys, *args):
+            _require_one_slot(*args[:numkeys])
+
+        mock.eval = AsyncMock(side_effect=eval_)
+        mock.pipeline = MagicMock(side_effect=AssertionError("cross-slot pipeline"))
+        return mock
+
+    @pytest.fixture
+    def cache(self, mock_cluster):
+        """Create a connected cluster-mode cache service."""
+        cache = CacheService(
+            prefix="test:", enabled=True, redis_url="redis+cluster://node1:7000"
+        )
+        cache._connected = True
+        cache._client = mock_cluster
+        return cache
+
+    def test_prediction_keys_span_slots(self):
+        """The prediction key and its counters cannot share one script call."""
+        from redis.exceptions import RedisClusterException
+
+        with pytest.raises(RedisClusterException):
+            _require_one_slot(
+                "mlforge:prediction:model-1:abc",
+                "mlforge:metrics:prediction:hits",
+                "mlforge:metrics:prediction:misses",
+            )
+
+    @pytest.mark.asyncio
+    async def test_get_and_count_hit_counts_separately(self, cache, mock_cluster):
+        """A hit is read with GET and counted with its own INCR."""
+        mock_cluster.get = AsyncMock(return_value='{"foo": "bar"}')
+
+        result = await cache.get_and_count("mykey", "hits", "misses")
+
+        assert result == {"foo": "bar"}
+        mock_cluster.eval.assert_not_called()
+        mock_cluster.get.assert_awaited_once_with("test:mykey")
+        mock_cluster.incr.assert_awaited_once_with("test:hits")
+
+    @pytest.mark.asyncio
+    async def test_get_and_count_miss_counts_separately(self, cache, mock_cluster):
+        """A miss increments the miss counter."""
+        mock_cluster.get = AsyncMock(return_value=None)
+
+        assert await cache.get_and_count("mykey", "hits", "misses") is None
+        mock_cluster.incr.assert_awaited_once_with("test:misses")
+
+    @pytest.mark.asyncio
+    async def test_cluster_exception_degrades_to_miss(self, cache, mock_cluster):
+        """Cluster client errors, which are not RedisErrors, bypass the cache."""
+        from redis.exceptions import RedisClusterException
+
+        mock_cluster.get = AsyncMock(side_effect=RedisClusterException("no slots"))
+
+        assert await cache.get_and_count("mykey", "hits", "misses") is None
+        assert await cache.get("mykey") is None
+
+    @pytest.mark.asyncio
+    async def test_delete_keys_uses_slot_splitting_delete(self, cache, mock_cluster):
+        """Each chunk goes through the cluster client's own per-slot DEL."""
+        keys = [f"key{i}" for i in range(600)]
+        mock_cluster.delete = AsyncMock(side_effect=[512, 88])
+
+        result = await cache.delete_keys(*keys)
+
+        assert result == 600
+        chunks = [c.args for c in mock_cluster.delete.await_args_list]
+        assert [len(chunk) for chunk in chunks] == [512, 88]
+        mock_cluster.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_reset_prediction_metrics(self, cache, mock_cluster):
+        """Hit and miss counters in different slots are reset together."""
+        from app.services.prediction_cache import (
+            PREDICTION_METRICS_HITS,
+            PREDICTION_METRICS_MISSES,
+            PredictionCache,
+        )
+
+        mock_cluster.delete = AsyncMock(return_value=2)
+
+        assert await PredictionCache(cache).reset_metrics() is True
+        mock_cluster.delete.assert_awaited_once_with(
+            f"test:{PREDICTION_METRICS_HITS}", f"test:{PREDICTION_METRICS_MISSES}"
+        )
+
+
+class TestCacheServiceSetNowait:
+    """Tests for fire-and-forget set_nowait writes."""
+
+    @pytest.fixture
+    def mock_redis(self, mock_pipeline):
+        """Create a mock Redis client whose pipeline() returns mock_pipeline."""
+        mock = AsyncMock()
+        mock.close = AsyncMock()
+        mock.pipeline = MagicMock(return_value=mock_pipeline)
+        return mock
+
+    @pytest.fixture
+    async def cache(self, mock_redis):
+        """Create a connected cache service, disconnected after the test."""
+        cache = CacheService(prefix="test:", default_ttl=300, enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+        yield cache
+        await cache.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_set_nowait_returns_immediately_and_flushes(
+        self, cache, mock_redis, mock_pipeline
+    ):
+        """Queued writes go out together in one pipeline."""
+        for i in range(5):
+            assert cache.set_nowait(f"key{i}", {"i": i}) is True
+
+        # Nothing has been sent yet
+        mock_redis.set.assert_not_called()
+        mock_redis.pipeline.assert_not_called()
+
+        assert await cache._flush_once() == 5
+
+        mock_redis.pipeline.assert_called_once_with(transaction=False)
+        assert mock_pipeline.set.call_count == 5
+        mock_pipeline.set.assert_any_call("test:key0", orjson.dumps({"i": 0}), ex=300)
+        mock_pipeline.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_set_nowait_background_flush(self, cache, mock_pipeline):
+        """The background task sends queued writes without being awaited."""
+        cache.set_nowait("key", "value", ttl=60)
+
+        await asyncio.sleep(0)
+
+        mock_pipeline.set.assert_called_once_with("test:key", "value", ex=60)
+
+    @pytest.mark.asyncio
+    async def test_disconnect_sends_pending_writes(self, cache, mock_pipeline):
+        """Disconnect drains writes the background task has not sent yet."""
+        cache.set_nowait("key1", "value")
+        cache.set_nowait("key2", "value")
+
+        await cache.disconnect()
+
+        assert mock_pipeline.set.call_count == 2
+        assert cache._flush_task is None
+
+    @pytest.mark.asyncio
+    async def test_disconnect_waits_for_in_flight_flush(self, cache, mock_pipeline):
+        """A batch the flusher is already writing is not cancelled."""
+        entered = asyncio.Event()
+        release = asyncio.Event()
+        executed = 0
+
+        async def slow_execute():
+            nonlocal executed
+            entered.set()
+            await release.wait()
+            executed += 1
+            return []
+
+        mock_pipeline.execute = AsyncMock(side_effect=slow_execute)
+        cache.set_nowait("key1", "value")
+        await entered.wait()
+        cache.set_nowait("key2", "value")
+
+        disconnect = asyncio.create_task(cache.disconnect())
+        await asyncio.sleep(0)
+        assert not disconnect.done()
+
+        release.set()
+        await disconnect
+
+        assert executed == 2
+        assert mock_pipeline.set.call_count == 2
+        assert cache._flush_task is None
+
+    @pytest.mark.asyncio
+    async def test_flush_swallows_redis_error(self, cache, mock_pipeline):
+        """A failed background write is logged, not raised."""
+        from redis.exceptions import RedisError
+
+        mock_pipeline.execute = AsyncMock(side_effect=RedisError("Connection error"))
+        cache.set_nowait("key", "value")
+
+        assert await cache._flush_once() == 1
+
+    @pytest.mark.asyncio
+    async def test_set_nowait_rejects_unserializable(self, cache):
+        """Values that cannot be serialized are not queued."""
+        assert cache.set_nowait("key", object()) is False
+        assert cache._write_queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_set_nowait_drops_when_queue_full(self, mock_redis, mock_pipeline):
+        """A full write queue drops the write instead of blocking."""
+        with patch("app.services.cache._WRITE_QUEUE_MAXSIZE", 1):
+            cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        assert cache.set_nowait("key1", "value") is True
+        assert cache.set_nowait("key2", "value") is False
+
+        await cache.disconnect()
+        mock_pipeline.set.assert_called_once_with(
+            "test:key1", "value", ex=cache.default_ttl
+        )
+
+    @pytest.mark.asyncio
+    async def test_set_nowait_not_connected(self):
+        """Set_nowait returns False when not connected."""
+        cache = CacheService(enabled=True)
+        assert cache.set_nowait("key", "value") is False
+
+
+class TestLocalCacheTier:
+    """Tests for the in-process L1 in front of Redis."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Freeze time.monotonic in the cache module at a settable value."""
+        from app.services import cache as cache_module
+
+        now = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        return now
+
+    def test_get_returns_stored_value(self):
+        """Stored values are returned until they expire."""
+        from app.services.cache import LocalCache
+
+        local = LocalCache(max_size=4, ttl=60)
+        local.set("k", b'{"a":1}')
+
+        assert local.get("k") == b'{"a":1}'
+
+    def test_expired_entry_is_dropped(self, clock):
+        """Entries past their TTL are treated as misses."""
+        from app.services.cache import LocalCache
+
+        local = LocalCache(max_size=4, ttl=5)
+        local.set("k", "v")
+
+        clock[0] = 106.0
+        assert local.get("k") is None
+        assert len(local) == 0
+
+    def test_entry_ttl_capped_by_local_ttl(self, clock):
+        """A short Redis TTL shortens the local entry; a long one does not."""
+        from app.services.cache import LocalCache
+
+        local = LocalCache(max_size=4, ttl=5)
+        local.set("short", "v", ttl=1)
+        local.set("long", "v", ttl=3600)
+
+        clock[0] = 102.0
+        assert local.get("short") is None
+        assert local.get("long") == "v"
+        clock[0] = 106.0
+        assert local.get("long") is None
+
+    def test_cleanup_removes_expired_via_heap(self, clock):
+        """Cleanup drops expired entries and keeps live ones."""
+        from app.services.cache import LocalCache
+
+        local = LocalCache(max_size=4, ttl=5)
+        local.set("old", "v", ttl=1)
+        local.set("new", "v")
+
+        clock[0] = 102.0
+        assert local.cleanup() == 1
+        assert len(local) == 1
+        assert local.get("new") == "v"
+
+    def test_cleanup_skips_overwritten_entries(self, clock):
+        """A stale heap item does not remove a newer value for the key."""
+        from app.services.cache import LocalCache
+
+        local = LocalCache(max_size=4, ttl=5)
+        local.set("k", "first", ttl=1)
+        clock[0] = 100.5
+        local.set("k", "second")
+
+        clock[0] = 102.0
+        assert local.cleanup() == 0
+        assert local.get("k") == "second"
+
+    def test_evicts_least_recently_used(self):
+        """Size cap evicts the least recently used entry."""
+        from app.services.cache import LocalCache
+
+        local = LocalCache(max_size=2, ttl=60)
+        local.set("a", "1")
+        local.set("b", "2")
+        local.get("a")
+        local.set("c", "3")
+
+        assert local.get("b") is None
+        assert local.get("a") == "1"
+        assert local.get("c") == "3"
+
+    @pytest.mark.asyncio
+    async def test_service_get_served_from_local_tier(self):
+        """A Redis hit fills the L1, so the next get skips Redis."""
+        mock_redis = AsyncMock()
+        mock_redis.get = AsyncMock(return_value='{"foo": "bar"}')
+
+        cache = CacheService(prefix="test:", enabled=True, local_cache_size=16)
+        cache._connected = True
+        cache._client = mock_redis
+
+        first = await cache.get("mykey")
+        second = await cache.get("mykey")
+
+        assert first == second == {"foo": "bar"}
+        assert first is not second  # Stored serialized, never shared
+        mock_redis.get.assert_called_once_with("test:mykey")
+
+    @pytest.mark.asyncio
+    async def test_service_delete_evicts_local_tier(self):
+        """Deleting a key also drops it from the L1."""
+        mock_redis = AsyncMock()
+        mock_redis.delete = AsyncMock(return_value=1)
+        mock_redis.get = AsyncMock(return_value=None)
+
+        cache = CacheService(prefix="test:", enabled=True, local_cache_size=16)
+        cache._connected = True
+        cache._client = mock_redis
+
+        await cache.set("mykey", "value")
+        await cache.delete("mykey")
+
+        assert await cache.get("mykey") is None
+        mock_redis.get.assert_called_once_with("test:mykey")
+
+    def test_service_local_tier_disabled_by_default(self):
+        """No L1 is created unless a size is configured."""
+        assert CacheService(enabled=True, local_cache_size=0)._local is None
+
+
 class TestCacheServiceConnect:
     """Tests for connect method with mocked Redis."""
 
@@ -726,6 +1611,125 @@ class TestCacheServiceConnect:
             assert result is True
             assert cache._connected is True
 
+    @pytest.mark.asyncio
+    async def test_connect_pool_respects_max_connections(self):
+        """Connect sizes the pool from max_connections."""
+        with (
+            patch("app.services.cache.ConnectionPool") as mock_pool_class,
+            patch("app.services.cache.Redis") as mock_redis_class,
+        ):
+            mock_redis_class.return_value = AsyncMock()
+
+            cache = CacheService(enabled=True, max_connections=20)
+            await cache.connect()
+
+        assert mock_pool_class.from_url.call_args.kwargs["max_connections"] == 20
+        assert mock_redis_class.call_args.kwargs["single_connection_client"] is False
+
+    @pytest.mark.asyncio
+    async def test_connect_sets_socket_keepalive(self):
+        """Connections enable TCP keepalive with tuned probe timings."""
+        import socket
+
+        with (
+            patch("app.services.cache.ConnectionPool") as mock_pool_class,
+            patch("app.services.cache.Redis") as mock_redis_class,
+        ):
+            mock_redis_class.return_value = AsyncMock()
+
+            await CacheService(enabled=True).connect()
+
+        kwargs = mock_pool_class.from_url.call_args.kwargs
+        assert kwargs["socket_keepalive"] is True
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            assert kwargs["socket_keepalive_options"][socket.TCP_KEEPIDLE] == 60
+
+    def test_keepalive_options_accepted_by_socket(self):
+        """Every keepalive option is valid for a real TCP socket."""
+        import socket
+
+        from app.services.cache import _KEEPALIVE_OPTIONS
+
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in _KEEPALIVE_OPTIONS.items():
+                sock.setsockopt(socket.IPPROTO_TCP, option, value)
+                assert sock.getsockopt(socket.IPPROTO_TCP, option) == value
+
+    @pytest.mark.asyncio
+    async def test_connect_single_connection_client(self):
+        """Single-connection mode shares one connection from the pool."""
+        with (
+            patch("app.services.cache.ConnectionPool") as mock_pool_class,
+            patch("app.services.cache.Redis") as mock_redis_class,
+        ):
+            mock_redis_class.return_value = AsyncMock()
+
+            cache = CacheService(enabled=True, single_connection=True)
+            await cache.connect()
+
+        mock_redis_class.assert_called_once_with(
+            connection_pool=mock_pool_class.from_url.return_value,
+            single_connection_client=True,
+        )
+
+    @pytest.mark.asyncio
+    async def test_connect_cluster_url_uses_rediscluster(self):
+        """A redis+cluster:// URL connects through RedisCluster without a pool."""
+        with (
+            patch("app.services.cache.ConnectionPool") as mock_pool_class,
+            patch("app.services.cache.RedisCluster") as mock_cluster_class,
+        ):
+            mock_client = AsyncMock()
+            mock_cluster_class.from_url.return_value = mock_client
+
+            cache = CacheService(
+                enabled=True,
+                redis_url="redis+cluster://node1:7000/0",
+                max_connections=20,
+            )
+            result = await cache.connect()
+
+        assert result is True
+        assert cache._client is mock_client
+        assert cache._pool is None
+        mock_pool_class.from_url.assert_not_called()
+        args, kwargs = mock_cluster_class.from_url.call_args
+        assert args == ("redis://node1:7000/0",)
+        assert kwargs["max_connections"] == 20
+        assert kwargs["decode_responses"] is True
+
+    @pytest.mark.asyncio
+    async def test_connect_uses_hiredis_parser(self):
+        """The pool built by connect resolves to the hiredis reply parser."""
+        pytest.importorskip("hiredis")
+        from redis.asyncio.connection import DefaultParser, _AsyncHiredisParser
+
+        with patch("app.services.cache.Redis") as mock_redis_class:
+            mock_redis_class.return_value = AsyncMock()
+
+            cache = CacheService(enabled=True, redis_url="redis://localhost:6379/0")
+            await cache.connect()
+
+        parser_class = cache._pool.connection_kwargs.get("parser_class", DefaultParser)
+        assert parser_class is _AsyncHiredisParser
+
+    @pytest.mark.asyncio
+    async def test_connect_warns_without_hiredis(self, caplog):
+        """Connect warns when replies fall back to the pure-Python parser."""
+        with (
+            patch("app.services.cache.ConnectionPool"),
+            patch("app.services.cache.Redis") as mock_redis_class,
+            patch("app.services.cache.HIREDIS_AVAILABLE", False),
+        ):
+            mock_redis_class.return_value = AsyncMock()
+
+            cache = CacheService(enabled=True, redis_url="redis://localhost:6379/0")
+            with caplog.at_level("WARNING", logger="app.services.cache"):
+                assert await cache.connect() is True
+
+        assert "hiredis is not installed" in caplog.text
+
     @pytest.mark.asyncio
     async def test_connect_failure(self):
         """Connect returns False on connection failure."""
@@ -27,6 +27,9 @@ class TestCleanupTask:
         assert result["error"] is None
         # Verify commit was called
         mock_session.commit.assert_called_once()
+        # Bulk delete skips identity-map synchronization
+        delete_query = mock_session.execute.call_args.args[0]
+        assert delete_query.get_execution_options()["synchronize_session"] is False
 
     def test_cleanup_no_old_jobs(self):
         """Test cleanup when there are no old jobs."""
@@ -47,6 +50,30 @@ class TestCleanupTask:
         # Commit is still called (simpler logic, no early return)
         mock_session.commit.assert_called_once()
 
+    def test_cleanup_deletes_in_batches(self):
+        """Test that a full batch triggers another delete until one comes back short."""
+        mock_session = MagicMock()
+        mock_session.__enter__ = MagicMock(return_value=mock_session)
+        mock_session.__exit__ = MagicMock(return_value=False)
+
+        mock_session.execute.side_effect = [
+            MagicMock(rowcount=3),
+            MagicMock(rowcount=3),
+            MagicMock(rowcount=1),
+        ]
+
+        with patch("app.tasks.cleanup._get_sync_session", return_value=mock_session):
+            with patch("app.tasks.cleanup._CLEANUP_BATCH_SIZE", 3):
+                with patch("app.tasks.cleanup.settings") as mock_settings:
+                    mock_settings.job_retention_days = 30
+                    result = cleanup_old_jobs()
+
+        assert result["deleted_count"] == 7
+        assert result["error"] is None
+        assert mock_session.execute.call_count == 3
+        # Each batch is committed on its own
+        assert mock_session.commit.call_count == 3
+
     def test_cleanup_handles_database_error(self):
         """Test that cleanup handles database errors gracefully."""
         mock_session = MagicMock()
@@ -90,3 +117,10 @@ class TestCleanupTask:
 
         assert result["deleted_count"] == 0
         assert result["error"] is None
+
+    def test_cleanup_acks_early(self):
+        """Test the idempotent cleanup task opts out of the global late ack."""
+        from app.celery import celery_app
+
+        assert celery_app.conf.task_acks_late is True
+        assert cleanup_old_jobs.acks_late is False
@@ -1,7 +1,5 @@
 """Tests for health check endpoints."""
 
-from unittest.mock import patch
-
 import pytest
 from httpx import AsyncClient
 
@@ -39,18 +37,19 @@ class TestHealthEndpoint:
     """Tests for the main /health endpoint."""
 
     @pytest.mark.asyncio
-    async def test_health_check_returns_healthy(self, client: AsyncClient):
-        """Test health check returns healthy status when DB is connected."""
-        # Mock Celery health check since Celery isn't running in tests
-        with patch("app.api.health.check_celery_health") as mock_celery:
-            mock_celery.return_value = {
-                "status": "no_workers",
-                "broker_connected": False,
-                "workers": {},
-                "queues": [],
-            }
-
-            response = await client.get("/api/v1/health")
+    @pytest.mark.parametrize("scenario", ["connected", "no_workers", "error"])
+    async def test_health_check_reports_celery_status(
+        self,
+        client: AsyncClient,
+        patched_check_celery_health,
+        celery_health_scenarios,
+        scenario,
+    ):
+        """DB connectivity decides overall health; Celery status is reported."""
+        # Celery isn't running in tests
+        patched_check_celery_health.return_value = celery_health_scenarios[scenario]
+
+        response = await client.get("/api/v1/health")
 
         assert response.status_code == 200
         data = response.json()
@@ -59,119 +58,37 @@ class TestHealthEndpoint:
         assert "environment" in data
         assert data["database"] == "connected"
         assert "redis" in data
-        assert "celery" in data
+        assert data["celery"] == scenario
         assert "timestamp" in data
 
-    @pytest.mark.asyncio
-    async def test_health_check_with_celery_connected(self, client: AsyncClient):
-        """Test health check when Celery workers are connected."""
-        with patch("app.api.health.check_celery_health") as mock_celery:
-            mock_celery.return_value = {
-                "status": "connected",
-                "broker_connected": True,
-                "workers": {"worker@host": {"status": "online"}},
-                "queues": ["inference", "default"],
-            }
-
-            response = await client.get("/api/v1/health")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "healthy"
-        assert data["celery"] == "connected"
-
-    @pytest.mark.asyncio
-    async def test_health_check_with_celery_error(self, client: AsyncClient):
-        """Test health check when Celery has an error."""
-        with patch("app.api.health.check_celery_health") as mock_celery:
-            mock_celery.return_value = {
-                "status": "error",
-                "broker_connected": False,
-                "workers": {},
-                "queues": [],
-                "error": "Connection refused",
-            }
-
-            response = await client.get("/api/v1/health")
-
-        assert response.status_code == 200
-        data = response.json()
-        # DB is still connected, so overall status is healthy
-        assert data["status"] == "healthy"
-        assert data["celery"] == "error"
-
 
 class TestCeleryHealthEndpoint:
     """Tests for the /health/celery endpoint."""
 
     @pytest.mark.asyncio
-    async def test_celery_health_no_workers(self, client: AsyncClient):
-        """Test Celery health when no workers are available."""
-        with patch("app.api.health.check_celery_health") as mock_celery:
-            mock_celery.return_value = {
-                "status": "no_workers",
-                "broker_connected": True,
-                "workers": {},
-                "queues": ["inference", "default"],
-            }
-
-            response = await client.get("/api/v1/health/celery")
+    @pytest.mark.parametrize("scenario", ["connected", "no_workers", "error"])
+    async def test_celery_health_endpoint(
+        self,
+        client: AsyncClient,
+        patched_check_celery_health,
+        celery_health_scenarios,
+        scenario,
+    ):
+        """The endpoint returns the probe result for each Celery state."""
+        expected = celery_health_scenarios[scenario]
+        patched_check_celery_health.return_value = expected
+
+        response = await client.get("/api/v1/health/celery")
 
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "no_workers"
-        assert data["broker_connected"] is True
-        assert data["workers"] == {}
-        assert data["queues"] == ["inference", "default"]
-        assert data["error"] is None
+        assert data["status"] == expected["status"]
+        assert data["broker_connected"] is expected["broker_connected"]
+        assert data["workers"] == expected["workers"]
+        assert data["queues"] == expected["queues"]
+        assert data["error"] == expected.get("error")
         assert "timestamp" in data
 
-    @pytest.mark.asyncio
-    async def test_celery_health_connected_with_workers(self, client: AsyncClient):
-        """Test Celery health when workers are connected."""
-        with patch("app.api.health.check_celery_health") as mock_celery:
-            mock_celery.return_value = {
-                "status": "connected",
-                "broker_connected": True,
-                "workers": {
-                    "celery@worker1": {
-                        "status": "online",
-                        "concurrency": 4,
-                        "processed": {"task1": 100},
-                    }
-                },
-                "queues": ["inference", "default"],
-            }
-
-            response = await client.get("/api/v1/health/celery")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "connected"
-        assert data["broker_connected"] is True
-        assert "celery@worker1" in data["workers"]
-        assert data["workers"]["celery@worker1"]["status"] == "online"
-
-    @pytest.mark.asyncio
-    async def test_celery_health_error(self, client: AsyncClient):
-        """Test Celery health when there's a connection error."""
-        with patch("app.api.health.check_celery_health") as mock_celery:
-            mock_celery.return_value = {
-                "status": "error",
-                "broker_connected": False,
-                "workers": {},
-                "queues": [],
-                "error": "Connection to broker refused",
-            }
-
-            response = await client.get("/api/v1/health/celery")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "error"
-        assert data["broker_connected"] is False
-        assert data["error"] == "Connection to broker refused"
-
 
 class TestReadinessProbe:
     """Tests for the /ready endpoint edge cases."""
@@ -185,13 +102,10 @@ class TestReadinessProbe:
         assert data["status"] == "ready"
 
     @pytest.mark.asyncio
-    async def test_readiness_returns_not_ready_on_db_error(self, client: AsyncClient):
+    async def test_readiness_returns_not_ready_on_db_error(
+        self, client: AsyncClient, override_db
+    ):
         """Test readiness probe returns not_ready when DB fails."""
-        from httpx import ASGITransport
-        from httpx import AsyncClient as AC
-
-        from app.database import get_db
-        from app.main import app
 
         # Define a failing database dependency
         async def failing_db():
@@ -201,16 +115,9 @@ class TestReadinessProbe:
 
             yield FailingSession()
 
-        # Override the dependency with our failing version
-        app.dependency_overrides[get_db] = failing_db
+        override_db(failing_db)
 
-        try:
-            transport = ASGITransport(app=app)
-            async with AC(transport=transport, base_url="http://test") as test_client:
-                response = await test_client.get("/api/v1/ready")
-        finally:
-            # Clean up override even if test fails
-            app.dependency_overrides.pop(get_db, None)
+        response = await client.get("/api/v1/ready")
 
         assert response.status_code == 200
         data = response.json()
@@ -221,29 +128,27 @@ class TestReadinessProbe:
 class TestCheckCeleryHealth:
     """Unit tests for the check_celery_health function."""
 
-    def test_celery_health_with_workers(self):
+    def test_celery_health_with_workers(self, patched_celery_app):
         """Test check_celery_health when workers respond."""
         from app.api.health import check_celery_health
 
-        # Patch at the source module where celery_app is defined
-        with patch("app.celery.celery_app") as mock_celery:
-            mock_inspect = mock_celery.control.inspect.return_value
-            mock_inspect.ping.return_value = {
-                "celery@worker1": {"ok": "pong"},
-                "celery@worker2": {"ok": "pong"},
-            }
-            mock_inspect.stats.return_value = {
-                "celery@worker1": {
-                    "pool": {"max-concurrency": 4},
-                    "total": {"task.name": 50},
-                },
-                "celery@worker2": {
-                    "pool": {"max-concurrency": 8},
-                    "total": {"task.name": 100},
-                },
-            }
-
-            result = check_celery_health()
+        mock_inspect = patched_celery_app.control.inspect.return_value
+        mock_inspect.ping.return_value = {
+            "celery@worker1": {"ok": "pong"},
+            "celery@worker2": {"ok": "pong"},
+        }
+        mock_inspect.stats.return_value = {
+            "celery@worker1": {
+                "pool": {"max-concurrency": 4},
+                "total": {"task.name": 50},
+            },
+            "celery@worker2": {
+                "pool": {"max-concurrency": 8},
+                "total": {"task.name": 100},
+            },
+        }
+
+        result = check_celery_health()
 
         assert result["status"] == "connected"
         assert result["broker_connected"] is True
@@ -251,28 +156,26 @@ class TestCheckCeleryHealth:
         assert result["workers"]["celery@worker1"]["status"] == "online"
         assert result["workers"]["celery@worker1"]["concurrency"] == 4
 
-    def test_celery_health_no_workers_respond(self):
+    def test_celery_health_no_workers_respond(self, patched_celery_app):
         """Test check_celery_health when no workers respond."""
         from app.api.health import check_celery_health
 
-        with patch("app.celery.celery_app") as mock_celery:
-            mock_inspect = mock_celery.control.inspect.return_value
-            mock_inspect.ping.return_value = None
+        mock_inspect = patched_celery_app.control.inspect.return_value
+        mock_inspect.ping.return_value = None
 
-            result = check_celery_health()
+        result = check_celery_health()
 
         assert result["status"] == "no_workers"
         assert result["broker_connected"] is True
         assert result["workers"] == {}
 
-    def test_celery_health_connection_error(self):
+    def test_celery_health_connection_error(self, patched_celery_app):
         """Test check_celery_health when connection fails."""
         from app.api.health import check_celery_health
 
-        with patch("app.celery.celery_app") as mock_celery:
-            mock_celery.control.inspect.side_effect = Exception("Connection refused")
+        patched_celery_app.control.inspect.side_effect = Exception("Connection refused")
 
-            result = check_celery_health()
+        result = check_celery_health()
 
         assert result["status"] == "error"
         assert result["broker_connected"] is False
@@ -44,6 +44,7 @@ def create_mock_model(model_id):
     model.name = "test-model"
     model.status = ModelStatus.READY
     model.file_path = "test-model.onnx"
+    model.file_hash = "a" * 64
     return model
 
 
@@ -62,22 +63,22 @@ class TestRunInferenceTask:
         )
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.side_effect = [
-            mock_job,  # First call: get job
-            mock_model,  # Second call: get model
-        ]
+        mock_db.execute.return_value.one_or_none.return_value = (
+            mock_job,
+            mock_model,
+        )
 
         mock_onnx_service = MagicMock()
         mock_onnx_service.run_inference.return_value = mock_inference_result
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
-            patch("app.tasks.inference.ONNXService") as mock_onnx_class,
+            patch("app.tasks.inference.get_onnx_service") as mock_get_onnx,
             patch("app.tasks.inference.settings") as mock_settings,
         ):
             mock_session.return_value.__enter__ = MagicMock(return_value=mock_db)
             mock_session.return_value.__exit__ = MagicMock(return_value=False)
-            mock_onnx_class.return_value = mock_onnx_service
+            mock_get_onnx.return_value = mock_onnx_service
             mock_settings.model_storage_path = "/models"
             mock_settings.job_max_retries = 3
 
@@ -94,13 +95,17 @@ class TestRunInferenceTask:
         result_data = result.result
         assert result_data["status"] == "completed"
         assert result_data["output_data"] == {"output": [[2.0] * 10]}
+        # Job and model are fetched together in a single query
+        mock_db.execute.assert_called_once()
+        # The stored digest keys the shared session, so the file is not re-hashed
+        assert mock_onnx_service.run_inference.call_args.args[2] == "a" * 64
 
     def test_task_job_not_found(self):
         """Test task handles missing job gracefully."""
         from app.tasks.inference import run_inference_task
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.return_value = None
+        mock_db.execute.return_value.one_or_none.return_value = None
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
@@ -127,10 +132,10 @@ class TestRunInferenceTask:
         mock_job = create_mock_job()
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.side_effect = [
-            mock_job,  # Job found
-            None,  # Model not found
-        ]
+        mock_db.execute.return_value.one_or_none.return_value = (
+            mock_job,
+            None,  # Job found, model not found
+        )
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
@@ -149,6 +154,39 @@ class TestRunInferenceTask:
             with pytest.raises(Retry):
                 run_inference_task.apply(args=[mock_job.id], throw=True)
 
+    def test_task_retry_does_not_commit(self):
+        """Test a retryable failure only commits the RUNNING transition."""
+        from celery.exceptions import Retry
+
+        from app.tasks.inference import run_inference_task
+
+        mock_job = create_mock_job()
+
+        mock_db = MagicMock()
+        mock_db.execute.return_value.one_or_none.return_value = (
+            mock_job,
+            None,  # Job found, model not found
+        )
+
+        with (
+            patch("app.tasks.inference._get_sync_session") as mock_session,
+            patch("app.tasks.inference.settings") as mock_settings,
+        ):
+            mock_session.return_value.__enter__ = MagicMock(return_value=mock_db)
+            mock_session.return_value.__exit__ = MagicMock(return_value=False)
+            mock_settings.job_max_retries = 3
+
+            from app.celery import celery_app
+
+            celery_app.conf.task_always_eager = True
+            celery_app.conf.task_eager_propagates = True
+
+            with pytest.raises(Retry):
+                run_inference_task.apply(args=[mock_job.id], throw=True)
+
+        mock_db.commit.assert_called_once()
+        mock_db.rollback.assert_called_once()
+
     def test_task_model_not_ready_triggers_retry(self):
         """Test task triggers retry when model not ready (may be transient)."""
         from celery.exceptions import Retry
@@ -160,10 +198,10 @@ class TestRunInferenceTask:
         mock_model.status = ModelStatus.UPLOADED  # Not READY
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.side_effect = [
+        mock_db.execute.return_value.one_or_none.return_value = (
             mock_job,
             mock_model,
-        ]
+        )
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
@@ -193,10 +231,10 @@ class TestRunInferenceTask:
         mock_model.file_path = None  # No file
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.side_effect = [
+        mock_db.execute.return_value.one_or_none.return_value = (
             mock_job,
             mock_model,
-        ]
+        )
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
@@ -223,22 +261,22 @@ class TestRunInferenceTask:
         mock_model = create_mock_model(mock_job.model_id)
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.side_effect = [
+        mock_db.execute.return_value.one_or_none.return_value = (
             mock_job,
             mock_model,
-        ]
+        )
 
         mock_onnx_service = MagicMock()
         mock_onnx_service.run_inference.side_effect = ONNXError("Invalid input shape")
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
-            patch("app.tasks.inference.ONNXService") as mock_onnx_class,
+            patch("app.tasks.inference.get_onnx_service") as mock_get_onnx,
             patch("app.tasks.inference.settings") as mock_settings,
         ):
             mock_session.return_value.__enter__ = MagicMock(return_value=mock_db)
             mock_session.return_value.__exit__ = MagicMock(return_value=False)
-            mock_onnx_class.return_value = mock_onnx_service
+            mock_get_onnx.return_value = mock_onnx_service
             mock_settings.model_storage_path = "/models"
             mock_settings.job_max_retries = 3
 
@@ -265,22 +303,22 @@ class TestRunInferenceTask:
         )
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.side_effect = [
+        mock_db.execute.return_value.one_or_none.return_value = (
             mock_job,
             mock_model,
-        ]
+        )
 
         mock_onnx_service = MagicMock()
         mock_onnx_service.run_inference.return_value = mock_inference_result
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
-            patch("app.tasks.inference.ONNXService") as mock_onnx_class,
+            patch("app.tasks.inference.get_onnx_service") as mock_get_onnx,
             patch("app.tasks.inference.settings") as mock_settings,
         ):
             mock_session.return_value.__enter__ = MagicMock(return_value=mock_db)
             mock_session.return_value.__exit__ = MagicMock(return_value=False)
-            mock_onnx_class.return_value = mock_onnx_service
+            mock_get_onnx.return_value = mock_onnx_service
             mock_settings.model_storage_path = "/models"
             mock_settings.job_max_retries = 3
 
@@ -300,6 +338,9 @@ class TestRunInferenceTask:
         # Check job has timing metrics
         assert mock_job.queue_time_ms is not None
         assert mock_job.inference_time_ms == 15.5
+        # Queue time ends exactly at started_at
+        queued = mock_job.started_at - mock_job.created_at
+        assert queued.total_seconds() * 1000 == result_data["queue_time_ms"]
 
     def test_task_stores_worker_info(self):
         """Test task stores celery_task_id and worker_id."""
@@ -313,22 +354,22 @@ class TestRunInferenceTask:
         )
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.side_effect = [
+        mock_db.execute.return_value.one_or_none.return_value = (
             mock_job,
             mock_model,
-        ]
+        )
 
         mock_onnx_service = MagicMock()
         mock_onnx_service.run_inference.return_value = mock_inference_result
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
-            patch("app.tasks.inference.ONNXService") as mock_onnx_class,
+            patch("app.tasks.inference.get_onnx_service") as mock_get_onnx,
             patch("app.tasks.inference.settings") as mock_settings,
         ):
             mock_session.return_value.__enter__ = MagicMock(return_value=mock_db)
             mock_session.return_value.__exit__ = MagicMock(return_value=False)
-            mock_onnx_class.return_value = mock_onnx_service
+            mock_get_onnx.return_value = mock_onnx_service
             mock_settings.model_storage_path = "/models"
             mock_settings.job_max_retries = 3
 
@@ -351,22 +392,22 @@ class TestRunInferenceTask:
         mock_model = create_mock_model(mock_job.model_id)
 
         mock_db = MagicMock()
-        mock_db.execute.return_value.scalar_one_or_none.side_effect = [
+        mock_db.execute.return_value.one_or_none.return_value = (
             mock_job,
             mock_model,
-        ]
+        )
 
         mock_onnx_service = MagicMock()
         mock_onnx_service.run_inference.side_effect = ONNXError("Model failed to load")
 
         with (
             patch("app.tasks.inference._get_sync_session") as mock_session,
-            patch("app.tasks.inference.ONNXService") as mock_onnx_class,
+            patch("app.tasks.inference.get_onnx_service") as mock_get_onnx,
             patch("app.tasks.inference.settings") as mock_settings,
         ):
             mock_session.return_value.__enter__ = MagicMock(return_value=mock_db)
             mock_session.return_value.__exit__ = MagicMock(return_value=False)
-            mock_onnx_class.return_value = mock_onnx_service
+            mock_get_onnx.return_value = mock_onnx_service
             mock_settings.model_storage_path = "/models"
             mock_settings.job_max_retries = 3
 
@@ -397,6 +438,27 @@ class TestTaskConfiguration:
         assert hasattr(run_inference_task, "max_retries")
         assert hasattr(run_inference_task, "default_retry_delay")
 
+    def test_worker_process_init_resets_onnx_service(self):
+        """Test each forked worker starts with a fresh ONNXService."""
+        from celery.signals import worker_process_init
+
+        from app.services.onnx import (
+            ONNXService,
+            get_onnx_service,
+            reset_onnx_service,
+            set_onnx_service,
+        )
+
+        parent_service = ONNXService()
+        set_onnx_service(parent_service)
+        try:
+            worker_process_init.send(sender=None)
+            assert get_onnx_service() is not parent_service
+            # Reused across tasks within the process
+            assert get_onnx_service() is get_onnx_service()
+        finally:
+            reset_onnx_service()
+
     def test_task_routes_to_inference_queue(self):
         """Test task is routed to inference queue."""
         from app.celery import celery_app
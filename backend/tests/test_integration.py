@@ -7,21 +7,16 @@ testing real user journeys across multiple API endpoints.
 import io
 from unittest.mock import patch
 
-import onnx
 import pytest
 from httpx import AsyncClient
 
-from tests.conftest import create_simple_onnx_model
+from tests.conftest import simple_onnx_model_bytes
 
 
 @pytest.fixture
 def valid_onnx_file() -> io.BytesIO:
     """Create a valid ONNX model file for testing."""
-    model = create_simple_onnx_model()
-    buffer = io.BytesIO()
-    onnx.save(model, buffer)
-    buffer.seek(0)
-    return buffer
+    return io.BytesIO(simple_onnx_model_bytes())
 
 
 class TestModelLifecycleWorkflow:
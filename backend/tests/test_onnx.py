@@ -7,11 +7,13 @@ import pytest
 
 from app.services.onnx import (
     InferenceResult,
+    ONNXInferenceError,
     ONNXInputError,
     ONNXLoadError,
     ONNXService,
     TensorSchema,
     ValidationResult,
+    _resolve_path,
     get_onnx_service,
     set_onnx_service,
 )
@@ -220,6 +222,263 @@ class TestONNXServiceSingleton:
         assert retrieved is custom_service
 
 
+class TestONNXServiceProviders:
+    """Tests for execution provider selection."""
+
+    def test_default_providers_cpu_only_host(self):
+        """CPU-only builds default to the CPU provider."""
+        from unittest.mock import patch
+
+        with patch(
+            "app.services.onnx.ort.get_available_providers",
+            return_value=["CPUExecutionProvider"],
+        ):
+            service = ONNXService()
+
+        assert service.providers == ["CPUExecutionProvider"]
+
+    def test_default_providers_prefer_cuda(self):
+        """CUDA is preferred over CPU when the build provides it."""
+        from unittest.mock import patch
+
+        with patch(
+            "app.services.onnx.ort.get_available_providers",
+            return_value=[
+                "AzureExecutionProvider",
+                "CPUExecutionProvider",
+                "CUDAExecutionProvider",
+            ],
+        ):
+            service = ONNXService()
+
+        assert service.providers == ["CUDAExecutionProvider", "CPUExecutionProvider"]
+
+    def test_default_providers_get_cuda_options(self):
+        """Auto-selected CUDA gets tuned provider options."""
+        from unittest.mock import patch
+
+        with patch(
+            "app.services.onnx.ort.get_available_providers",
+            return_value=["CUDAExecutionProvider", "CPUExecutionProvider"],
+        ):
+            service = ONNXService()
+
+        cuda_options, cpu_options = service.provider_options
+        assert cuda_options["arena_extend_strategy"] == "kNextPowerOfTwo"
+        assert cuda_options["cudnn_conv_algo_search"] == "HEURISTIC"
+        assert cpu_options == {}
+
+    def test_gpu_disabled_uses_cpu_only(self, monkeypatch):
+        """ort_enable_gpu=False ignores available accelerators."""
+        from unittest.mock import patch
+
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "ort_enable_gpu", False)
+        with patch(
+            "app.services.onnx.ort.get_available_providers",
+            return_value=["CUDAExecutionProvider", "CPUExecutionProvider"],
+        ):
+            service = ONNXService()
+
+        assert service.providers == ["CPUExecutionProvider"]
+
+    def test_explicit_providers_and_options_are_used(self, onnx_model_path: Path):
+        """Explicit providers and provider options reach the session."""
+        service = ONNXService(
+            providers=["CPUExecutionProvider"],
+            provider_options=[{}],
+        )
+
+        session = service.load_session(onnx_model_path)
+
+        assert session.get_providers() == ["CPUExecutionProvider"]
+
+
+class TestONNXServiceSessionOptions:
+    """Tests for session memory options."""
+
+    def test_memory_options_applied_to_session(self, onnx_model_path: Path):
+        """Arena and memory pattern flags are set on the session options."""
+        service = ONNXService(enable_cpu_mem_arena=False, enable_mem_pattern=False)
+
+        session = service.load_session(onnx_model_path)
+        options = session.get_session_options()
+
+        assert options.enable_cpu_mem_arena is False
+        assert options.enable_mem_pattern is False
+
+    def test_thread_and_optimization_settings_applied(
+        self, onnx_model_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Session tuning is read from settings when a session is created."""
+        import onnxruntime as ort
+
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "ort_intra_op_num_threads", 2)
+        monkeypatch.setattr(settings, "ort_inter_op_num_threads", 1)
+        monkeypatch.setattr(settings, "ort_allow_spinning", False)
+        monkeypatch.setattr(settings, "ort_graph_optimization_level", "extended")
+
+        session = ONNXService().load_session(onnx_model_path)
+        options = session.get_session_options()
+
+        assert options.intra_op_num_threads == 2
+        assert options.inter_op_num_threads == 1
+        assert (
+            options.graph_optimization_level
+            == ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        )
+        assert (
+            options.get_session_config_entry("session.intra_op.allow_spinning") == "0"
+        )
+
+    def test_production_optimization_level_by_default(self, onnx_model_path: Path):
+        """Without the test override, sessions use the configured default."""
+        import onnxruntime as ort
+
+        session = ONNXService(providers=["CPUExecutionProvider"]).load_session(
+            onnx_model_path
+        )
+
+        assert (
+            session.get_session_options().graph_optimization_level
+            == ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+
+    def test_optimized_model_persisted_and_reused(
+        self,
+        onnx_model_path: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """The optimized graph is written once and loaded without re-optimizing."""
+        import onnxruntime as ort
+
+        from app.config import settings
+
+        cache_dir = tmp_path / "ort-cache"
+        monkeypatch.setattr(settings, "ort_optimized_model_dir", str(cache_dir))
+        monkeypatch.setattr(settings, "ort_graph_optimization_level", "all")
+
+        ONNXService(providers=["CPUExecutionProvider"]).load_session(onnx_model_path)
+        cached = list(cache_dir.iterdir())
+        assert len(cached) == 1
+        assert cached[0].name.endswith(".opt.onnx")
+
+        session = ONNXService(providers=["CPUExecutionProvider"]).load_session(
+            onnx_model_path
+        )
+
+        assert (
+            session.get_session_options().graph_optimization_level
+            == ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        )
+        assert list(cache_dir.iterdir()) == cached
+
+    def test_optimized_cache_dir_recreated_after_removal(
+        self,
+        onnx_model_path: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """A cache directory removed while the process runs is created again."""
+        import shutil
+
+        from app.config import settings
+
+        cache_dir = tmp_path / "ort-cache"
+        monkeypatch.setattr(settings, "ort_optimized_model_dir", str(cache_dir))
+        monkeypatch.setattr(settings, "ort_graph_optimization_level", "all")
+        service = ONNXService(providers=["CPUExecutionProvider"])
+
+        service.load_session(onnx_model_path)
+        shutil.rmtree(cache_dir)
+        service.load_session(onnx_model_path)
+
+        assert len(list(cache_dir.iterdir())) == 1
+
+    def test_int8_quantized_copy_cached_and_served(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """INT8 mode quantizes once and serves the cached quantized model."""
+        import numpy as np
+        import onnx
+        from onnx import TensorProto, helper
+
+        from app.config import settings
+
+        weights = np.random.default_rng(0).standard_normal((8, 4)).astype(np.float32)
+        graph = helper.make_graph(
+            [helper.make_node("MatMul", ["input", "W"], ["output"])],
+            "matmul",
+            [helper.make_tensor_value_info("input", TensorProto.FLOAT, ["N", 8])],
+            [helper.make_tensor_value_info("output", TensorProto.FLOAT, ["N", 4])],
+            [helper.make_tensor("W", TensorProto.FLOAT, [8, 4], weights.ravel())],
+        )
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+        model.ir_version = 8
+        model_path = tmp_path / "matmul.onnx"
+        onnx.save(model, str(model_path))
+
+        cache_dir = tmp_path / "ort-cache"
+        monkeypatch.setattr(settings, "ort_optimized_model_dir", str(cache_dir))
+        monkeypatch.setattr(settings, "ort_quantize_int8", True)
+
+        service = ONNXService(providers=["CPUExecutionProvider"])
+        x = np.ones((2, 8), dtype=np.float32)
+        result = service.run_inference(model_path, {"input": x.tolist()})
+
+        quantized = list(cache_dir.glob("*.int8.onnx"))
+        assert len(quantized) == 1
+        assert np.allclose(result.outputs["output"], x @ weights, atol=0.1)
+
+        ONNXService(providers=["CPUExecutionProvider"]).load_session(model_path)
+        assert list(cache_dir.glob("*.int8.onnx")) == quantized
+
+    def test_int8_requires_cache_dir(
+        self, onnx_model_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Without a cache directory the original model is loaded."""
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "ort_quantize_int8", True)
+        service = ONNXService(providers=["CPUExecutionProvider"])
+
+        assert service._quantized_model_path(onnx_model_path) is None
+
+    def test_validate_does_not_use_optimized_cache(
+        self,
+        onnx_model_path: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Validation always checks the uploaded file itself."""
+        from app.config import settings
+
+        cache_dir = tmp_path / "ort-cache"
+        monkeypatch.setattr(settings, "ort_optimized_model_dir", str(cache_dir))
+
+        result = ONNXService(providers=["CPUExecutionProvider"]).validate(
+            onnx_model_path
+        )
+
+        assert result.valid is True
+        assert not cache_dir.exists()
+
+    def test_memory_options_default_enabled(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """ORT defaults are kept unless explicitly disabled."""
+        options = onnx_service.load_session(onnx_model_path).get_session_options()
+
+        assert options.enable_cpu_mem_arena is True
+        assert options.enable_mem_pattern is True
+
+
 class TestONNXServiceMultiInput:
     """Tests for models with multiple inputs/outputs."""
 
@@ -319,6 +578,14 @@ class TestONNXServiceDtypeConversion:
         assert result.valid is True
         assert result.input_schema[0].dtype == "float64"
 
+    def test_numpy_dtype_lookup(self, onnx_service: ONNXService):
+        """ONNX input types map to numpy dtypes, defaulting to float32."""
+        import numpy as np
+
+        assert onnx_service._onnx_type_to_numpy_dtype("tensor(int64)") == np.int64
+        assert onnx_service._onnx_type_to_numpy_dtype("tensor(bool)") == np.bool_
+        assert onnx_service._onnx_type_to_numpy_dtype("tensor(string)") == np.float32
+
 
 class TestONNXServiceInference:
     """Tests for ONNX model inference."""
@@ -370,6 +637,14 @@ class TestONNXServiceInference:
         # Should be fast (less than 1 second)
         assert result.inference_time_ms < 1000
 
+    def test_run_inference_timing_disabled(self, onnx_model_path: Path):
+        """Timing is skipped and reported as zero when measure_timing=False."""
+        service = ONNXService(measure_timing=False)
+        result = service.run_inference(onnx_model_path, {"input": [[1.0] * 10]})
+
+        assert result.inference_time_ms == 0.0
+        assert result.outputs["output"] == [[2.0] * 10]
+
     def test_run_inference_missing_input_raises(
         self, onnx_service: ONNXService, onnx_model_path: Path
     ):
@@ -380,6 +655,13 @@ class TestONNXServiceInference:
         assert "missing" in str(exc_info.value).lower()
         assert "input" in str(exc_info.value).lower()
 
+    def test_missing_inputs_reported_sorted(self, onnx_service: ONNXService):
+        """Missing input names are listed in a stable order."""
+        with pytest.raises(ONNXInputError) as exc_info:
+            onnx_service._check_required_inputs(("zeta", "alpha", "mid"), {"mid": 1})
+
+        assert "Missing required inputs: alpha, zeta." in str(exc_info.value)
+
     def test_run_inference_nonexistent_model_raises(
         self, onnx_service: ONNXService, tmp_path: Path
     ):
@@ -441,6 +723,176 @@ class TestONNXServiceSessionCaching:
         removed = onnx_service.remove_from_cache(onnx_model_path)
         assert removed is False
 
+    def test_identical_files_share_session(
+        self, onnx_service: ONNXService, onnx_model_path: Path, tmp_path: Path
+    ):
+        """Two paths with the same bytes reuse one loaded session."""
+        import shutil
+
+        copy_path = tmp_path / "copy_of_model.onnx"
+        shutil.copy(onnx_model_path, copy_path)
+
+        first, _, _ = onnx_service.get_cached_session(onnx_model_path)
+        second, _, _ = onnx_service.get_cached_session(copy_path)
+
+        assert first is second
+        assert len(onnx_service._session_cache) == 2
+        assert len(onnx_service._shared_sessions) == 1
+
+    def test_cache_miss_reads_file_sequentially(
+        self,
+        onnx_service: ONNXService,
+        onnx_model_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Hashing without a stored digest hints sequential access."""
+        import os
+
+        if not hasattr(os, "posix_fadvise"):
+            pytest.skip("posix_fadvise not available")
+
+        advice = []
+        real_fadvise = os.posix_fadvise
+
+        def recording_fadvise(fd, offset, length, flag):
+            advice.append(flag)
+            return real_fadvise(fd, offset, length, flag)
+
+        monkeypatch.setattr(os, "posix_fadvise", recording_fadvise)
+
+        onnx_service.get_cached_session(onnx_model_path)
+        onnx_service.get_cached_session(onnx_model_path)
+
+        # Only the miss reads the file
+        assert advice == [os.POSIX_FADV_SEQUENTIAL]
+
+    def test_stored_file_hash_skips_hashing(
+        self, onnx_service: ONNXService, onnx_model_path: Path, tmp_path: Path
+    ):
+        """A stored digest keys the shared session without reading the file."""
+        import hashlib
+        import shutil
+        from unittest.mock import patch
+
+        copy_path = tmp_path / "copy_of_model.onnx"
+        shutil.copy(onnx_model_path, copy_path)
+        file_hash = hashlib.sha256(onnx_model_path.read_bytes()).hexdigest()
+
+        with patch("app.services.onnx._digest_model_file") as digest:
+            first, _, _ = onnx_service.get_cached_session(onnx_model_path, file_hash)
+            second, _, _ = onnx_service.get_cached_session(copy_path, file_hash)
+
+        digest.assert_not_called()
+        assert first is second
+        assert list(onnx_service._shared_sessions) == [file_hash]
+
+    def test_shared_session_released_with_last_path(
+        self, onnx_service: ONNXService, onnx_model_path: Path, tmp_path: Path
+    ):
+        """The shared session is dropped only when no path uses it."""
+        import shutil
+
+        copy_path = tmp_path / "copy_of_model.onnx"
+        shutil.copy(onnx_model_path, copy_path)
+        onnx_service.get_cached_session(onnx_model_path)
+        onnx_service.get_cached_session(copy_path)
+
+        onnx_service.remove_from_cache(onnx_model_path)
+        assert len(onnx_service._shared_sessions) == 1
+        result = onnx_service.run_inference(copy_path, {"input": [[0.0] * 10]})
+        assert result.outputs["output"] == [[1.0] * 10]
+
+        onnx_service.remove_from_cache(copy_path)
+        assert onnx_service._shared_sessions == {}
+        assert onnx_service._shared_session_refs == {}
+
+    def test_removed_session_is_freed(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Removing a model leaves no live reference to its session."""
+        import weakref
+        from unittest.mock import patch
+
+        session, _, _ = onnx_service.get_cached_session(onnx_model_path)
+        onnx_service.run_inference(onnx_model_path, {"input": [[0.0] * 10]})
+        session_ref = weakref.ref(session)
+        del session
+
+        with patch("app.services.onnx._release_memory") as release:
+            onnx_service.remove_from_cache(onnx_model_path)
+
+        release.assert_called_once()
+        assert session_ref() is None
+
+    def test_release_memory_runs_without_glibc(self):
+        """Memory release is a plain gc pass where malloc_trim is missing."""
+        from unittest.mock import patch
+
+        from app.services.onnx import _release_memory
+
+        with patch("app.services.onnx._malloc_trim", return_value=None):
+            _release_memory()
+
+    def test_resolve_path_is_memoized(self, onnx_model_path: Path):
+        """Path resolution is cached per input string."""
+        _resolve_path.cache_clear()
+
+        first = _resolve_path(str(onnx_model_path))
+        second = _resolve_path(str(onnx_model_path))
+
+        assert first == second == str(onnx_model_path.resolve())
+        assert _resolve_path.cache_info().hits == 1
+
+    def test_cached_session_detects_deleted_file(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """A deleted file is still detected even though resolution is cached."""
+        from app.services.onnx import PostCommitmentInvariantViolation
+
+        onnx_service.get_cached_session(onnx_model_path)
+        onnx_model_path.unlink()
+
+        with pytest.raises(PostCommitmentInvariantViolation):
+            onnx_service.get_cached_session(onnx_model_path)
+
+    def test_cache_evicts_least_recently_used(
+        self, tmp_path: Path, simple_onnx_model: onnx.ModelProto
+    ):
+        """Cache is bounded and evicts the least recently used session."""
+        service = ONNXService(max_cached_sessions=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.onnx"
+            onnx.save(simple_onnx_model, str(path))
+            paths.append(path)
+
+        service.get_cached_session(paths[0])
+        service.get_cached_session(paths[1])
+        # Touch "a" so "b" becomes the least recently used entry
+        service.get_cached_session(paths[0])
+        service.get_cached_session(paths[2])
+
+        assert len(service._session_cache) == 2
+        assert str(paths[0].resolve()) in service._session_cache
+        assert str(paths[1].resolve()) not in service._session_cache
+        assert str(paths[2].resolve()) in service._session_cache
+
+    def test_input_specs_cached_with_session(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Input dtypes and shapes are read once and dropped with the session."""
+        import numpy as np
+
+        onnx_service.get_cached_session(onnx_model_path)
+        cache_key = str(onnx_model_path.resolve())
+
+        dtype, shape = onnx_service._input_specs[cache_key]["input"]
+        assert dtype == np.float32
+        assert shape[1] == 10
+
+        onnx_service.remove_from_cache(onnx_model_path)
+        assert cache_key not in onnx_service._input_specs
+
     def test_cached_inference_is_faster(
         self, onnx_service: ONNXService, onnx_model_path: Path
     ):
@@ -461,3 +913,456 @@ class TestONNXServiceSessionCaching:
 
         # Cache should have exactly one entry
         assert len(onnx_service._session_cache) == 1
+
+
+class TestONNXServiceIOBinding:
+    """Tests for zero-copy input preparation and IOBinding execution."""
+
+    def test_prepare_inputs_reuses_matching_array(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """A C-contiguous array of the right dtype is passed through uncopied."""
+        import numpy as np
+
+        onnx_service.get_cached_session(onnx_model_path)
+        specs = onnx_service._input_specs[str(onnx_model_path.resolve())]
+        data = np.ones((1, 10), dtype=np.float32)
+
+        prepared = onnx_service._prepare_inputs(specs, {"input": data})
+
+        assert prepared["input"] is data
+
+    def test_prepare_inputs_makes_contiguous_copy(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Non-contiguous or mismatched arrays are converted to C order."""
+        import numpy as np
+
+        onnx_service.get_cached_session(onnx_model_path)
+        specs = onnx_service._input_specs[str(onnx_model_path.resolve())]
+        data = np.ones((10, 1), dtype=np.float64).T
+
+        prepared = onnx_service._prepare_inputs(specs, {"input": data})
+
+        assert prepared["input"].dtype == np.float32
+        assert prepared["input"].flags.c_contiguous
+
+    def test_prepare_inputs_keeps_scalar_rank(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Scalar inputs are not promoted to 1-d during conversion."""
+        onnx_service.get_cached_session(onnx_model_path)
+        specs = onnx_service._input_specs[str(onnx_model_path.resolve())]
+
+        prepared = onnx_service._prepare_inputs(specs, {"input": 3})
+
+        assert prepared["input"].shape == ()
+
+    def test_iobinding_reused_across_calls(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """The binding is cached per model and gives correct results on reuse."""
+        import numpy as np
+
+        first = onnx_service.run_inference(
+            onnx_model_path, {"input": np.zeros((1, 10), dtype=np.float32)}
+        )
+        binding = onnx_service._io_binding_cache[str(onnx_model_path.resolve())]
+        second = onnx_service.run_inference(
+            onnx_model_path, {"input": np.full((2, 10), 4.0, dtype=np.float32)}
+        )
+
+        assert onnx_service._io_binding_cache[str(onnx_model_path.resolve())] is binding
+        assert first.outputs["output"] == [[1.0] * 10]
+        assert second.outputs["output"] == [[5.0] * 10, [5.0] * 10]
+
+    def test_static_outputs_use_preallocated_buffer(
+        self, onnx_service: ONNXService, tmp_path: Path
+    ):
+        """Fixed-shape outputs are written into a reused buffer."""
+        from onnx import TensorProto, helper
+
+        X = helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 4])
+        Y = helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 4])
+        node = helper.make_node("Neg", inputs=["input"], outputs=["output"])
+        graph = helper.make_graph([node], "static_graph", [X], [Y])
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+        model.ir_version = 8
+        model_path = tmp_path / "static.onnx"
+        onnx.save(model, str(model_path))
+
+        first = onnx_service.run_inference(model_path, {"input": [[1.0] * 4]})
+        buffer = onnx_service._output_buffers[str(model_path.resolve())]["output"]
+        second = onnx_service.run_inference(model_path, {"input": [[2.0] * 4]})
+
+        assert (
+            onnx_service._output_buffers[str(model_path.resolve())]["output"] is buffer
+        )
+        assert first.outputs["output"] == [[-1.0] * 4]
+        assert second.outputs["output"] == [[-2.0] * 4]
+
+    def test_dynamic_outputs_are_not_preallocated(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Outputs with a dynamic batch dim are allocated by ORT per call."""
+        onnx_service.run_inference(onnx_model_path, {"input": [[1.0] * 10]})
+
+        assert onnx_service._output_buffers[str(onnx_model_path.resolve())] == {}
+
+    def test_remove_from_cache_drops_binding(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Removing a model from the cache also releases its binding."""
+        onnx_service.run_inference(onnx_model_path, {"input": [[1.0] * 10]})
+        assert len(onnx_service._io_binding_cache) == 1
+
+        onnx_service.remove_from_cache(onnx_model_path)
+
+        assert len(onnx_service._io_binding_cache) == 0
+        assert len(onnx_service._output_buffers) == 0
+
+
+class TestONNXServiceRawInference:
+    """Tests for numpy-in/numpy-out inference."""
+
+    def test_run_inference_raw_returns_arrays(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Raw inference returns numpy outputs keyed by name."""
+        import numpy as np
+
+        outputs = onnx_service.run_inference_raw(
+            onnx_model_path, {"input": np.zeros((2, 10), dtype=np.float32)}
+        )
+
+        assert isinstance(outputs["output"], np.ndarray)
+        np.testing.assert_allclose(outputs["output"], np.ones((2, 10)))
+
+    def test_run_inference_raw_wrong_dtype_raises(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Raw inference does not coerce dtypes."""
+        import numpy as np
+
+        from app.services.onnx import ONNXInferenceError
+
+        with pytest.raises(ONNXInferenceError):
+            onnx_service.run_inference_raw(
+                onnx_model_path, {"input": np.zeros((1, 10), dtype=np.float64)}
+            )
+
+    def test_run_inference_raw_outputs_survive_next_run(
+        self, onnx_service: ONNXService, tmp_path: Path
+    ):
+        """Outputs backed by preallocated buffers are copied for the caller."""
+        import numpy as np
+        from onnx import TensorProto, helper
+
+        X = helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 4])
+        Y = helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 4])
+        node = helper.make_node("Neg", inputs=["input"], outputs=["output"])
+        graph = helper.make_graph([node], "static_graph", [X], [Y])
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+        model.ir_version = 8
+        model_path = tmp_path / "static.onnx"
+        onnx.save(model, str(model_path))
+
+        first = onnx_service.run_inference_raw(
+            model_path, {"input": np.ones((1, 4), dtype=np.float32)}
+        )
+        onnx_service.run_inference_raw(
+            model_path, {"input": np.full((1, 4), 3.0, dtype=np.float32)}
+        )
+
+        np.testing.assert_allclose(first["output"], -np.ones((1, 4)))
+
+
+class TestONNXServiceShapeSpecialization:
+    """Tests for sessions specialized to observed input shapes."""
+
+    @pytest.fixture
+    def specializing_service(self, monkeypatch: pytest.MonkeyPatch) -> ONNXService:
+        """ONNXService keeping up to two specialized sessions per model."""
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "ort_max_specialized_shapes", 2)
+        return ONNXService(providers=["CPUExecutionProvider"])
+
+    def test_disabled_by_default(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """No specialized sessions are built unless enabled."""
+        onnx_service.run_inference(onnx_model_path, {"input": [[0.0] * 10]})
+
+        assert onnx_service._specialized_sessions == {}
+
+    def test_session_per_observed_shape(
+        self, specializing_service: ONNXService, onnx_model_path: Path
+    ):
+        """Each batch size gets its own session with the dim fixed."""
+        cache_key = str(onnx_model_path.resolve())
+
+        result = specializing_service.run_inference(
+            onnx_model_path, {"input": [[0.0] * 10] * 3}
+        )
+        specializing_service.run_inference(onnx_model_path, {"input": [[0.0] * 10]})
+
+        assert result.outputs["output"] == [[1.0] * 10] * 3
+        sessions = specializing_service._specialized_sessions[cache_key]
+        assert list(sessions) == [(("batch_size", 3),), (("batch_size", 1),)]
+        assert sessions[(("batch_size", 3),)].get_outputs()[0].shape == [3, 10]
+
+    def test_specialized_sessions_are_reused(
+        self, specializing_service: ONNXService, onnx_model_path: Path
+    ):
+        """Repeated shapes hit the existing specialized session."""
+        cache_key = str(onnx_model_path.resolve())
+
+        specializing_service.run_inference(onnx_model_path, {"input": [[0.0] * 10]})
+        session = specializing_service._specialized_sessions[cache_key][
+            (("batch_size", 1),)
+        ]
+        specializing_service.run_inference(onnx_model_path, {"input": [[1.0] * 10]})
+
+        assert (
+            specializing_service._specialized_sessions[cache_key][(("batch_size", 1),)]
+            is session
+        )
+
+    def test_specialized_sessions_are_lru_bounded(
+        self, specializing_service: ONNXService, onnx_model_path: Path
+    ):
+        """Beyond the limit, the least recently used shape is evicted."""
+        cache_key = str(onnx_model_path.resolve())
+
+        for batch in (1, 2, 3):
+            specializing_service.run_inference(
+                onnx_model_path, {"input": [[0.0] * 10] * batch}
+            )
+
+        assert list(specializing_service._specialized_sessions[cache_key]) == [
+            (("batch_size", 2),),
+            (("batch_size", 3),),
+        ]
+        assert f"{cache_key}|{(('batch_size', 1),)}" not in (
+            specializing_service._io_binding_cache
+        )
+
+    def test_remove_from_cache_drops_specialized_sessions(
+        self, specializing_service: ONNXService, onnx_model_path: Path
+    ):
+        """Removing a model also drops its specialized sessions."""
+        specializing_service.run_inference(onnx_model_path, {"input": [[0.0] * 10]})
+
+        specializing_service.remove_from_cache(onnx_model_path)
+
+        assert specializing_service._specialized_sessions == {}
+        assert specializing_service._io_binding_cache == {}
+
+
+class TestONNXServiceBatchedInference:
+    """Tests for request coalescing in run_inference_batched."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_run(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Concurrent requests are executed in a single session run."""
+        import asyncio
+        from unittest.mock import patch
+
+        session, _, _ = onnx_service.get_cached_session(onnx_model_path)
+
+        with patch.object(session, "run", wraps=session.run) as run_spy:
+            results = await asyncio.gather(
+                onnx_service.run_inference_batched(
+                    onnx_model_path, {"input": [[1.0] * 10]}
+                ),
+                onnx_service.run_inference_batched(
+                    onnx_model_path, {"input": [[2.0] * 10, [3.0] * 10]}
+                ),
+                onnx_service.run_inference_batched(
+                    onnx_model_path, {"input": [[4.0] * 10]}
+                ),
+            )
+
+        assert run_spy.call_count == 1
+        assert results[0].outputs["output"] == [[2.0] * 10]
+        assert results[1].outputs["output"] == [[3.0] * 10, [4.0] * 10]
+        assert results[2].outputs["output"] == [[5.0] * 10]
+        assert onnx_service._batch_workers == {}
+
+    @pytest.mark.asyncio
+    async def test_batched_missing_input_raises(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Input validation happens before a request is queued."""
+        with pytest.raises(ONNXInputError):
+            await onnx_service.run_inference_batched(
+                onnx_model_path, {"wrong_name": [[1.0] * 10]}
+            )
+
+    @pytest.mark.asyncio
+    async def test_failed_worker_fails_requests_and_deregisters(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """A worker that dies mid-batch fails its requests instead of hanging."""
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+
+        with patch.object(
+            onnx_service,
+            "_run_batch_group",
+            AsyncMock(side_effect=RuntimeError("worker bug")),
+        ):
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    onnx_service.run_inference_batched(
+                        onnx_model_path, {"input": [[1.0] * 10]}
+                    ),
+                    onnx_service.run_inference_batched(
+                        onnx_model_path, {"input": [[2.0] * 10]}
+                    ),
+                    return_exceptions=True,
+                ),
+                timeout=5,
+            )
+
+        assert all(isinstance(r, ONNXInferenceError) for r in results)
+        assert onnx_service._batch_workers == {}
+        assert onnx_service._batch_queues == {}
+
+        # The next request gets a working worker
+        result = await onnx_service.run_inference_batched(
+            onnx_model_path, {"input": [[1.0] * 10]}
+        )
+        assert result.outputs["output"] == [[2.0] * 10]
+
+    @pytest.mark.asyncio
+    async def test_batch_concatenate_failure_resolves_futures(
+        self, onnx_service: ONNXService, onnx_model_path: Path
+    ):
+        """Inputs that cannot be concatenated fail the group's requests."""
+        import asyncio
+
+        import numpy as np
+
+        session, _, output_names = onnx_service.get_cached_session(onnx_model_path)
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future(), loop.create_future()]
+        group = [
+            ({"input": np.ones((1, 10), dtype=np.float32)}, futures[0]),
+            ({"input": np.ones((1, 5), dtype=np.float32)}, futures[1]),
+        ]
+
+        await onnx_service._run_batch_group(session, output_names, group)
+
+        for future in futures:
+            with pytest.raises(ONNXInferenceError):
+                future.result()
+
+    @pytest.mark.asyncio
+    async def test_mismatched_leading_dims_run_unbatched(
+        self, onnx_service: ONNXService, tmp_path: Path
+    ):
+        """Inputs disagreeing on the leading dim bypass coalescing."""
+        from unittest.mock import patch
+
+        from onnx import TensorProto, helper
+
+        X1 = helper.make_tensor_value_info("input1", TensorProto.FLOAT, ["batch", 5])
+        X2 = helper.make_tensor_value_info("input2", TensorProto.FLOAT, ["rows", 5])
+        Y = helper.make_tensor_value_info("output", TensorProto.FLOAT, ["out", 5])
+        node = helper.make_node("Add", inputs=["input1", "input2"], outputs=["output"])
+        graph = helper.make_graph([node], "broadcast_graph", [X1, X2], [Y])
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+        model.ir_version = 8
+        model_path = tmp_path / "broadcast.onnx"
+        onnx.save(model, str(model_path))
+
+        with patch.object(
+            onnx_service, "run_inference", wraps=onnx_service.run_inference
+        ) as run_spy:
+            result = await onnx_service.run_inference_batched(
+                model_path, {"input1": [[1.0] * 5], "input2": [[1.0] * 5] * 2}
+            )
+
+        run_spy.assert_called_once()
+        assert result.outputs["output"] == [[2.0] * 5] * 2
+        assert onnx_service._batch_queues == {}
+
+    @pytest.mark.asyncio
+    async def test_reducing_output_runs_unbatched(
+        self, onnx_service: ONNXService, tmp_path: Path
+    ):
+        """Outputs that reduce over the batch axis bypass coalescing."""
+        import asyncio
+        from unittest.mock import patch
+
+        from onnx import TensorProto, helper
+
+        X = helper.make_tensor_value_info("input", TensorProto.FLOAT, ["batch", 4])
+        Y = helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 4])
+        axes = helper.make_tensor("axes", TensorProto.INT64, [1], [0])
+        node = helper.make_node(
+            "ReduceSum", inputs=["input", "axes"], outputs=["output"], keepdims=1
+        )
+        graph = helper.make_graph([node], "reduce_graph", [X], [Y], initializer=[axes])
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+        model.ir_version = 8
+        model_path = tmp_path / "reduce.onnx"
+        onnx.save(model, str(model_path))
+
+        with patch.object(
+            onnx_service, "run_inference", wraps=onnx_service.run_inference
+        ) as run_spy:
+            results = await asyncio.gather(
+                onnx_service.run_inference_batched(
+                    model_path, {"input": [[1.0] * 4, [2.0] * 4]}
+                ),
+                onnx_service.run_inference_batched(model_path, {"input": [[5.0] * 4]}),
+            )
+
+        assert run_spy.call_count == 2
+        assert results[0].outputs["output"] == [[3.0] * 4]
+        assert results[1].outputs["output"] == [[5.0] * 4]
+        assert onnx_service._batch_queues == {}
+
+    @pytest.mark.asyncio
+    async def test_batched_timing_disabled_skips_clock(self, onnx_model_path: Path):
+        """With measure_timing=False the batch run is not timed."""
+        from unittest.mock import patch
+
+        service = ONNXService(measure_timing=False)
+
+        with patch("app.services.onnx.time.perf_counter_ns") as clock:
+            result = await service.run_inference_batched(
+                onnx_model_path, {"input": [[1.0] * 10]}
+            )
+
+        clock.assert_not_called()
+        assert result.inference_time_ms == 0.0
+        assert result.outputs["output"] == [[2.0] * 10]
+
+    @pytest.mark.asyncio
+    async def test_fixed_batch_dim_runs_unbatched(
+        self, onnx_service: ONNXService, tmp_path: Path
+    ):
+        """Models without a dynamic batch dimension bypass coalescing."""
+        from onnx import TensorProto, helper
+
+        X = helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 10])
+        Y = helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 10])
+        node = helper.make_node("Identity", inputs=["input"], outputs=["output"])
+        graph = helper.make_graph([node], "fixed_graph", [X], [Y])
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+        model.ir_version = 8
+        model_path = tmp_path / "fixed.onnx"
+        onnx.save(model, str(model_path))
+
+        result = await onnx_service.run_inference_batched(
+            model_path, {"input": [[7.0] * 10]}
+        )
+
+        assert result.outputs["output"] == [[7.0] * 10]
+        assert onnx_service._batch_queues == {}
@@ -13,13 +13,12 @@ still catching major performance regressions.
 import io
 import time
 
-import onnx
 import pytest
 from httpx import AsyncClient
 
 from app.services.cache import CacheService
 from app.services.prediction_cache import PredictionCache
-from tests.conftest import create_simple_onnx_model
+from tests.conftest import simple_onnx_model_bytes
 
 
 async def setup_ready_model(
@@ -53,11 +52,7 @@ async def setup_ready_model(
 @pytest.fixture
 def valid_onnx_file() -> io.BytesIO:
     """Create a valid ONNX model file for testing."""
-    model = create_simple_onnx_model()
-    buffer = io.BytesIO()
-    onnx.save(model, buffer)
-    buffer.seek(0)
-    return buffer
+    return io.BytesIO(simple_onnx_model_bytes())
 
 
 class TestPerformanceBenchmarks:
@@ -3,6 +3,8 @@
 Tests cover:
 - hash_input function for deterministic hashing
 - PredictionCache class operations
+- In-process L1 cache in front of Redis
+- Compression of large cached payloads
 - Cache hit/miss behavior in predict endpoint
 - skip_cache parameter
 - Cache invalidation on model changes
@@ -10,19 +12,22 @@ Tests cover:
 """
 
 import io
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
-import onnx
 import pytest
 from httpx import AsyncClient
 
 from app.services.cache import CacheService
 from app.services.prediction_cache import (
+    COMPRESSED_PREFIX,
+    LocalPredictionCache,
     PredictionCache,
     PredictionCacheResult,
+    decode_payload,
+    encode_payload,
     hash_input,
 )
-from tests.conftest import create_simple_onnx_model
+from tests.conftest import simple_onnx_model_bytes
 
 
 class TestHashInput:
@@ -48,12 +53,45 @@ class TestHashInput:
         assert hash_input(data1) == hash_input(data2)
 
     def test_hash_input_length(self):
-        """Hash is 16 characters (truncated MD5)."""
+        """Hash is 16 hex characters (8-byte BLAKE2b digest)."""
         data = {"input": [[1.0]]}
         h = hash_input(data)
         assert len(h) == 16
         assert all(c in "0123456789abcdef" for c in h)
 
+    def test_hash_input_numpy_matches_list(self):
+        """A numpy array hashes the same as the equivalent nested list."""
+        import numpy as np
+
+        as_list = {"input": [[1, 2, 3]]}
+        as_array = {"input": np.array([[1, 2, 3]], dtype=np.int64)}
+        assert hash_input(as_list) == hash_input(as_array)
+
+    def test_hash_input_non_finite_floats_distinct(self):
+        """NaN, infinities and None never share a key."""
+        import math
+
+        hashes = {
+            hash_input({"x": [value]})
+            for value in (math.inf, -math.inf, math.nan, None)
+        }
+        assert len(hashes) == 4
+
+    def test_hash_input_non_finite_numpy_distinct(self):
+        """Non-finite values inside numpy arrays are kept apart too."""
+        import numpy as np
+
+        assert hash_input({"x": np.array([np.inf])}) != hash_input(
+            {"x": np.array([np.nan])}
+        )
+        assert hash_input({"x": np.array([np.inf])}) == hash_input(
+            {"x": [float("inf")]}
+        )
+
+    def test_hash_input_big_int(self):
+        """Integers beyond 64 bits hash without raising, and distinctly."""
+        assert hash_input({"x": [2**64]}) != hash_input({"x": [2**64 + 1]})
+
     def test_hash_input_nested_dict(self):
         """Handles nested dictionaries."""
         data = {"input": {"nested": {"deep": [1, 2, 3]}}}
@@ -127,6 +165,7 @@ class TestPredictionCacheWithMockedRedis:
         """Create a mock Redis client."""
         mock = AsyncMock()
         mock.get = AsyncMock(return_value=None)
+        mock.eval = AsyncMock(return_value=None)
         mock.set = AsyncMock(return_value=True)
         mock.incr = AsyncMock(return_value=1)
         mock.delete = AsyncMock(return_value=1)
@@ -145,7 +184,7 @@ class TestPredictionCacheWithMockedRedis:
     async def test_get_prediction_cache_hit(self, mock_cache_service, mock_redis):
         """Cache hit returns stored prediction data."""
         cached_data = '{"output_data": {"output": [[2.0]]}, "inference_time_ms": 5.0}'
-        mock_redis.get.return_value = cached_data
+        mock_redis.eval.return_value = cached_data
 
         pred_cache = PredictionCache(mock_cache_service)
         result = await pred_cache.get_prediction("model-123", {"input": [[1.0]]})
@@ -157,7 +196,7 @@ class TestPredictionCacheWithMockedRedis:
     @pytest.mark.asyncio
     async def test_get_prediction_cache_miss(self, mock_cache_service, mock_redis):
         """Cache miss returns hit=False."""
-        mock_redis.get.return_value = None
+        mock_redis.eval.return_value = None
 
         pred_cache = PredictionCache(mock_cache_service)
         result = await pred_cache.get_prediction("model-123", {"input": [[1.0]]})
@@ -185,8 +224,8 @@ class TestPredictionCacheWithMockedRedis:
         await pred_cache.get_prediction("model-abc", {"input": [[1.0]]})
 
         # Verify the key format
-        call_args = mock_redis.get.call_args
-        key = call_args[0][0]
+        call_args = mock_redis.eval.call_args
+        key = call_args[0][2]
         assert "model-abc" in key
         assert key.startswith("test:prediction:")
 
@@ -194,34 +233,31 @@ class TestPredictionCacheWithMockedRedis:
     async def test_get_prediction_increments_hit_counter(
         self, mock_cache_service, mock_redis
     ):
-        """Cache hit increments hits counter."""
+        """Cache lookup passes the hits counter to the same script call."""
         cached_data = '{"output_data": {}, "inference_time_ms": 1.0}'
-        mock_redis.get.return_value = cached_data
+        mock_redis.eval.return_value = cached_data
 
         pred_cache = PredictionCache(mock_cache_service)
         await pred_cache.get_prediction("model-123", {"input": [[1.0]]})
 
-        # Verify incr was called for hits
-        incr_calls = [
-            call for call in mock_redis.incr.call_args_list if "hits" in str(call)
-        ]
-        assert len(incr_calls) == 1
+        # Counters are updated server-side, not with separate INCR calls
+        mock_redis.eval.assert_called_once()
+        assert mock_redis.eval.call_args[0][3] == "test:metrics:prediction:hits"
+        mock_redis.incr.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_prediction_increments_miss_counter(
         self, mock_cache_service, mock_redis
     ):
-        """Cache miss increments misses counter."""
-        mock_redis.get.return_value = None
+        """Cache lookup passes the misses counter to the same script call."""
+        mock_redis.eval.return_value = None
 
         pred_cache = PredictionCache(mock_cache_service)
         await pred_cache.get_prediction("model-123", {"input": [[1.0]]})
 
-        # Verify incr was called for misses
-        incr_calls = [
-            call for call in mock_redis.incr.call_args_list if "misses" in str(call)
-        ]
-        assert len(incr_calls) == 1
+        mock_redis.eval.assert_called_once()
+        assert mock_redis.eval.call_args[0][4] == "test:metrics:prediction:misses"
+        mock_redis.incr.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_invalidate_model_predictions(self, mock_cache_service, mock_redis):
@@ -236,12 +272,211 @@ class TestPredictionCacheWithMockedRedis:
                 yield key
 
         mock_redis.scan_iter = mock_scan_iter
+        mock_redis.unlink = AsyncMock(return_value=2)
 
         pred_cache = PredictionCache(mock_cache_service)
         await pred_cache.invalidate_model_predictions("model-123")
 
-        # Should have deleted the matching keys
-        mock_redis.delete.assert_called()
+        # Should have unlinked the matching keys
+        mock_redis.unlink.assert_awaited_once_with(
+            "test:prediction:model-123:abc", "test:prediction:model-123:def"
+        )
+
+
+class TestPayloadCompression:
+    """Tests for compressing cached prediction payloads."""
+
+    def test_small_payload_stored_as_is(self):
+        """Payloads under the threshold are not compressed."""
+        value = {"output_data": {"y": [1.0]}, "inference_time_ms": 1.0}
+        assert encode_payload(value) is value
+
+    def test_large_payload_round_trips(self):
+        """Large payloads are compressed and decode to the same data."""
+        value = {"output_data": {"y": [[0.5] * 256] * 4}, "inference_time_ms": 2.5}
+
+        encoded = encode_payload(value)
+
+        assert isinstance(encoded, str)
+        assert encoded.startswith(COMPRESSED_PREFIX)
+        assert len(encoded) < len(str(value))
+        assert decode_payload(encoded) == value
+
+    def test_large_payload_keeps_non_finite_floats(self):
+        """Compressed payloads keep NaN and infinities instead of nulls."""
+        import math
+
+        value = {
+            "output_data": {"y": [[0.5] * 256] * 4 + [[math.inf, -math.inf]]},
+            "inference_time_ms": math.nan,
+        }
+
+        decoded = decode_payload(encode_payload(value))
+
+        assert decoded["output_data"]["y"][-1] == [math.inf, -math.inf]
+        assert math.isnan(decoded["inference_time_ms"])
+
+    def test_uncompressed_values_pass_through(self):
+        """Entries written before compression still decode."""
+        value = {"output_data": {}, "inference_time_ms": 1.0}
+        assert decode_payload(value) is value
+
+    def test_corrupt_payload_raises(self):
+        """Corrupt compressed data is reported, not returned."""
+        with pytest.raises(ValueError):
+            decode_payload(COMPRESSED_PREFIX + "not-zlib")
+
+    @pytest.mark.asyncio
+    async def test_corrupt_entry_is_a_miss(self):
+        """A corrupt cached entry is treated as a cache miss."""
+        mock_redis = AsyncMock()
+        mock_redis.eval = AsyncMock(return_value=COMPRESSED_PREFIX + "AAAA")
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+
+        result = await PredictionCache(cache).get_prediction("m", {"x": [1]})
+
+        assert result.hit is False
+
+
+class TestLocalPredictionCache:
+    """Tests for the in-process L1 prediction cache."""
+
+    def test_get_returns_stored_entry(self):
+        """Stored entries are returned and counted as hits."""
+        local = LocalPredictionCache(max_size=4, ttl=60)
+        local.set("prediction:m:abc", {"output": [1]}, 2.0)
+
+        assert local.get("prediction:m:abc") == ({"output": [1]}, 2.0)
+        assert local.hits == 1
+
+    def test_non_finite_floats_round_trip(self):
+        """NaN and infinities survive the serialized L1 copy."""
+        import math
+
+        local = LocalPredictionCache(max_size=4, ttl=60)
+        local.set("prediction:m:abc", {"output": [math.inf, None]}, math.nan)
+
+        output_data, inference_time_ms = local.get("prediction:m:abc")
+        assert output_data == {"output": [math.inf, None]}
+        assert math.isnan(inference_time_ms)
+
+    def test_expired_entry_is_dropped(self, monkeypatch):
+        """Entries past their TTL are treated as misses."""
+        from app.services import prediction_cache
+
+        now = [100.0]
+        monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+        local = LocalPredictionCache(max_size=4, ttl=5)
+        local.set("k", {}, 1.0)
+
+        now[0] = 106.0
+        assert local.get("k") is None
+        assert len(local) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Size cap evicts the least recently used entry."""
+        local = LocalPredictionCache(max_size=2, ttl=60)
+        local.set("a", {}, 1.0)
+        local.set("b", {}, 1.0)
+        local.get("a")
+        local.set("c", {}, 1.0)
+
+        assert local.get("b") is None
+        assert local.get("a") is not None
+        assert local.get("c") is not None
+
+    def test_zero_size_disables(self):
+        """max_size=0 stores nothing."""
+        local = LocalPredictionCache(max_size=0, ttl=60)
+        local.set("a", {}, 1.0)
+        assert local.get("a") is None
+
+    def test_hits_return_independent_copies(self):
+        """Mutating a returned result does not change later hits."""
+        local = LocalPredictionCache(max_size=4, ttl=60)
+        output = {"y": [1, 2]}
+        local.set("k", output, 1.0)
+        output["y"].append(99)
+
+        first, _ = local.get("k")
+        first["y"].append(3)
+
+        assert local.get("k") == ({"y": [1, 2]}, 1.0)
+
+    def test_evicts_to_stay_within_byte_budget(self):
+        """Least recently used entries go once the payload budget is exceeded."""
+        local = LocalPredictionCache(max_size=100, ttl=60, max_bytes=100)
+        local.set("a", {"y": "x" * 30}, 1.0)
+        local.set("b", {"y": "x" * 30}, 1.0)
+        local.set("c", {"y": "x" * 30}, 1.0)
+
+        assert local.get("a") is None
+        assert local.get("b") is not None
+        assert local.get("c") is not None
+        assert local.size_bytes <= 100
+
+    def test_oversized_payload_not_stored(self):
+        """A payload bigger than the whole budget is skipped, not admitted."""
+        local = LocalPredictionCache(max_size=4, ttl=60, max_bytes=100)
+        local.set("small", {}, 1.0)
+        local.set("big", {"y": "x" * 200}, 1.0)
+
+        assert local.get("big") is None
+        assert local.get("small") is not None
+
+    def test_disabled_by_default(self):
+        """The process-wide L1 is opt-in."""
+        from app.services.prediction_cache import get_local_prediction_cache
+
+        local = get_local_prediction_cache()
+        local.set("k", {}, 1.0)
+
+        assert local.max_size == 0
+        assert local.get("k") is None
+
+    def test_clear_prefix_only_removes_matching(self):
+        """clear_prefix removes only one model's entries."""
+        local = LocalPredictionCache(max_size=4, ttl=60)
+        local.set("prediction:m1:a", {}, 1.0)
+        local.set("prediction:m1:b", {}, 1.0)
+        local.set("prediction:m2:a", {}, 1.0)
+
+        assert local.clear_prefix("prediction:m1:") == 2
+        assert local.get("prediction:m2:a") is not None
+        assert local.size_bytes == len(b"[{},1.0]")
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_populates_l1(self):
+        """A Redis hit is served from L1 on the next lookup."""
+        mock_redis = AsyncMock()
+        mock_redis.eval = AsyncMock(
+            return_value='{"output_data": {"y": [1]}, "inference_time_ms": 3.0}'
+        )
+        cache = CacheService(prefix="test:", enabled=True)
+        cache._connected = True
+        cache._client = mock_redis
+        pred_cache = PredictionCache(cache, LocalPredictionCache(8, 60))
+
+        first = await pred_cache.get_prediction("m", {"x": [1]})
+        second = await pred_cache.get_prediction("m", {"x": [1]})
+
+        assert first.hit and second.hit
+        assert second.output_data == {"y": [1]}
+        mock_redis.eval.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_l1(self):
+        """Invalidating a model drops its L1 entries even without Redis."""
+        cache = CacheService(enabled=False)
+        local = LocalPredictionCache(8, 60)
+        local.set("prediction:m:abc", {}, 1.0)
+        pred_cache = PredictionCache(cache, local)
+
+        await pred_cache.invalidate_model_predictions("m")
+
+        assert len(local) == 0
 
 
 class TestPredictionCacheMetrics:
@@ -295,23 +530,22 @@ class TestPredictionCacheMetrics:
         assert metrics["hit_rate_percent"] == 0.0
 
     @pytest.mark.asyncio
-    async def test_reset_metrics(self, mock_cache_with_metrics):
+    async def test_reset_metrics(self, mock_cache_with_metrics, mock_pipeline):
         """Reset metrics clears counters."""
+        mock_pipeline.execute.return_value = [2]
+        mock_cache_with_metrics._client.pipeline = MagicMock(return_value=mock_pipeline)
+
         pred_cache = PredictionCache(mock_cache_with_metrics)
         result = await pred_cache.reset_metrics()
 
         assert result is True
-        mock_cache_with_metrics._client.delete.assert_called_once()
+        mock_pipeline.delete.assert_called_once()
 
 
 @pytest.fixture
 def valid_onnx_file() -> io.BytesIO:
     """Create a valid ONNX model file for testing."""
-    model = create_simple_onnx_model()
-    buffer = io.BytesIO()
-    onnx.save(model, buffer)
-    buffer.seek(0)
-    return buffer
+    return io.BytesIO(simple_onnx_model_bytes())
 
 
 async def setup_ready_model(client: AsyncClient, valid_onnx_file: io.BytesIO) -> str:
@@ -7,11 +7,10 @@ The test model computes output = input + 1, so we can verify exact outputs.
 import asyncio
 import io
 
-import onnx
 import pytest
 from httpx import AsyncClient
 
-from tests.conftest import create_simple_onnx_model
+from tests.conftest import simple_onnx_model_bytes
 
 
 @pytest.fixture
@@ -22,11 +21,7 @@ def valid_onnx_file() -> io.BytesIO:
     Input shape: [batch_size, 10] (float32)
     Output shape: [batch_size, 10] (float32)
     """
-    model = create_simple_onnx_model()
-    buffer = io.BytesIO()
-    onnx.save(model, buffer)
-    buffer.seek(0)
-    return buffer
+    return io.BytesIO(simple_onnx_model_bytes())
 
 
 async def setup_ready_model(client: AsyncClient, valid_onnx_file: io.BytesIO) -> str:
@@ -123,6 +118,37 @@ class TestInferenceEndpoint:
         # Third sample: 5 + 1 = 6
         assert all(abs(v - 6.0) < 0.001 for v in output[2])
 
+    @pytest.mark.asyncio
+    async def test_predict_with_micro_batching_enabled(
+        self,
+        client: AsyncClient,
+        valid_onnx_file: io.BytesIO,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Predictions go through the micro-batcher when it is enabled."""
+        from unittest.mock import patch
+
+        from app.config import settings
+        from app.services.onnx import ONNXService
+
+        model_id = await setup_ready_model(client, valid_onnx_file)
+        monkeypatch.setattr(settings, "inference_batching_enabled", True)
+
+        with patch.object(
+            ONNXService,
+            "run_inference_batched",
+            autospec=True,
+            side_effect=ONNXService.run_inference_batched,
+        ) as batched:
+            response = await client.post(
+                f"/api/v1/models/{model_id}/predict",
+                json={"input_data": {"input": [[1.0] * 10]}},
+            )
+
+        assert response.status_code == 201
+        assert response.json()["output_data"]["output"] == [[2.0] * 10]
+        batched.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_predict_records_inference_time(
         self, client: AsyncClient, valid_onnx_file: io.BytesIO
@@ -177,6 +203,82 @@ class TestInferenceEndpoint:
         assert "output" in stored["output_data"]
 
 
+class TestPredictionResponseEncoding:
+    """Tests for prediction response serialization."""
+
+    def test_prediction_routes_use_orjson(self):
+        """Prediction routes render with ORJSONResponse for large outputs."""
+        from fastapi.responses import ORJSONResponse
+
+        from app.api.predictions import PredictionJSONResponse, router
+
+        assert issubclass(PredictionJSONResponse, ORJSONResponse)
+        for route in router.routes:
+            response_class = getattr(
+                route.response_class, "value", route.response_class
+            )
+            assert response_class is PredictionJSONResponse
+
+    def test_non_finite_outputs_rejected(self):
+        """NaN and infinities raise, as JSONResponse does, instead of nulls."""
+        import math
+
+        from fastapi.responses import JSONResponse
+
+        from app.api.predictions import PredictionJSONResponse
+
+        for value in (math.inf, -math.inf, math.nan):
+            content = {"output": [value, None]}
+            with pytest.raises(ValueError, match="not JSON compliant"):
+                JSONResponse(content)
+            with pytest.raises(ValueError, match="not JSON compliant"):
+                PredictionJSONResponse(content)
+
+        # Genuine nulls still render
+        assert PredictionJSONResponse({"output": [None, 1.5]}).body == (
+            b'{"output":[null,1.5]}'
+        )
+
+    @pytest.mark.asyncio
+    async def test_predict_non_finite_output_fails(
+        self, client: AsyncClient, valid_onnx_file: io.BytesIO
+    ):
+        """A non-finite model output fails the request rather than reading null."""
+        import math
+
+        from httpx import ASGITransport
+
+        from app.main import app
+
+        model_id = await setup_ready_model(client, valid_onnx_file)
+
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                f"/api/v1/models/{model_id}/predict",
+                json={"input_data": {"input": [[math.inf] + [0.5] * 9]}},
+            )
+
+        assert response.status_code == 500
+        assert b"null" not in response.content
+
+    @pytest.mark.asyncio
+    async def test_predict_response_is_json(
+        self, client: AsyncClient, valid_onnx_file: io.BytesIO
+    ):
+        """orjson-rendered responses keep the application/json content type."""
+        model_id = await setup_ready_model(client, valid_onnx_file)
+
+        response = await client.post(
+            f"/api/v1/models/{model_id}/predict",
+            json={"input_data": {"input": [[0.5] * 10]}},
+        )
+
+        assert response.status_code == 201
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["output_data"]["output"] == [[1.5] * 10]
+
+
 class TestInferenceValidation:
     """Tests for input validation in inference."""
 
@@ -52,6 +52,17 @@ class TestLocalStorageService:
         assert len(file_hash) == 64  # SHA-256 hex length
         assert await storage_service.exists(path)
 
+    @pytest.mark.asyncio
+    async def test_save_file_hash_is_sha256_of_content(
+        self, storage_service: LocalStorageService, sample_file: io.BytesIO
+    ):
+        """Test the returned hash is the SHA-256 of the saved bytes."""
+        import hashlib
+
+        _, _, file_hash = await storage_service.save(sample_file, "test.onnx")
+
+        assert file_hash == hashlib.sha256(sample_file.getvalue()).hexdigest()
+
     @pytest.mark.asyncio
     async def test_save_file_size_limit(
         self, storage_service: LocalStorageService, large_file: io.BytesIO
@@ -62,6 +73,129 @@ class TestLocalStorageService:
 
         assert "exceeds maximum size" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_save_file_size_limit_leaves_no_partial_file(
+        self,
+        storage_service: LocalStorageService,
+        large_file: io.BytesIO,
+        tmp_path: Path,
+    ):
+        """Test that a rejected upload leaves nothing behind on disk."""
+        with pytest.raises(StorageFullError):
+            await storage_service.save(large_file, "large.onnx")
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_save_replaces_existing_file(
+        self, storage_service: LocalStorageService, tmp_path: Path
+    ):
+        """Test that saving over an existing file swaps in the new content."""
+        await storage_service.save(io.BytesIO(b"old"), "model.onnx")
+        await storage_service.save(io.BytesIO(b"new content"), "model.onnx")
+
+        assert (tmp_path / "model.onnx").read_bytes() == b"new content"
+        assert not (tmp_path / "model.onnx.tmp").exists()
+
+    @pytest.mark.asyncio
+    async def test_save_with_named_tmpfile_fallback(
+        self,
+        storage_service: LocalStorageService,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test the named temporary file path used without O_TMPFILE."""
+        from app.services import storage
+
+        monkeypatch.setattr(storage, "_tmpfile_linkable", lambda directory: False)
+
+        await storage_service.save(io.BytesIO(b"old"), "model.onnx")
+        await storage_service.save(io.BytesIO(b"new content"), "model.onnx")
+
+        assert (tmp_path / "model.onnx").read_bytes() == b"new content"
+        assert [p.name for p in tmp_path.iterdir()] == ["model.onnx"]
+
+    @pytest.mark.asyncio
+    async def test_named_tmpfile_removed_on_unexpected_error(
+        self,
+        storage_service: LocalStorageService,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test a non-I/O failure mid-upload still removes the temporary file."""
+        from app.services import storage
+
+        monkeypatch.setattr(storage, "_tmpfile_linkable", lambda directory: False)
+
+        class BrokenStream(io.BytesIO):
+            def readinto(self, buffer):
+                raise ValueError("upload stream broke")
+
+        with pytest.raises(ValueError):
+            await storage_service.save(BrokenStream(), "model.onnx")
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_save_with_unnamed_tmpfile(
+        self, storage_service: LocalStorageService, tmp_path: Path
+    ):
+        """Test uploads via O_TMPFILE replace existing files and leave no names."""
+        from app.services import storage
+
+        if not storage._tmpfile_linkable(str(tmp_path)):
+            pytest.skip("O_TMPFILE linking not supported here")
+
+        await storage_service.save(io.BytesIO(b"old"), "model.onnx")
+        await storage_service.save(io.BytesIO(b"new content"), "model.onnx")
+
+        assert (tmp_path / "model.onnx").read_bytes() == b"new content"
+        assert [p.name for p in tmp_path.iterdir()] == ["model.onnx"]
+
+    @pytest.mark.asyncio
+    async def test_save_multi_chunk_file(
+        self,
+        storage_service: LocalStorageService,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test a file spanning several chunks is copied and hashed intact."""
+        import hashlib
+
+        from app.services import storage
+
+        monkeypatch.setattr(storage, "_CHUNK_SIZE", 64 * 1024)
+        content = bytes(range(256)) * 3000  # ~750KB, not chunk-aligned
+
+        path, size, file_hash = await storage_service.save(
+            io.BytesIO(content), "chunked.onnx"
+        )
+
+        assert size == len(content)
+        assert file_hash == hashlib.sha256(content).hexdigest()
+        assert (tmp_path / path).read_bytes() == content
+
+    @pytest.mark.asyncio
+    async def test_save_runs_off_event_loop(
+        self, storage_service: LocalStorageService, sample_file: io.BytesIO
+    ):
+        """Test that the blocking copy runs in a worker thread."""
+        import threading
+
+        loop_thread = threading.get_ident()
+        read_threads = []
+        original_readinto = sample_file.readinto
+
+        def tracking_readinto(buffer) -> int:
+            read_threads.append(threading.get_ident())
+            return original_readinto(buffer)
+
+        sample_file.readinto = tracking_readinto
+        await storage_service.save(sample_file, "threaded.onnx")
+
+        assert read_threads
+        assert loop_thread not in read_threads
+
     @pytest.mark.asyncio
     async def test_save_file_custom_size_limit(
         self, storage_service: LocalStorageService, sample_file: io.BytesIO
@@ -71,6 +205,47 @@ class TestLocalStorageService:
             # Set limit to 10 bytes, sample is 52 bytes
             await storage_service.save(sample_file, "test.onnx", max_size_bytes=10)
 
+    @pytest.mark.asyncio
+    async def test_save_rejects_declared_oversize_before_reading(
+        self,
+        storage_service: LocalStorageService,
+        large_file: io.BytesIO,
+        tmp_path: Path,
+    ):
+        """Test that a declared content length over the limit fails fast."""
+        with pytest.raises(StorageFullError):
+            await storage_service.save(
+                large_file, "large.onnx", content_length=len(large_file.getvalue())
+            )
+
+        assert large_file.tell() == 0
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_save_enforces_limit_when_content_length_understated(
+        self, storage_service: LocalStorageService, large_file: io.BytesIO
+    ):
+        """Test that the streamed size is still checked against the limit."""
+        with pytest.raises(StorageFullError):
+            await storage_service.save(large_file, "large.onnx", content_length=10)
+
+    @pytest.mark.asyncio
+    async def test_save_content_length_overstated_keeps_actual_size(
+        self,
+        storage_service: LocalStorageService,
+        sample_file: io.BytesIO,
+        tmp_path: Path,
+    ):
+        """Test that space reserved beyond the real upload is given back."""
+        content = sample_file.getvalue()
+
+        path, size, _ = await storage_service.save(
+            sample_file, "test.onnx", content_length=len(content) + 4096
+        )
+
+        assert size == len(content)
+        assert (tmp_path / path).read_bytes() == content
+
     @pytest.mark.asyncio
     async def test_save_sanitizes_filename(
         self, storage_service: LocalStorageService, sample_file: io.BytesIO
@@ -145,6 +320,14 @@ class TestLocalStorageService:
         """Test exists returns False for nonexistent file."""
         assert not await storage_service.exists("nonexistent.onnx")
 
+    @pytest.mark.asyncio
+    async def test_exists_false_for_directory(
+        self, storage_service: LocalStorageService, tmp_path: Path
+    ):
+        """Test exists returns False for a directory with the given name."""
+        (tmp_path / "subdir.onnx").mkdir()
+        assert not await storage_service.exists("subdir.onnx")
+
     @pytest.mark.asyncio
     async def test_get_path(
         self,
@@ -168,6 +351,55 @@ class TestLocalStorageService:
         with pytest.raises(StorageFileNotFoundError):
             await storage_service.get_path("nonexistent.onnx")
 
+    @pytest.mark.asyncio
+    async def test_get_path_memoizes_existence(
+        self,
+        storage_service: LocalStorageService,
+        sample_file: io.BytesIO,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test repeated get_path calls within the TTL skip the stat."""
+        await storage_service.save(sample_file, "hot.onnx")
+        first = await storage_service.get_path("hot.onnx")
+
+        def fail_is_file(self):
+            raise AssertionError("is_file should not be called")
+
+        monkeypatch.setattr(Path, "is_file", fail_is_file)
+        assert await storage_service.get_path("hot.onnx") == first
+        assert await storage_service.exists("hot.onnx")
+
+    @pytest.mark.asyncio
+    async def test_get_path_rechecks_after_ttl(
+        self,
+        storage_service: LocalStorageService,
+        sample_file: io.BytesIO,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test a file removed outside the service is noticed after the TTL."""
+        from app.services import storage
+
+        await storage_service.save(sample_file, "gone.onnx")
+        await storage_service.get_path("gone.onnx")
+        (tmp_path / "gone.onnx").unlink()
+
+        monkeypatch.setattr(storage, "_EXISTS_TTL_SECONDS", 0.0)
+        with pytest.raises(StorageFileNotFoundError):
+            await storage_service.get_path("gone.onnx")
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_existence_memo(
+        self, storage_service: LocalStorageService, sample_file: io.BytesIO
+    ):
+        """Test deleting through the service is visible immediately."""
+        await storage_service.save(sample_file, "short.onnx")
+        await storage_service.get_path("short.onnx")
+
+        await storage_service.delete("short.onnx")
+
+        assert not await storage_service.exists("short.onnx")
+
     @pytest.mark.asyncio
     async def test_directory_traversal_blocked(
         self, storage_service: LocalStorageService
@@ -179,6 +411,18 @@ class TestLocalStorageService:
         # Should be sanitized and return False (file doesn't exist in base_path)
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_symlink_out_of_base_path_blocked(self, tmp_path: Path):
+        """Test that a stored name symlinked outside base_path is rejected."""
+        base = tmp_path / "models"
+        outside = tmp_path / "secret.onnx"
+        outside.write_bytes(b"secret")
+        service = LocalStorageService(base_path=str(base))
+        (base / "link.onnx").symlink_to(outside)
+
+        with pytest.raises(StorageError, match="directory traversal"):
+            await service.get_path("link.onnx")
+
     def test_compute_hash(self):
         """Test hash computation is deterministic."""
         data = b"test data for hashing"